@@ -1,15 +1,19 @@
 import builtins
-import glob
 import importlib
 import os
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Optional, Dict, Any, Type
+from typing import Optional, Dict, Any, Type, Union
 
 from .base import Block
 from .builder import Build
+from .finder import ScopeFinder, block_builder
+from .session import session
 from .utils import merge
+from .utils.archive import archive_scope_index, is_archive
+from .utils.scanner import INDEX_FILE, ScopeIndex, scan_scope
+from .utils.structer import library_registry
 
 
 def get_created_blocks(block_type: Optional[Type] = None) -> Dict[str, Any]:
@@ -22,70 +26,45 @@ def get_created_blocks(block_type: Optional[Type] = None) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary of block instances with their references as keys.
     """
-    blocks = {}
+    # Use the block's id as the reference key
+    return {str(id(block)): block for block in Block.scope.blocks(block_type or Block)}
 
-    for pair in Block.scope:
-        if issubclass(pair[1].__class__, block_type or Block):
-            block = pair[1]
-            # Use the block's id as the reference key
-            blocks[str(id(block))] = block
 
-    return blocks
-
-
-def bem_scope(root: str = './blocks') -> Dict[str, Dict[str, Any]]:
+def bem_scope(root: str = './blocks', index: Union[str, bool, None] = None,
+              validate: bool = True, workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
     """
     Scans a directory structure to find available blocks and their modifiers.
     
     Args:
-        root (str, optional): The root directory to scan for blocks. Defaults to './blocks'.
+        root (str, optional): The root directory to scan for blocks, or a library archive
+            written by `bempy pack`. Defaults to './blocks'.
+        index (Union[str, bool, None], optional): Manifest file that caches directory
+            listings between runs. True uses `.bempy-index` inside the root. Defaults to None.
+        validate (bool, optional): Check directory mtimes against the manifest and rescan
+            changed directories. Disable for immutable trees. Defaults to True.
+        workers (Optional[int], optional): Scan top-level scopes concurrently in a thread
+            pool of this size. Defaults to None.
         
     Returns:
         Dict[str, Dict[str, Any]]: A dictionary containing the available blocks and their modifiers.
         
     Example:
-        >>> blocks = bem_scope('./my_blocks')
+        >>> blocks = bem_scope('./my_blocks', index=True)
         >>> print(blocks['game']['Character']['gender'])
         ['male', 'female', 'non-binary']
     """
-    blocks = defaultdict(dict)
-
-    # Get Blocks from current root scopes
-    if os.path.isdir(root):
-        scopes = [ name for name in os.listdir(root) if os.path.isdir(os.path.join(root, name)) ]
-        scopes = [ name for name in scopes if name[0].islower() ]
-    else:
-        return {}
-
-    for scope in scopes:
-        # Get Blocks from current root
-        scope_root = root + '/' + scope
-        for file in glob.glob(scope_root + '/*/__init__.py'):
-            tail = file.split('/')
-            element = tail[-2]
-            if not element[0].isupper():
-                continue
-
-            blocks[scope][element] = defaultdict(list)
+    # Archives carry the listings of every directory
+    if is_archive(root):
+        return scan_scope(archive_scope_index(root))
 
-            for mod_type, mod_value in [(mod.split('/')[-2], mod.split('/')[-1]) for mod in glob.glob(scope_root + '/%s/_*/*.py' % element)]:
-                if mod_value.find('_test.py') != -1:
-                    continue
+    if index is True:
+        index = os.path.join(root, INDEX_FILE)
 
-                mod_type = mod_type[1:]
-                mod_value = mod_value.replace('.py', '')
+    scope_index = ScopeIndex(root, index or None, validate)
+    blocks = scan_scope(scope_index, workers=workers)
+    scope_index.save()
 
-                blocks[scope][element][mod_type].append(mod_value)
-
-            blocks[scope][element] = dict(blocks[scope][element])
-
-        inner_blocks = bem_scope(scope_root)
-        blocks[scope] = {
-            **blocks[scope],
-            **inner_blocks
-        }
-
-    return dict(blocks)
+    return blocks
 
 
 def bem_scope_module(scopes: Dict[str, Any], root: str = '') -> None:
@@ -112,10 +91,7 @@ def bem_scope_module(scopes: Dict[str, Any], root: str = '') -> None:
         bem_scope_module(scopes[scope], '.'.join([root, scope]))
 
     for block in blocks_keys:
-        def build(name=root[1:] + '.' + block, *arg, **kwarg):
-            return Build(name, *arg, **kwarg).block
-
-        blocks[block] = build
+        blocks[block] = block_builder(root[1:] + '.' + block)
 
     if root:
         sys.modules[__name__ + root] = type(root, (object,), blocks)
@@ -123,12 +99,14 @@ def bem_scope_module(scopes: Dict[str, Any], root: str = '') -> None:
 # Path to the built-in blocks
 module_blocks = os.path.dirname(__file__) + '/blocks/'
 
-# Merge built-in blocks with user blocks
-bem_scope_dict = merge(
-    bem_scope(module_blocks),
-    bem_scope()
-)
+# Make blocks available for import, scopes are resolved on first import
+scope_finder = ScopeFinder(__name__, library_registry.roots).install()
+
+
+def __getattr__(name: str) -> Any:
+    # Merged built-in and user blocks, scanned only when requested
+    if name == 'bem_scope_dict':
+        return merge(bem_scope(module_blocks), bem_scope())
 
-# Make blocks available for import
-bem_scope_module(bem_scope_dict)
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
 
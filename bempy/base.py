@@ -1,8 +1,164 @@
-from inspect import getfullargspec
-from typing import List, Dict, Any, Optional, Tuple
+import copyreg
+from abc import ABCMeta
+from contextvars import ContextVar
+from inspect import getfullargspec, iscoroutine, iscoroutinefunction
+from typing import List, Dict, Any, Optional, Tuple, Callable, FrozenSet, Iterable, Sequence, Set, Union
 
+from .instrument import sinks, timed_init
+from .pickling import block_state, reduce_block_class, restore_block
+from .registry import ActiveScope
+from .utils.slots import attribute_access, slotted_copies
 
-class Block:
+# (init, accepted argument names, accepts positional arguments)
+InitEntry = Tuple[Callable, FrozenSet[str], bool]
+InitPlan = Tuple[InitEntry, ...]
+
+# Plan entries grouped into waves, inits of a wave can run concurrently
+InitWaves = Tuple[InitPlan, ...]
+
+
+def dispatch_plan(models: Iterable[type]) -> InitPlan:
+    """
+    Returns the init dispatch plan for the given models.
+
+    The plan lists the `init` method of every model that has one together with
+    the argument names it accepts, so instantiation routes keyword arguments
+    without introspection.
+
+    Args:
+        models (Iterable[type]): Model classes in initialization order.
+
+    Returns:
+        InitPlan: An immutable tuple of (init, argument names, positional) entries.
+    """
+    plan = []
+
+    for cls in models:
+        if hasattr(cls, 'init'):
+            keys = getfullargspec(cls.init).args
+            plan.append((cls.init, frozenset(keys), len(keys) != 1))
+
+    return tuple(plan)
+
+
+def timed_plan(plan: InitPlan, models: Iterable[type]) -> InitPlan:
+    """
+    Returns a copy of an init dispatch plan whose inits report 'init' events.
+
+    Args:
+        plan (InitPlan): The init dispatch plan of the models.
+        models (Iterable[type]): Model classes the plan was computed from.
+
+    Returns:
+        InitPlan: The plan with inits wrapped by `timed_init`, named by model.
+    """
+    names = [cls.__module__ + '.' + cls.__name__ for cls in models if hasattr(cls, 'init')]
+
+    return tuple((timed_init(init, name), mount_args_keys, positional)
+                 for (init, mount_args_keys, positional), name in zip(plan, names))
+
+
+def class_plan(cls: type) -> InitPlan:
+    """
+    Returns the init dispatch plan to create a block with.
+
+    The plain plan is used unless instrumentation sinks are active, then a
+    timed copy of it is computed once per class, so blocks built before
+    `add_sink` are timed and nothing is wrapped after `remove_sink`.
+
+    Args:
+        cls (type): The block class.
+
+    Returns:
+        InitPlan: The plan of the class.
+    """
+    plan = cls.init_plan
+    if plan is None:
+        plan = dispatch_plan(cls.models)
+
+    if sinks:
+        timed = cls.__dict__.get('timed_init_plan')
+        if timed is None:
+            timed = timed_plan(plan, cls.models)
+            # Classes without a plan are composed on the fly, keep nothing on them
+            if cls.init_plan is not None:
+                cls.timed_init_plan = timed
+
+        plan = timed
+
+    return plan
+
+
+def dispatch_waves(plan: InitPlan) -> InitWaves:
+    """
+    Groups an init dispatch plan into waves for asynchronous initialization.
+
+    Consecutive `async def init` methods share a wave unless one of them reads
+    or writes an attribute another one writes. Synchronous inits and async
+    inits whose attribute access is unknown get a wave of their own, so they
+    still see everything the previous models set, in plan order.
+
+    Args:
+        plan (InitPlan): The init dispatch plan of a block.
+
+    Returns:
+        InitWaves: Plan entries grouped into waves, in plan order.
+    """
+    waves: List[InitPlan] = []
+    wave: List[InitEntry] = []
+    reads: Set[str] = set()
+    writes: Set[str] = set()
+
+    for entry in plan:
+        access = attribute_access(entry[0]) if iscoroutinefunction(entry[0]) else None
+
+        if wave and (access is None or access[0] & writes or access[1] & (reads | writes)):
+            waves.append(tuple(wave))
+            wave, reads, writes = [], set(), set()
+
+        if access is None:
+            waves.append((entry,))
+        else:
+            wave.append(entry)
+            reads |= access[0]
+            writes |= access[1]
+
+    if wave:
+        waves.append(tuple(wave))
+
+    return tuple(waves)
+
+
+class BlockType(ABCMeta):
+    """
+    Metaclass of blocks.
+
+    Derived from `ABCMeta`, so models can also inherit from `ABC` and declare
+    abstract methods; composed classes stay abstract until a model defines them.
+
+    Composed block classes are pickled by block name and request instead of
+    by reference, see `reduce_block_class`.
+
+    Slotted blocks inherit from slotted copies of their models, a block
+    model also counts as a base of classes that inherit from its copy.
+    """
+
+    def __instancecheck__(cls, instance: Any) -> bool:
+        return ABCMeta.__instancecheck__(cls, instance) or cls.__subclasscheck__(type(instance))
+
+    def __subclasscheck__(cls, subclass: type) -> bool:
+        if ABCMeta.__subclasscheck__(cls, subclass):
+            return True
+
+        copy = slotted_copies.get(cls) if slotted_copies else None
+
+        return copy is not None and copy is not cls and copy in getattr(subclass, '__mro__', ())
+
+
+copyreg.pickle(BlockType, reduce_block_class)
+
+
+class Block(metaclass=BlockType):
     """
     The base Block class that all BEM blocks inherit from.
     
@@ -10,16 +166,24 @@ class Block:
     It handles initialization, inheritance, and string representation.
     
     Attributes:
-        scope (list): Global BEM scope that tracks all block instances.
-        owner (list): Tracks the current active block.
+        scope (BlockRegistry): BEM scope that weakly tracks block instances, the registry
+            of the active `session()` or the global one.
+        owner (ContextVar): The block being initialized in the current thread or task.
         files (List[str]): List of source files used in building the block.
         inherited (list): List of block classes that this block inherits from.
+        init_plan (Optional[InitPlan]): Precomputed model init dispatch plan.
+        init_waves (Optional[InitWaves]): Init plan grouped for `acreate`, computed on first use.
+        timed_init_plan (Optional[InitPlan]): Init plan reporting 'init' events, used
+            while instrumentation sinks are active and computed on first use.
     """
-    # Global BEM scope
-    scope = []
+    # Instances keep a weak reference slot, generated classes decide about __dict__
+    __slots__ = ('__weakref__',)
 
-    # Active block
-    owner = [None]
+    # BEM scope of the active session, global outside of sessions
+    scope = ActiveScope()
+
+    # Active block, separate for every thread and asyncio task
+    owner: ContextVar = ContextVar('bempy_owner', default=None)
 
     # List of source files used in block building
     files: List[str] = ['base.py']
@@ -30,6 +194,15 @@ class Block:
     # * inherited prop add ability to use any iherited modification
     inherited = []
 
+    # Model init dispatch plan, computed by the builder for each generated class
+    init_plan: Optional[InitPlan] = None
+
+    # Init plan grouped into concurrent waves, computed by the first acreate
+    init_waves: Optional[InitWaves] = None
+
+    # Init plan with timed inits, computed by the first instrumented instantiation
+    timed_init_plan: Optional[InitPlan] = None
+
     def __init__(self, *args, **kwargs):
         """
         Initialize Block instance and perform required setup.
@@ -42,26 +215,183 @@ class Block:
             **kwargs: Arbitrary keyword arguments that will be passed to the init method
                      of each model in the block.
         """
-        # Update the global scope with the current block instance
-        if not len(self.scope):
+        # Block being initialized in this context is the owner of current instance,
+        # blocks without an owner are the roots of the scope
+        owner = self.owner.get()
+        if owner is None:
             self.root = True
 
-        # Previous block, if they didn't release, owner of current instance
-        self.scope.append((self.owner[-1], self))
-        self.owner.append(self)
+        self.scope.add(self, owner)
+        token = self.owner.set(self)
+
+        plan = self.init_plan
+        if plan is None or sinks:
+            plan = class_plan(type(self))
 
-        for cls in self.models:
-            # Check if the class has an init method
-            if hasattr(cls, 'init'):
-                mount_args_keys = getfullargspec(cls.init).args
-                if len(mount_args_keys) == 1:
-                    args = []
+        try:
+            for init, mount_args_keys, positional in plan:
+                if not positional:
+                    args = ()
 
                 mount_args = {key: value for key, value in kwargs.items()
                             if key in mount_args_keys}
-                cls.init(self, *args, **mount_args)
+                result = init(self, *args, **mount_args)
+                if result is not None:
+                    check_sync(result, self)
+        finally:
+            self.owner.reset(token)
 
-        self.owner.pop()
+    @classmethod
+    async def acreate(cls, *args, **kwargs) -> 'Block':
+        """
+        Creates a block whose models may define `async def init`.
+
+        Models are initialized in the same order as by the constructor, except
+        that async inits which do not touch each other's attributes run
+        concurrently, see `dispatch_waves`. Blocks created inside an async
+        init are owned by this block.
+
+        Args:
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments that will be passed to the init method
+                     of each model in the block.
+
+        Returns:
+            Block: The initialized block.
+
+        Example:
+            >>> App = Server(backend='flask', extensions=['cache', 'queue'])
+            >>> server = await App.acreate(host='localhost', queue='jobs')
+        """
+        waves = cls.__dict__.get('init_waves')
+        if waves is None:
+            plan = cls.init_plan
+            if plan is None:
+                plan = dispatch_plan(cls.models)
+
+            waves = cls.init_waves = dispatch_waves(plan)
+
+        if sinks:
+            # Waves keep their grouping, entries are swapped for their timed copies
+            timed = dict(zip(cls.init_plan or dispatch_plan(cls.models), class_plan(cls)))
+            waves = tuple(tuple(timed[entry] for entry in wave) for wave in waves)
+
+        block = cls.__new__(cls)
+        owner = cls.owner.get()
+        if owner is None:
+            block.root = True
+
+        cls.scope.add(block, owner)
+        token = cls.owner.set(block)
+
+        # asyncio is imported only by asynchronous code, it is slow to import
+        import asyncio
+
+        try:
+            for wave in waves:
+                results = []
+                for init, mount_args_keys, positional in wave:
+                    # As in the constructor, the first init without positional arguments drops them for good
+                    if not positional:
+                        args = ()
+
+                    mount_args = {key: value for key, value in kwargs.items()
+                                  if key in mount_args_keys}
+                    results.append(init(block, *args, **mount_args))
+
+                if len(results) == 1:
+                    if iscoroutine(results[0]):
+                        await results[0]
+                else:
+                    await asyncio.gather(*results)
+        finally:
+            cls.owner.reset(token)
+
+        return block
+
+    @classmethod
+    def bulk(cls, rows: Union[Sequence[Dict[str, Any]], Dict[str, Sequence[Any]]],
+             register: bool = True) -> List['Block']:
+        """
+        Creates many blocks of this class at once.
+
+        All instances share one dispatch plan, arguments are routed to model
+        init methods once per distinct set of keys, and instances are
+        registered in the scope in a single batch before their models run.
+
+        Args:
+            rows (Union[Sequence[Dict[str, Any]], Dict[str, Sequence[Any]]]): Keyword
+                arguments for each block, or columns of equal length by argument name.
+            register (bool, optional): Track the blocks in the scope. Unregistered
+                blocks are not returned by `get_created_blocks`. Defaults to True.
+
+        Returns:
+            List[Block]: The created blocks in the order of the rows.
+
+        Example:
+            >>> Character = Build('game.Character', race='elf').block
+            >>> elves = Character.bulk({'level': [1, 2, 3], 'mana': [10, 20, 30]})
+        """
+        plan = class_plan(cls)
+
+        # Model inits of a row, by the keys of the row
+        routes: Dict[Tuple[str, ...], Callable[[Any, Any], None]] = {}
+
+        # Rows are walked twice, iterators would be exhausted by the first pass
+        columns = None
+        if isinstance(rows, dict):
+            # Columns share one route that reads the values of a row by position
+            columns = bulk_route(plan, tuple(rows), by_position=True)
+            rows = list(zip(*rows.values()))
+        else:
+            rows = list(rows)
+
+        new = cls.__new__
+        blocks = [new(cls) for _ in range(len(rows))]
+        if not blocks:
+            return blocks
+
+        if register:
+            owner = cls.owner.get()
+            if owner is None:
+                for block in blocks:
+                    block.root = True
+
+            cls.scope.add_many(blocks, owner)
+
+        owner_set = cls.owner.set
+
+        # Resetting to the first token restores the owner from before the batch
+        token = owner_set(blocks[0])
+        try:
+            if columns is not None:
+                for block, row in zip(blocks, rows):
+                    owner_set(block)
+                    columns(block, row)
+            else:
+                for block, row in zip(blocks, rows):
+                    keys = tuple(row)
+                    route = routes.get(keys)
+                    if route is None:
+                        route = routes[keys] = bulk_route(plan, keys)
+
+                    owner_set(block)
+                    route(block, row)
+        finally:
+            cls.owner.reset(token)
+
+        return blocks
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[type, Dict[str, Any]]]:
+        """
+        Pickles the block as its class and attributes.
+
+        Unpickling restores the attributes without running model inits.
+
+        Returns:
+            Tuple[Callable, Tuple[type, Dict[str, Any]]]: The reduce value of the block.
+        """
+        return restore_block, (type(self), block_state(self))
 
     def __str__(self) -> str:
         """
@@ -98,3 +428,52 @@ class Block:
             str: A formatted string representing the block.
         """
         return str(self)
+
+
+def bulk_route(plan: InitPlan, keys: Sequence[str], by_position: bool = False) -> Callable[[Any, Any], None]:
+    """
+    Returns a function that runs the model inits of a block for one row.
+
+    The function is generated with the routed arguments spelled out as
+    keywords, so a row costs one call per init and no argument dictionaries.
+
+    Args:
+        plan (InitPlan): The init dispatch plan of the block class.
+        keys (Sequence[str]): Argument names of the rows the route is used for.
+        by_position (bool, optional): Rows are tuples of values in the order
+            of `keys` instead of dictionaries. Defaults to False.
+
+    Returns:
+        Callable[[Any, Any], None]: A function of a block and its row.
+    """
+    namespace: Dict[str, Any] = {'check_sync': check_sync}
+    lines = ['def route(block, row):']
+    for index, (init, mount_args_keys, positional) in enumerate(plan):
+        namespace['init_%d' % index] = init
+        # Argument names come from init signatures, so they are identifiers
+        arguments = ''.join(', %s=row[%r]' % (key, position if by_position else key)
+                            for position, key in enumerate(keys) if key in mount_args_keys)
+        lines += ['    result = init_%d(block%s)' % (index, arguments),
+                  '    if result is not None:',
+                  '        check_sync(result, block)']
+
+    exec('\n'.join(lines + ['    return None']), namespace)
+
+    return namespace['route']
+
+
+def check_sync(result: Any, block: Block) -> None:
+    """
+    Raises if a model init called synchronously returned a coroutine.
+
+    Args:
+        result (Any): Value returned by the model init.
+        block (Block): The block being initialized.
+
+    Raises:
+        TypeError: The init is `async def`, the block must be created with `acreate`.
+    """
+    if iscoroutine(result):
+        result.close()
+        raise TypeError("%s has async init %s, create it with 'await %s.acreate(...)'"
+                        % (block.name, result.__qualname__, block.__class__.__name__))
@@ -0,0 +1,719 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import combinations
+from math import comb, erfc, sqrt
+from statistics import median
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from .utils.archive import pack_library
+
+# Version of the benchmark result format
+RESULT_VERSION = 1
+
+# Scenario units, every scenario is lower-is-better
+UNITS = {
+    'import': 's',
+    'scope_scan': 's',
+    'build_cold': 's',
+    'build_warm': 's',
+    'instantiate': 's',
+    'memory_per_instance': 'B',
+    'peak_memory': 'B',
+    'startup_directory': 's',
+    'startup_archive': 's',
+}
+
+
+class LibraryShape(NamedTuple):
+    """
+    Size of a synthetic block library.
+
+    Attributes:
+        scopes (int): Number of scopes.
+        blocks (int): Blocks in every scope.
+        types (int): Modifier types of every block.
+        values (int): Values of every modifier type.
+        depth (int): Length of `inherited` chains, 0 for independent blocks.
+    """
+    scopes: int = 3
+    blocks: int = 10
+    types: int = 3
+    values: int = 4
+    depth: int = 1
+
+
+def generate_library(root: str, shape: LibraryShape, work: int = 0) -> List[str]:
+    """
+    Writes a synthetic block library.
+
+    Block `scopeS.BlockB` inherits `scopeS.Block<B-1>` unless B is a multiple
+    of `depth + 1`, and has modifiers `_type<T>/value<V>.py`. Base and modifier
+    inits store their argument, so instantiation does real work without
+    printing.
+
+    Args:
+        root (str): Directory to write the library to, e.g. './blocks'.
+        shape (LibraryShape): Size of the library.
+        work (int, optional): Iterations of CPU-bound arithmetic in every base init.
+
+    Returns:
+        List[str]: Names of the generated blocks, e.g. 'scope0.Block3'.
+    """
+    names = []
+
+    for scope in range(shape.scopes):
+        for block in range(shape.blocks):
+            block_dir = os.path.join(root, 'scope%d' % scope, 'Block%d' % block)
+            os.makedirs(block_dir, exist_ok=True)
+
+            if block % (shape.depth + 1):
+                source = ("from bempy import Block\n"
+                          "from bempy.scope%d import Block%d\n\n\n"
+                          "class Base(Block):\n"
+                          "    inherited = [Block%d]\n\n" % (scope, block - 1, block - 1))
+            else:
+                source = ("from bempy import Block\n\n\n"
+                          "class Base(Block):\n")
+
+            source += ("    def init(self, value=0):\n"
+                       "        self.value = value\n")
+            if work:
+                source += "        self.checksum = sum(step * step for step in range(%d))\n" % work
+
+            with open(os.path.join(block_dir, '__init__.py'), 'w') as file:
+                file.write(source)
+
+            for mod_type in range(shape.types):
+                mod_dir = os.path.join(block_dir, '_type%d' % mod_type)
+                os.makedirs(mod_dir, exist_ok=True)
+
+                for value in range(shape.values):
+                    with open(os.path.join(mod_dir, 'value%d.py' % value), 'w') as file:
+                        file.write("class Modificator:\n"
+                                   "    def init(self, type%d_arg=%d):\n"
+                                   "        self.type%d = type%d_arg\n" % (mod_type, value, mod_type, mod_type))
+
+            names.append('scope%d.Block%d' % (scope, block))
+
+    return names
+
+
+def block_mods(shape: LibraryShape) -> Dict[str, str]:
+    """
+    Returns the modifiers every benchmarked block is built with.
+
+    Args:
+        shape (LibraryShape): Size of the library.
+
+    Returns:
+        Dict[str, str]: One value of every modifier type.
+    """
+    return {'type%d' % mod_type: 'value%d' % (mod_type % shape.values)
+            for mod_type in range(shape.types)}
+
+
+def reset_library() -> None:
+    """
+    Forgets every built class, resolved library and imported block module.
+
+    Used between cold builds, so each one resolves, imports and composes
+    the blocks again.
+    """
+    from bempy.builder import caches
+    from bempy.finder import ScopeModule
+    from bempy.utils.structer import LIBRARIES_PACKAGE, library_indexes
+
+    for cache in caches.values():
+        cache.clear()
+    library_indexes.clear()
+
+    for name, module in list(sys.modules.items()):
+        if name.startswith(LIBRARIES_PACKAGE + '.') or isinstance(module, ScopeModule):
+            del sys.modules[name]
+
+
+def samples(function: Callable[[], float], repeat: int) -> List[float]:
+    """
+    Returns the results of calling a measurement several times.
+    """
+    return [function() for _ in range(repeat)]
+
+
+def subprocess_env(**variables: str) -> Dict[str, str]:
+    """
+    Returns the environment of a fresh interpreter that imports this bempy.
+
+    Args:
+        **variables (str): Variables to set, BEM_LIBRARIES is removed unless given.
+    """
+    env = dict(os.environ)
+    env.pop('BEM_LIBRARIES', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env.get('PYTHONPATH')]))
+    env.update(variables)
+
+    return env
+
+
+def measure_import() -> float:
+    """
+    Returns seconds spent importing bempy in a fresh interpreter.
+
+    The startup time of an interpreter that imports nothing is subtracted.
+    """
+    env = subprocess_env()
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, env=env)
+
+        return time.perf_counter() - start
+
+    return max(0.0, run('import bempy') - run('pass'))
+
+
+def measure_startup(cwd: str, library: str, names: List[str], mods: Dict[str, str]) -> float:
+    """
+    Returns seconds a fresh interpreter spends scanning a library and building its blocks.
+
+    Importing bempy is not included, see `measure_import`.
+
+    Args:
+        cwd (str): Working directory of the interpreter.
+        library (str): The library, a directory or an archive relative to `cwd`.
+        names (List[str]): Blocks to build.
+        mods (Dict[str, str]): Modifiers every block is built with.
+    """
+    code = ("import time\n"
+            "from bempy import bem_scope\n"
+            "from bempy.builder import Build\n"
+            "start = time.perf_counter()\n"
+            "bem_scope(%r)\n"
+            "for name in %r:\n"
+            "    Build(name, **%r).block\n"
+            "print(time.perf_counter() - start)\n" % (library, names, mods))
+
+    env = subprocess_env(BEM_LIBRARIES=library)
+    output = subprocess.run([sys.executable, '-c', code], check=True, cwd=cwd, env=env,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+    return float(output.split()[-1])
+
+
+def run_benchmarks(shape: LibraryShape = LibraryShape(), instances: int = 10000,
+                   repeat: int = 5) -> Dict[str, Any]:
+    """
+    Benchmarks bempy on a synthetic library.
+
+    The library is generated in a temporary directory that becomes the
+    working directory while benchmarks run. Scenarios:
+
+    - import: seconds to `import bempy` in a fresh interpreter
+    - scope_scan: seconds of `bem_scope` over the library
+    - build_cold: seconds per block class built from empty caches, imports included
+    - build_warm: seconds per block class answered by the builder cache
+    - instantiate: seconds per instance of one block
+    - memory_per_instance: bytes allocated per instance
+    - peak_memory: peak bytes allocated while building and instantiating
+    - startup_directory: seconds a fresh interpreter spends on `bem_scope` and
+      building every block from the library directory, bytecode cached
+    - startup_archive: the same from the library packed by `pack_library`
+
+    Args:
+        shape (LibraryShape, optional): Size of the library.
+        instances (int, optional): Instances created per sample. Defaults to 10000.
+        repeat (int, optional): Samples per scenario. Defaults to 5.
+
+    Returns:
+        Dict[str, Any]: Environment, shape and samples of every scenario.
+
+    Example:
+        >>> results = run_benchmarks(LibraryShape(scopes=2, blocks=5), repeat=3)
+        >>> print(format_table(results))
+    """
+    from bempy import bem_scope, session
+    from bempy.builder import Build
+
+    scenarios: Dict[str, List[float]] = {}
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as root:
+        names = generate_library(os.path.join(root, 'blocks'), shape)
+        mods = block_mods(shape)
+        sys.path.insert(0, root)
+        os.chdir(root)
+        reset_library()
+
+        def scope_scan() -> float:
+            start = time.perf_counter()
+            bem_scope('./blocks')
+
+            return time.perf_counter() - start
+
+        def build() -> float:
+            start = time.perf_counter()
+            for name in names:
+                Build(name, **mods).block
+
+            return (time.perf_counter() - start) / len(names)
+
+        def build_cold() -> float:
+            reset_library()
+
+            return build()
+
+        def instantiate() -> float:
+            Block = Build(names[-1], **mods).block
+            with session():
+                start = time.perf_counter()
+                created = [Block(value=index) for index in range(instances)]
+                elapsed = time.perf_counter() - start
+                del created
+
+            return elapsed / instances
+
+        def memory_per_instance() -> float:
+            Block = Build(names[-1], **mods).block
+            with session():
+                tracemalloc.start()
+                created = [Block(value=index) for index in range(instances)]
+                size = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del created
+
+            return size / instances
+
+        def peak_memory() -> float:
+            tracemalloc.start()
+            build_cold()
+            instantiate()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            return float(peak)
+
+        # The archive is used from a directory without the sources
+        packed = os.path.join(root, 'packed')
+        os.mkdir(packed)
+        pack_library(os.path.join(root, 'blocks'), os.path.join(packed, 'blocks.zip'))
+
+        def startup_directory() -> float:
+            return measure_startup(root, 'blocks', names, mods)
+
+        def startup_archive() -> float:
+            return measure_startup(packed, 'blocks.zip', names, mods)
+
+        try:
+            scenarios['import'] = samples(measure_import, repeat)
+            scenarios['scope_scan'] = samples(scope_scan, repeat)
+            scenarios['build_cold'] = samples(build_cold, repeat)
+            scenarios['build_warm'] = samples(build, repeat)
+            scenarios['instantiate'] = samples(instantiate, repeat)
+            scenarios['memory_per_instance'] = samples(memory_per_instance, repeat)
+            scenarios['peak_memory'] = samples(peak_memory, repeat)
+
+            # The first run writes __pycache__ of the directory library
+            startup_directory()
+            scenarios['startup_directory'] = samples(startup_directory, repeat)
+            scenarios['startup_archive'] = samples(startup_archive, repeat)
+        finally:
+            reset_library()
+            os.chdir(cwd)
+            sys.path.remove(root)
+
+    return {
+        'version': RESULT_VERSION,
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'bempy': bempy_version(),
+        'shape': shape._asdict(),
+        'instances': instances,
+        'repeat': repeat,
+        'scenarios': {name: {'unit': UNITS[name], 'samples': values}
+                      for name, values in scenarios.items()},
+    }
+
+
+def run_parallel_benchmark(instances: int = 20000, workers: Optional[int] = None, work: int = 2000,
+                           repeat: int = 3) -> Dict[str, Any]:
+    """
+    Compares serial and process pool creation of a CPU-bound block.
+
+    The block's init sums `work` squares. Serial samples create the blocks
+    with `bulk`, parallel samples with `BlockPool.create` on a pool started
+    and warmed before timing. Both register the blocks in a session scope.
+
+    Args:
+        instances (int, optional): Blocks created per sample. Defaults to 20000.
+        workers (Optional[int], optional): Worker processes. Defaults to the CPU count.
+        work (int, optional): Iterations in every init. Defaults to 2000.
+        repeat (int, optional): Samples of each mode. Defaults to 3.
+
+    Returns:
+        Dict[str, Any]: Environment, samples of 'serial', 'parallel' and
+            'pool_start' in seconds, and the speedup of the medians.
+
+    Example:
+        >>> print(format_speedup(run_parallel_benchmark(workers=4)))
+    """
+    from bempy import session
+    from bempy.builder import Build
+    from bempy.parallel import BlockPool
+
+    shape = LibraryShape(scopes=1, blocks=1, types=1, values=1, depth=0)
+    rows = {'value': list(range(instances))}
+    scenarios: Dict[str, List[float]] = {'serial': [], 'parallel': [], 'pool_start': []}
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as root:
+        names = generate_library(os.path.join(root, 'blocks'), shape, work)
+        sys.path.insert(0, root)
+        os.chdir(root)
+        reset_library()
+
+        try:
+            Block = Build(names[0], **block_mods(shape)).block
+
+            start = time.perf_counter()
+            pool = BlockPool(workers, classes=[Block])
+            scenarios['pool_start'].append(time.perf_counter() - start)
+
+            with pool:
+                for _ in range(repeat):
+                    with session():
+                        start = time.perf_counter()
+                        Block.bulk(rows)
+                        scenarios['serial'].append(time.perf_counter() - start)
+
+                    with session():
+                        start = time.perf_counter()
+                        pool.create(Block, rows)
+                        scenarios['parallel'].append(time.perf_counter() - start)
+        finally:
+            reset_library()
+            os.chdir(cwd)
+            sys.path.remove(root)
+
+    parallel = median(scenarios['parallel'])
+
+    return {
+        'version': RESULT_VERSION,
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'bempy': bempy_version(),
+        'cpus': os.cpu_count(),
+        'workers': pool.workers,
+        'instances': instances,
+        'work': work,
+        'repeat': repeat,
+        'scenarios': {name: {'unit': 's', 'samples': values} for name, values in scenarios.items()},
+        'speedup': median(scenarios['serial']) / parallel if parallel else 0.0,
+    }
+
+
+def format_speedup(results: Dict[str, Any]) -> str:
+    """
+    Returns parallel benchmark results as a text report.
+
+    Args:
+        results (Dict[str, Any]): Results of `run_parallel_benchmark`.
+
+    Returns:
+        str: Median times, throughput and the speedup over serial creation.
+    """
+    lines = ['bempy %s, %s %s, %d workers on %s CPUs, %d instances, work=%d' % (
+                 results['bempy'], results['implementation'], results['python'], results['workers'],
+                 results['cpus'], results['instances'], results['work']),
+             '%-12s %12s %12s' % ('mode', 'median', 'blocks/s')]
+
+    for name in ('serial', 'parallel'):
+        value = median(results['scenarios'][name]['samples'])
+        lines.append('%-12s %12s %12.0f' % (name, format_value(value, 's'),
+                                            results['instances'] / value if value else 0))
+
+    lines.append('%-12s %12s' % ('pool start', format_value(results['scenarios']['pool_start']['samples'][0], 's')))
+    lines.append('speedup      %.2fx' % results['speedup'])
+
+    return '\n'.join(lines)
+
+
+def bempy_version() -> str:
+    """
+    Returns the installed bempy version, 'unknown' when running from a checkout.
+    """
+    try:
+        from importlib.metadata import version
+
+        return version('bempy')
+    except Exception:
+        return 'unknown'
+
+
+def format_value(value: float, unit: str) -> str:
+    """
+    Returns a value with a readable unit, e.g. '1.25 ms' or '3.2 KiB'.
+    """
+    if unit == 'B':
+        for suffix in ('B', 'KiB', 'MiB'):
+            if abs(value) < 1024 or suffix == 'MiB':
+                return '%.1f %s' % (value, suffix)
+            value /= 1024
+
+    for suffix, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if abs(value) >= scale or suffix == 'us':
+            return '%.2f %s' % (value / scale, suffix)
+
+
+def format_table(results: Dict[str, Any]) -> str:
+    """
+    Returns benchmark results as a text table.
+
+    Args:
+        results (Dict[str, Any]): Results of `run_benchmarks`.
+
+    Returns:
+        str: The median, best and worst sample of every scenario.
+    """
+    shape = ', '.join('%s=%s' % item for item in results['shape'].items())
+    lines = ['bempy %s, %s %s, %s' % (results['bempy'], results['implementation'], results['python'], shape),
+             '%-20s %12s %12s %12s' % ('scenario', 'median', 'min', 'max')]
+
+    for name, scenario in results['scenarios'].items():
+        values, unit = scenario['samples'], scenario['unit']
+        line = '%-20s %12s %12s %12s' % (name, format_value(median(values), unit),
+                                         format_value(min(values), unit), format_value(max(values), unit))
+        if name == 'instantiate' and median(values):
+            line += '   %.0f/s' % (1 / median(values))
+        elif name == 'startup_archive' and 'startup_directory' in results['scenarios']:
+            line += '   %.2fx' % (median(values) / median(results['scenarios']['startup_directory']['samples']))
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+# Default history of benchmark results, one JSON document per line
+HISTORY_FILE = '.bempy-bench.jsonl'
+
+# Largest number of rank assignments the exact Mann-Whitney test enumerates
+EXACT_LIMIT = 20000
+
+
+class Comparison(NamedTuple):
+    """
+    Change of one scenario between a baseline and current results.
+
+    Attributes:
+        scenario (str): Scenario name.
+        unit (str): Unit of the samples.
+        baseline (float): Median of the baseline samples.
+        current (float): Median of the current samples.
+        change (float): Relative change of the median, 0.1 is 10% slower.
+        p_value (float): One-sided Mann-Whitney U test p-value of a slowdown.
+        regression (bool): Significantly slower by more than the threshold.
+    """
+    scenario: str
+    unit: str
+    baseline: float
+    current: float
+    change: float
+    p_value: float
+    regression: bool
+
+
+def save_history(results: Dict[str, Any], path: str = HISTORY_FILE) -> None:
+    """
+    Appends benchmark results to a history file.
+
+    Args:
+        results (Dict[str, Any]): Results of `run_benchmarks`.
+        path (str, optional): The history file. Defaults to HISTORY_FILE.
+    """
+    with open(path, 'a') as file:
+        file.write(json.dumps(results, sort_keys=True) + '\n')
+
+
+def load_history(path: str = HISTORY_FILE) -> List[Dict[str, Any]]:
+    """
+    Returns benchmark results stored in a history file, oldest first.
+
+    Args:
+        path (str, optional): The history file. Defaults to HISTORY_FILE.
+
+    Returns:
+        List[Dict[str, Any]]: Stored results, empty if the file does not exist.
+    """
+    try:
+        with open(path) as file:
+            return [json.loads(line) for line in file if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def find_baseline(history: List[Dict[str, Any]], results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Returns the latest stored results comparable with the given ones.
+
+    Results are comparable when they were taken with the same interpreter
+    version, library shape, number of instances and result format.
+
+    Args:
+        history (List[Dict[str, Any]]): Stored results, oldest first.
+        results (Dict[str, Any]): Current results.
+
+    Returns:
+        Optional[Dict[str, Any]]: The baseline, None if no stored results match.
+    """
+    keys = ('version', 'implementation', 'python', 'shape', 'instances')
+    for entry in reversed(history):
+        if all(entry.get(key) == results.get(key) for key in keys):
+            return entry
+
+    return None
+
+
+def mann_whitney(first: List[float], second: List[float], alternative: str = 'two-sided') -> float:
+    """
+    Returns the p-value of the Mann-Whitney U test.
+
+    Small samples use the exact distribution of U: every assignment of the
+    pooled ranks to the two samples is enumerated, ties included, so a few
+    samples per side can still reach the usual significance levels. Larger
+    samples use the normal approximation with tie correction.
+
+    Args:
+        first (List[float]): Baseline samples.
+        second (List[float]): Current samples.
+        alternative (str, optional): 'two-sided', or 'greater' to test whether
+            the current samples are larger. Defaults to 'two-sided'.
+
+    Returns:
+        float: Probability of a difference at least as large under equal distributions.
+    """
+    n1, n2 = len(first), len(second)
+    if not n1 or not n2:
+        return 1.0
+
+    values = sorted([(value, 0) for value in first] + [(value, 1) for value in second])
+    # Ranks are doubled, so tied mid-ranks stay integers
+    ranks = [0] * len(values)
+    ties = 0
+    index = 0
+    while index < len(values):
+        end = index
+        while end + 1 < len(values) and values[end + 1][0] == values[index][0]:
+            end += 1
+
+        for position in range(index, end + 1):
+            ranks[position] = index + end + 2
+
+        count = end - index + 1
+        ties += count ** 3 - count
+        index = end + 1
+
+    # Doubled U of the current samples, the number of pairs where they are larger
+    offset = n2 * (n2 + 1)
+    u = sum(rank for rank, (value, group) in zip(ranks, values) if group == 1) - offset
+    mean = n1 * n2
+
+    if comb(n1 + n2, n2) <= EXACT_LIMIT:
+        statistics = [sum(chosen) - offset for chosen in combinations(ranks, n2)]
+        if alternative == 'greater':
+            extreme = sum(1 for value in statistics if value >= u)
+        else:
+            extreme = sum(1 for value in statistics if abs(value - mean) >= abs(u - mean))
+
+        return extreme / len(statistics)
+
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    # Every sample is equal
+    if variance <= 0:
+        return 1.0
+
+    if alternative == 'greater':
+        z = (u / 2 - n1 * n2 / 2 - 0.5) / sqrt(variance)
+
+        return min(1.0, erfc(z / sqrt(2)) / 2)
+
+    z = (abs(u / 2 - n1 * n2 / 2) - 0.5) / sqrt(variance)
+
+    return min(1.0, erfc(max(z, 0.0) / sqrt(2)))
+
+
+def min_p_value(n1: int, n2: int) -> float:
+    """
+    Returns the smallest one-sided p-value the exact test can give for the sample sizes.
+
+    Args:
+        n1 (int): Number of baseline samples.
+        n2 (int): Number of current samples.
+    """
+    return 1 / comb(n1 + n2, n2)
+
+
+def compare_results(baseline: Dict[str, Any], results: Dict[str, Any],
+                    threshold: float = 0.1, alpha: float = 0.05) -> List[Comparison]:
+    """
+    Compares every scenario of current results with a baseline.
+
+    A scenario regresses when its median is more than `threshold` worse than
+    the baseline and the one-sided test finds the slowdown significant at
+    level `alpha`, i.e. its p-value is at most `alpha`.
+
+    Args:
+        baseline (Dict[str, Any]): Baseline results.
+        results (Dict[str, Any]): Current results.
+        threshold (float, optional): Tolerated relative slowdown. Defaults to 0.1.
+        alpha (float, optional): Significance level. Defaults to 0.05.
+
+    Returns:
+        List[Comparison]: Scenarios present in both results.
+
+    Example:
+        >>> baseline = find_baseline(load_history(), results)
+        >>> regressions = [item for item in compare_results(baseline, results) if item.regression]
+    """
+    comparisons = []
+    for name, scenario in results['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if not previous:
+            continue
+
+        before, after = median(previous['samples']), median(scenario['samples'])
+        change = (after - before) / before if before else 0.0
+        # Only slowdowns matter, the current samples are tested for being larger
+        p_value = mann_whitney(previous['samples'], scenario['samples'], alternative='greater')
+        comparisons.append(Comparison(name, scenario['unit'], before, after, change, p_value,
+                                      change > threshold and p_value <= alpha))
+
+    return comparisons
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    """
+    Returns a comparison as a text table, regressions are marked.
+
+    Args:
+        comparisons (List[Comparison]): Result of `compare_results`.
+
+    Returns:
+        str: One line per scenario.
+    """
+    lines = ['%-20s %12s %12s %9s %7s' % ('scenario', 'baseline', 'current', 'change', 'p')]
+    for item in comparisons:
+        lines.append('%-20s %12s %12s %+8.1f%% %7.3f%s' % (
+            item.scenario, format_value(item.baseline, item.unit), format_value(item.current, item.unit),
+            item.change * 100, item.p_value, '  REGRESSION' if item.regression else ''))
+
+    return '\n'.join(lines)
@@ -1,14 +1,163 @@
 from inspect import getmro
-from os import path
-from typing import List, Dict, Any, Tuple, Type, Optional
-
-from .base import Block as BaseBlock
-from .utils import uniq_f7, safe_serialize
-from .utils.structer import (get_block_class, get_mod_classes, mods_from_dict,
-                             mods_predefined)
+from itertools import product
+from os import getenv, path
+from threading import Lock
+from time import perf_counter
+from typing import List, Dict, Any, Tuple, Type, Optional, Hashable, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+from .base import Block as BaseBlock, dispatch_plan
+from .instrument import emit, measure, sinks
+from .utils import uniq_f7, freeze
+from .utils.cache import BuildCache
+from .utils.slots import slot_attributes, slotted_bases
+from .utils.structer import (block_class_cache, get_block_class, mod_classes_cache,
+                             mod_values_key, mods_from_dict, mods_predefined,
+                             resolve_mod_classes)
+
+# asyncio and concurrent.futures are imported by Build.ablock, they are slow to import
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future, ThreadPoolExecutor
 
 ModsType = Dict[str, List[str]]
 
+# Compiled block classes shared by every Build, BEM_BLOCK_CACHE=0 disables it
+block_cache = BuildCache('blocks', maxsize=int(getenv('BEM_BLOCK_CACHE') or 256))
+
+# Classes registered by modules written with `bempy compile`, never evicted
+precompiled = BuildCache('precompiled', maxsize=None)
+
+# All caches used while building blocks
+caches = {
+    'blocks': block_cache,
+    'precompiled': precompiled,
+    'block_classes': block_class_cache,
+    'mod_classes': mod_classes_cache,
+}
+
+
+# Block name and modifiers every composed class was first requested with, used by pickle
+block_requests: 'WeakKeyDictionary[Type, Tuple[str, Dict[str, Any]]]' = WeakKeyDictionary()
+
+
+# Executor of Build.ablock, created on first use, BEM_BUILD_WORKERS sets its size
+build_executor: Optional['ThreadPoolExecutor'] = None
+
+# Builds running in an executor by request key, shared by concurrent ablock calls
+pending_builds: Dict[Hashable, 'Future'] = {}
+pending_lock = Lock()
+
+
+def get_build_executor() -> 'ThreadPoolExecutor':
+    """
+    Returns the executor used by `Build.ablock`, creating it once.
+
+    Returns:
+        ThreadPoolExecutor: The shared build executor.
+    """
+    global build_executor
+    from concurrent.futures import ThreadPoolExecutor
+
+    with pending_lock:
+        if build_executor is None:
+            build_executor = ThreadPoolExecutor(max_workers=int(getenv('BEM_BUILD_WORKERS') or 4),
+                                                thread_name_prefix='bempy-build')
+
+    return build_executor
+
+
+def release_build(key: Hashable, future: 'Future') -> None:
+    """
+    Forgets a finished build, later requests are answered by `block_cache`.
+
+    Runs as a done callback, possibly while `pending_lock` is held, so it
+    does not take the lock. A key is only replaced after it was released.
+
+    Args:
+        key (Hashable): The request key of the build.
+        future (Future): The finished build.
+    """
+    if pending_builds.get(key) is future:
+        pending_builds.pop(key, None)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns statistics of every builder cache.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Hits, misses, evictions, size and limits by cache name.
+    """
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def invalidate(name: Optional[str] = None, file: Optional[str] = None) -> int:
+    """
+    Drops cached resolutions and compiled classes of a block or a source file.
+
+    Compiled classes are tagged with the names and files of every model they
+    are composed of, so invalidating an inherited block also drops the blocks
+    built on top of it.
+
+    Args:
+        name (Optional[str], optional): Block name, e.g. 'game.Character'.
+        file (Optional[str], optional): Path of a block or modifier file.
+
+    Returns:
+        int: Number of removed cache entries.
+    """
+    return sum(cache.invalidate(name=name, file=file) for cache in caches.values())
+
+
+def compiled_block(key: Optional[Hashable]) -> Optional[Type]:
+    """
+    Returns the block class already composed for a request key.
+
+    Args:
+        key (Optional[Hashable]): The request key of a build.
+
+    Returns:
+        Optional[Type]: A precompiled or cached class, None if the request was never built.
+    """
+    if len(precompiled):
+        compiled = precompiled.get(key)
+        if compiled:
+            return compiled
+
+    return block_cache.get(key)
+
+
+def cache_key(*parts: Any) -> Optional[Hashable]:
+    """
+    Returns a hashable cache key for the given parts.
+
+    Args:
+        *parts: Values describing a block configuration.
+
+    Returns:
+        Optional[Hashable]: The key, or None if some part could not be hashed.
+    """
+    try:
+        return freeze(parts)
+    except TypeError:
+        return None
+
+
+class Variants(dict):
+    """
+    Block classes built by `Build.many`, keyed by their modifiers.
+
+    Keys are tuples of (mod, value) pairs in the order the axes were given.
+
+    Attributes:
+        timings (Dict[str, float]): Seconds spent in each build phase.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings: Dict[str, float] = {}
+
+
 class Build:
     """
     The Build class is responsible for constructing BEM components with their modifiers.
@@ -18,13 +167,19 @@ class Build:
     
     Attributes:
         name (str): The name of the block.
+        request (ModsType): The modifiers the block was requested with.
         mods (ModsType): A dictionary of modifiers applied to the block.
         props (ModsType): A dictionary of properties passed to the block.
         models (list): A list of model classes that make up the block.
         inherited (list): A list of inherited block classes.
         files (List[str]): A list of source files used in building the block.
+        slots (bool): Build classes with `__slots__` instead of an instance `__dict__`
+            where the models allow it. Enabled with BEM_SLOTS=1.
     """
-    
+
+    # Opt-in slotted layout of generated classes
+    slots: bool = getenv('BEM_SLOTS') == '1'
+
     def __init__(self, name: str, *args, **kwargs: ModsType):
         """
         Initializes a Build object with the given name and modifiers.
@@ -35,15 +190,27 @@ class Build:
             **kwargs (ModsType): Keyword arguments that represent the modifiers to apply to the block.
         """
         self.name: str = name
+        self.request: ModsType = kwargs
         self.mods: ModsType = {}
         self.props: ModsType = {}
         self.models = []
         self.inherited = []
         self.files: List[str] = []
 
+        # Same request already compiled, take the state from the class
+        self.request_key = cache_key('request', name, kwargs, self.slots)
+        self.compiled: Optional[Type] = compiled_block(self.request_key)
+        if self.compiled:
+            self.base = get_block_class(self.name)[1]
+            self.mods = self.compiled.mods
+            self.props = self.compiled.props
+            self.files = list(self.compiled.files)
+            self.models = list(reversed(self.compiled.models)) if self.base else []
+            return
+
         # Retrieve the base block class and file path
         base_file:str
-        base_file, self.base = get_block_class(self.name)
+        base_file, self.base = measure('block_class', self.name, get_block_class, self.name)
 
         # If the base block does not exist, set properties directly and return
         if not self.base:
@@ -64,19 +231,19 @@ class Build:
 
         # Combine predefined and provided modifiers
         request_mods = {
-            **mods_predefined(self.base),
+            **measure('mods_predefined', self.name, mods_predefined, self.base),
             **mods_from_dict(kwargs)
         }
-        request_mods_json = safe_serialize(request_mods)
         self.mods = {}
 
         # Check for inherited blocks
         if hasattr(self.base, 'inherited'):
-            mod_files, mod_classes, mods_loaded = get_mod_classes(self.name, request_mods_json)
+            mod_files, mod_classes, mods_loaded = measure('mod_classes', self.name, resolve_mod_classes,
+                                                              self.name, request_mods)
             for cls in mod_classes:
                 request_mods = {
                     **request_mods,
-                    **mods_predefined(cls)
+                    **measure('mods_predefined', self.name, mods_predefined, cls)
                 }
 
             # Ensure inherited is a list
@@ -86,7 +253,7 @@ class Build:
 
             # Add inherited blocks to bases
             for model in self.inherited:
-                block_base = model(**request_mods)
+                block_base = measure('inherited', getattr(model, 'block_name', self.name), model, **request_mods)
                 bases.append(block_base)
 
         # Set the name of the base block
@@ -95,7 +262,7 @@ class Build:
 
         # Process each base class
         for index, base in enumerate(bases):
-            base_file, base_cls = get_block_class(base.name)
+            base_file, base_cls = measure('block_class', base.name, get_block_class, base.name)
 
             # Skip if the base class is already included in models
             if hasattr(self.base, 'models') and base_cls in self.base.models:
@@ -108,14 +275,14 @@ class Build:
             files = [str(base_file)]
 
             request_mods = {
-                **mods_predefined(base_cls),
+                **measure('mods_predefined', self.name, mods_predefined, base_cls),
                 **request_mods,
             }
-            request_mods_json = safe_serialize(request_mods)
-            mod_files, mod_classes, mods_loaded = get_mod_classes(base.name, request_mods_json)
+            mod_files, mod_classes, mods_loaded = measure('mod_classes', base.name, resolve_mod_classes,
+                                                              base.name, request_mods)
             for cls in mod_classes:
                 request_mods = {
-                    **mods_predefined(cls),
+                    **measure('mods_predefined', self.name, mods_predefined, cls),
                     **request_mods,
                 }
 
@@ -171,6 +338,96 @@ class Build:
 
                 self.props[mod] = prop
 
+    @classmethod
+    def many(cls, name: str, **axes: List[Any]) -> Variants:
+        """
+        Builds every combination of the given modifier values.
+
+        The base block and every distinct modifier value are resolved and
+        imported up front into `block_class_cache` and `mod_classes_cache`.
+        Each combination is then a regular `Build`, whose lookups are served
+        from those caches, so filesystem probes and imports grow with the
+        number of modifier values while composition still runs once per
+        combination. A value may itself be a list to select several
+        modifiers in one variant.
+
+        Args:
+            name (str): The name of the block to build.
+            **axes (List[Any]): Alternative values for each modifier.
+
+        Returns:
+            Variants: Block classes keyed by ((mod, value), ...) with per-phase timings.
+
+        Example:
+            >>> variants = Build.many('backend.Server', backend=['flask', 'django'],
+            ...                       config=['debug', 'production'])
+            >>> variants[(('backend', 'flask'), ('config', 'debug'))]
+        """
+        variants = Variants()
+        axes = {mod: values if isinstance(values, (list, tuple)) else [values]
+                for mod, values in axes.items()}
+
+        start = perf_counter()
+        get_block_class(name)
+        variants.timings['resolve'] = perf_counter() - start
+
+        start = perf_counter()
+        for mod, values in axes.items():
+            for value in values:
+                resolve_mod_classes(name, mods_from_dict({mod: value}))
+        variants.timings['modifiers'] = perf_counter() - start
+
+        start = perf_counter()
+        for combination in product(*axes.values()):
+            kwargs = dict(zip(axes, combination))
+            key = tuple((mod, mod_values_key(value)) for mod, value in kwargs.items())
+            variants[key] = cls(name, **kwargs).block
+        variants.timings['build'] = perf_counter() - start
+
+        return variants
+
+    @classmethod
+    async def ablock(cls, name: str, *args, executor: Optional['Executor'] = None,
+                     **kwargs: ModsType) -> Type:
+        """
+        Builds a block class without blocking the event loop.
+
+        Compiled configurations are returned from `block_cache` right away.
+        Otherwise resolution, filesystem probes and imports run in an executor,
+        and concurrent requests for the same configuration wait for a single
+        build. Cancelling a caller does not cancel the build others wait for.
+
+        Args:
+            name (str): The name of the block to build.
+            *args: Variable length argument list.
+            executor (Optional[Executor], optional): Executor to build in.
+                Defaults to a shared thread pool, see `get_build_executor`.
+            **kwargs (ModsType): Keyword arguments that represent the modifiers to apply to the block.
+
+        Returns:
+            Type: The compiled block class.
+
+        Example:
+            >>> Server = await Build.ablock('backend.Server', backend='flask', config='debug')
+        """
+        import asyncio
+
+        key = cache_key('request', name, kwargs, cls.slots)
+        compiled = compiled_block(key)
+        if compiled:
+            return compiled
+
+        executor = executor or get_build_executor()
+        with pending_lock:
+            future = pending_builds.get(key) if key is not None else None
+            if future is None:
+                future = executor.submit(lambda: cls(name, *args, **kwargs).block)
+                if key is not None:
+                    pending_builds[key] = future
+                    future.add_done_callback(lambda done: release_build(key, done))
+
+        return await asyncio.shield(asyncio.wrap_future(future))
+
     def blocks(self) -> Tuple:
         """
         Returns a tuple of model classes that make up the block.
@@ -190,31 +447,63 @@ class Build:
     @property
     def block(self) -> Type:
         """
-        Returns a new block type with the specified name, modifiers, and properties.
+        Returns a block type with the specified name, modifiers, and properties.
         
         This property creates a new class dynamically with the appropriate inheritance
-        and attributes.
+        and attributes. Classes are memoized in `block_cache`, so identical
+        configurations share the same class object.
         
         Returns:
             Type: A dynamically created block class.
         """
+        if self.compiled:
+            return self.compiled
+
         self.inherited = []
 
         self.files.reverse()
         self.files = uniq_f7(self.files)
         self.files.reverse()
 
-        Block = type(self.name,
-                     tuple(self.models),
-                     {
-                         'name': self.name,
-                         'mods': self.mods,
-                         'props': self.props,
-                         'files': self.files,
-                     })
+        # Tag the class with every composed block, so changes in inherited blocks invalidate it
+        names = uniq_f7([self.name] + [model.name for model in self.models
+                                       if isinstance(model.__dict__.get('name'), str)])
+
+        key = cache_key('block', self.name, tuple(self.models), self.mods, self.props, self.slots)
+        cached = block_cache.get(key)
+        if cached:
+            block_cache.set(self.request_key, cached, names=names, files=cached.files)
+            self.compiled = cached
+
+            return cached
+
+        bases = tuple(self.models)
+        namespace = {
+            'name': self.name,
+            'mods': self.mods,
+            'props': self.props,
+            'files': self.files,
+        }
+
+        # Models that assign attributes dynamically keep the __dict__ layout
+        attributes = slot_attributes(bases) if self.slots and self.base else None
+        if attributes is not None:
+            bases = slotted_bases(bases)
+            namespace['__slots__'] = attributes
+
+        start = perf_counter() if sinks else None
+        Block = type(self.name, bases, namespace)
 
         Block.classes = list(getmro(Block))
         Block.models = self.blocks()
+        Block.init_plan = dispatch_plan(Block.models)
+        if start is not None:
+            emit('type', self.name, perf_counter() - start)
+
+        block_cache.set(key, Block, names=names, files=self.files)
+        block_cache.set(self.request_key, Block, names=names, files=self.files)
+        block_requests[Block] = (self.name, self.request)
+        self.compiled = Block
 
         return Block
 
@@ -106,14 +106,18 @@ def create_modifier(block_name: str, mod_type: str, mod_value: str, path: str =
         print(f"Modifier '{mod_type}={mod_value}' for block '{block_name}' already exists")
 
 
-def list_blocks(path: str = './blocks') -> None:
+def list_blocks(path: str = './blocks', index: Optional[str] = None, validate: bool = True,
+                workers: Optional[int] = None) -> None:
     """
     Lists all available BEM blocks and their modifiers.
     
     Args:
         path (str, optional): The path to the blocks directory. Defaults to './blocks'.
+        index (Optional[str], optional): Manifest file caching the scan. Defaults to None.
+        validate (bool, optional): Rescan directories changed since the manifest was written.
+        workers (Optional[int], optional): Threads used to scan scopes concurrently.
     """
-    blocks = bem_scope(path)
+    blocks = bem_scope(path, index=index, validate=validate, workers=workers)
     if not blocks:
         print(f"No blocks found in {path}")
         return
@@ -126,6 +130,222 @@ def list_blocks(path: str = './blocks') -> None:
                 print(f"    {mod_type}: {', '.join(mod_values)}")
 
 
+def parse_pairs(values: List[str]) -> Dict[str, str]:
+    """
+    Parses modifiers or arguments given as 'key=value' strings.
+
+    Args:
+        values (List[str]): Pairs, e.g. ['race=elf', 'extensions=cors,db'].
+
+    Returns:
+        Dict[str, str]: Values by key, comma separated values are kept as is.
+    """
+    pairs = {}
+    for value in values:
+        key, separator, pair_value = value.partition('=')
+        if not separator or not key:
+            raise argparse.ArgumentTypeError(f"'{value}' must be in the format key=value")
+
+        pairs[key] = pair_value
+
+    return pairs
+
+
+def profile_block(name: str, mods: Dict[str, str], count: int = 1,
+                  kwargs: Optional[Dict[str, str]] = None) -> None:
+    """
+    Builds a block from a cold cache, instantiates it and prints time spent in each phase.
+
+    Args:
+        name (str): The name of the block (e.g., 'game/Character').
+        mods (Dict[str, str]): Modifiers to build the block with.
+        count (int, optional): Number of instances to create. Defaults to 1.
+        kwargs (Optional[Dict[str, str]], optional): Arguments passed to each instance.
+    """
+    import contextlib
+    import io
+    from time import perf_counter
+
+    from bempy.bench import reset_library
+    from bempy.builder import Build
+    from bempy.instrument import Histogram, instrument
+
+    # Blocks are imported from ./blocks
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    name = name.replace('/', '.')
+    # Every cache, library index and block module, so inherited blocks are cold as well
+    reset_library()
+    histogram = Histogram()
+
+    # Models usually print while initializing, keep the report readable
+    with instrument(histogram), contextlib.redirect_stdout(io.StringIO()):
+        start = perf_counter()
+        block = Build(name, **mods).block
+        build_time = perf_counter() - start
+
+        start = perf_counter()
+        for _ in range(count):
+            block(**(kwargs or {}))
+        instantiate_time = perf_counter() - start
+
+    title = ', '.join(f"{mod}={value}" for mod, value in mods.items())
+    print(f"{name}" + (f" ({title})" if title else ''))
+
+    summary = histogram.summary()
+    width = max([len('phase')] + [len(phase) for phase in summary]) + 2
+    print(f"  {'phase':<{width}}{'count':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}")
+    for phase, stats in summary.items():
+        print(f"  {phase:<{width}}{stats['count']:>7}{stats['total'] * 1000:>11.3f}"
+              f"{stats['mean'] * 1000:>10.3f}{stats['max'] * 1000:>10.3f}")
+
+    print(f"  build {build_time * 1000:.3f} ms, {count} instance(s) {instantiate_time * 1000:.3f} ms")
+
+    models = sorted(histogram.names.get('init', {}).items(), key=lambda item: -item[1])
+    if models:
+        print("  init by model:")
+        width = max(len(model) for model, _ in models) + 2
+        for model, seconds in models:
+            print(f"    {model:<{width}}{seconds * 1000:>10.3f} ms")
+
+
+def bench(shape: Dict[str, int], instances: int = 10000, repeat: int = 5,
+          output_format: str = 'table', output: Optional[str] = None, save: bool = False,
+          compare: bool = False, history: Optional[str] = None, baseline: Optional[str] = None,
+          threshold: float = 0.1, alpha: float = 0.05) -> int:
+    """
+    Runs the benchmark suite on a synthetic block library and prints the results.
+
+    Args:
+        shape (Dict[str, int]): Library size, see `bempy.bench.LibraryShape`.
+        instances (int, optional): Instances created per sample. Defaults to 10000.
+        repeat (int, optional): Samples per scenario. Defaults to 5.
+        output_format (str, optional): 'table' or 'json'. Defaults to 'table'.
+        output (Optional[str], optional): File to write the JSON results to.
+        save (bool, optional): Append the results to the history file.
+        compare (bool, optional): Compare the results with the latest comparable history entry.
+        history (Optional[str], optional): The history file. Defaults to HISTORY_FILE.
+        baseline (Optional[str], optional): JSON results file to compare with instead of the history.
+        threshold (float, optional): Tolerated relative slowdown. Defaults to 0.1.
+        alpha (float, optional): Significance level of slowdowns. Defaults to 0.05.
+
+    Returns:
+        int: 1 if a scenario regressed, 0 otherwise.
+    """
+    import json
+    import time
+
+    from bempy.bench import (HISTORY_FILE, LibraryShape, compare_results, find_baseline, format_comparison,
+                             format_table, load_history, min_p_value, run_benchmarks, save_history)
+
+    history = history or HISTORY_FILE
+    if (compare or baseline) and min_p_value(repeat, repeat) > alpha:
+        needed = repeat + 1
+        while min_p_value(needed, needed) > alpha:
+            needed += 1
+        print(f"Warning: {repeat} samples can not reach alpha={alpha}, no slowdown will be significant; "
+              f"use --repeat {needed} or more", file=sys.stderr)
+
+    results = run_benchmarks(LibraryShape(**shape), instances, repeat)
+
+    if output:
+        with open(output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if output_format == 'json':
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results))
+
+    status = 0
+    if compare or baseline:
+        # Keep JSON output parseable, the comparison goes to stderr then
+        stream = sys.stderr if output_format == 'json' else sys.stdout
+        if baseline:
+            with open(baseline) as file:
+                previous = json.load(file)
+        else:
+            previous = find_baseline(load_history(history), results)
+
+        if previous is None:
+            print(f"No comparable results in {history}, nothing to compare", file=stream)
+        else:
+            comparisons = compare_results(previous, results, threshold, alpha)
+            regressions = [item.scenario for item in comparisons if item.regression]
+            taken = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(previous.get('timestamp', 0)))
+            print(f"\nCompared with results of {taken}:", file=stream)
+            print(format_comparison(comparisons), file=stream)
+            if regressions:
+                print(f"Regressions over {threshold:.0%}: {', '.join(regressions)}", file=stream)
+                status = 1
+
+    if save:
+        save_history(results, history)
+
+    return status
+
+
+def bench_parallel(instances: int = 20000, workers: Optional[int] = None, work: int = 2000,
+                   repeat: int = 3, output_format: str = 'table') -> None:
+    """
+    Reports the speedup of creating a CPU-bound block in worker processes.
+
+    Args:
+        instances (int, optional): Blocks created per sample. Defaults to 20000.
+        workers (Optional[int], optional): Worker processes. Defaults to the CPU count.
+        work (int, optional): Iterations of arithmetic in every init. Defaults to 2000.
+        repeat (int, optional): Samples of each mode. Defaults to 3.
+        output_format (str, optional): 'table' or 'json'. Defaults to 'table'.
+    """
+    import json
+
+    from bempy.bench import format_speedup, run_parallel_benchmark
+
+    results = run_parallel_benchmark(instances, workers, work, repeat)
+    if output_format == 'json':
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_speedup(results))
+
+
+def compile_blocks(output: str, specs: List[str], path: str = './blocks') -> None:
+    """
+    Writes a module with precompiled block variants.
+
+    Args:
+        output (str): The module file to write, e.g. 'compiled_blocks.py'.
+        specs (List[str]): Variants like 'game.Character:race=elf,gender=female'.
+            Every variant of every block in `path` is compiled when empty.
+        path (str, optional): The path to the blocks directory. Defaults to './blocks'.
+    """
+    from bempy.compiler import parse_variant, scope_variants, write_module
+
+    # Blocks are imported from ./blocks
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    variants = [parse_variant(spec) for spec in specs] or scope_variants(bem_scope(path))
+    count = write_module(output, variants)
+    print(f"Compiled {count} variants to {output}")
+
+
+def pack_blocks(output: str, path: str = './blocks', sources: bool = True) -> None:
+    """
+    Packs a block library into an archive loadable through BEM_LIBRARIES.
+
+    Args:
+        output (str): The archive to write, e.g. 'blocks.zip'.
+        path (str, optional): The path to the blocks directory. Defaults to './blocks'.
+        sources (bool, optional): Also store sources. Defaults to True.
+    """
+    from bempy.utils.archive import pack_library
+
+    count = pack_library(path, output, sources)
+    print(f"Packed {count} modules to {output}")
+    print(f"Load it with BEM_LIBRARIES={output}")
+
+
 def main() -> None:
     """
     Main entry point for the BEMPy CLI.
@@ -148,7 +368,68 @@ def main() -> None:
     # List blocks command
     list_blocks_parser = subparsers.add_parser('list', help='List all available BEM blocks')
     list_blocks_parser.add_argument('--path', default='./blocks', help='Path to the blocks directory')
+    list_blocks_parser.add_argument('--index', nargs='?', const=True, default=None,
+                                    help='Cache the scan in a manifest file (default: <path>/.bempy-index)')
+    list_blocks_parser.add_argument('--no-validate', dest='validate', action='store_false',
+                                    help='Trust the manifest without checking directory mtimes')
+    list_blocks_parser.add_argument('--workers', type=int, default=None,
+                                    help='Scan scopes concurrently with this many threads')
     
+    # Profile command
+    profile_parser = subparsers.add_parser('profile', help='Show time spent in each build phase of a block')
+    profile_parser.add_argument('name', help='Name of the block (e.g., game/Character)')
+    profile_parser.add_argument('--mod', action='append', default=[], metavar='KEY=VALUE',
+                                help='Modifier to build the block with, may be repeated')
+    profile_parser.add_argument('--arg', action='append', default=[], metavar='KEY=VALUE',
+                                help='Argument passed to each instance, may be repeated')
+    profile_parser.add_argument('--count', type=int, default=1, help='Number of instances to create')
+
+    # Benchmark command
+    bench_parser = subparsers.add_parser('bench', help='Benchmark bempy on a synthetic block library')
+    bench_parser.add_argument('--scopes', type=int, default=3, help='Number of scopes')
+    bench_parser.add_argument('--blocks', type=int, default=10, help='Blocks in every scope')
+    bench_parser.add_argument('--types', type=int, default=3, help='Modifier types of every block')
+    bench_parser.add_argument('--values', type=int, default=4, help='Values of every modifier type')
+    bench_parser.add_argument('--depth', type=int, default=1, help='Length of inherited block chains')
+    bench_parser.add_argument('--instances', type=int, default=10000, help='Instances created per sample')
+    bench_parser.add_argument('--repeat', type=int, default=5, help='Samples per scenario')
+    bench_parser.add_argument('--format', dest='output_format', choices=('table', 'json'), default='table',
+                              help='Print results as a table or as JSON')
+    bench_parser.add_argument('--output', default=None, help='Also write JSON results to this file')
+    bench_parser.add_argument('--save', action='store_true', help='Append the results to the history file')
+    bench_parser.add_argument('--compare', action='store_true',
+                              help='Compare with the latest history entry of the same interpreter and shape')
+    bench_parser.add_argument('--history', default=None, help='History file (default: ./.bempy-bench.jsonl)')
+    bench_parser.add_argument('--baseline', default=None, help='Compare with this JSON results file instead')
+    bench_parser.add_argument('--threshold', type=float, default=0.1,
+                              help='Relative slowdown that fails the comparison (default: 0.1)')
+    bench_parser.add_argument('--alpha', type=float, default=0.05,
+                              help='Significance level of slowdowns (default: 0.05)')
+
+    # Parallel benchmark command
+    parallel_parser = subparsers.add_parser('bench-parallel',
+                                            help='Compare serial and process pool creation of a CPU-bound block')
+    parallel_parser.add_argument('--instances', type=int, default=20000, help='Blocks created per sample')
+    parallel_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parallel_parser.add_argument('--work', type=int, default=2000, help='Iterations of arithmetic in every init')
+    parallel_parser.add_argument('--repeat', type=int, default=3, help='Samples of each mode')
+    parallel_parser.add_argument('--format', dest='output_format', choices=('table', 'json'), default='table',
+                                 help='Print results as a table or as JSON')
+
+    # Compile command
+    compile_parser = subparsers.add_parser('compile', help='Write a module with precompiled block variants')
+    compile_parser.add_argument('output', help='Module file to write (e.g., compiled_blocks.py)')
+    compile_parser.add_argument('--variant', action='append', default=[], metavar='BLOCK[:MOD=VALUE,...]',
+                                help='Variant to compile, may be repeated (default: every variant in --path)')
+    compile_parser.add_argument('--path', default='./blocks', help='Path to the blocks directory')
+
+    # Pack command
+    pack_parser = subparsers.add_parser('pack', help='Pack blocks into an archive with bytecode and scope index')
+    pack_parser.add_argument('output', help='Archive to write (e.g., blocks.zip)')
+    pack_parser.add_argument('--path', default='./blocks', help='Path to the blocks directory')
+    pack_parser.add_argument('--no-sources', dest='sources', action='store_false',
+                             help='Store bytecode only, without sources for tracebacks')
+
     args = parser.parse_args()
     
     if args.command == 'create-block':
@@ -156,7 +437,31 @@ def main() -> None:
     elif args.command == 'create-modifier':
         create_modifier(args.block, args.type, args.value, args.path)
     elif args.command == 'list':
-        list_blocks(args.path)
+        list_blocks(args.path, args.index, args.validate, args.workers)
+    elif args.command == 'profile':
+        try:
+            mods, kwargs = parse_pairs(args.mod), parse_pairs(args.arg)
+        except argparse.ArgumentTypeError as error:
+            parser.error(str(error))
+
+        profile_block(args.name, mods, args.count, kwargs)
+    elif args.command == 'bench':
+        shape = {'scopes': args.scopes, 'blocks': args.blocks, 'types': args.types,
+                 'values': args.values, 'depth': args.depth}
+        sys.exit(bench(shape, args.instances, args.repeat, args.output_format, args.output, args.save,
+                       args.compare, args.history, args.baseline, args.threshold, args.alpha))
+    elif args.command == 'bench-parallel':
+        bench_parallel(args.instances, args.workers, args.work, args.repeat, args.output_format)
+    elif args.command == 'compile':
+        try:
+            compile_blocks(args.output, args.variant, args.path)
+        except ValueError as error:
+            parser.error(str(error))
+    elif args.command == 'pack':
+        if not os.path.isdir(args.path):
+            parser.error(f"Blocks directory '{args.path}' does not exist")
+
+        pack_blocks(args.output, args.path, args.sources)
     else:
         parser.print_help()
 
@@ -0,0 +1,270 @@
+import re
+from ast import literal_eval
+from os import path
+from inspect import getmro
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+from .base import Block as BaseBlock, dispatch_plan
+from .builder import Build, block_requests, cache_key, precompiled
+from .utils import uniq_f7
+from .utils.structer import block_class_cache, get_block_class
+
+# A block configuration: block name and the modifiers it is built with
+Variant = Tuple[str, Dict[str, Any]]
+
+HEADER = '''"""
+Precompiled bempy blocks, generated by `bempy compile`. Do not edit.
+
+Importing this module registers the composed classes with the builder, so
+`Build(name, **mods).block` returns them without resolving, importing or
+composing blocks. Compile again after changing the blocks.
+"""
+'''
+
+
+def parse_variant(spec: str) -> Variant:
+    """
+    Parses a variant written as 'scope.Block:mod=value,mod=value'.
+
+    Several values of one modifier are joined with '+', e.g.
+    'backend.Server:extensions=cache+queue'.
+
+    Args:
+        spec (str): The variant specification.
+
+    Returns:
+        Variant: The block name and its modifiers.
+
+    Raises:
+        ValueError: If a modifier is not written as mod=value.
+    """
+    name, _, mods = spec.partition(':')
+    kwargs: Dict[str, Any] = {}
+    for pair in filter(None, mods.split(',')):
+        mod, separator, value = pair.partition('=')
+        if not separator or not mod:
+            raise ValueError("Expected mod=value in variant '%s', got '%s'" % (spec, pair))
+
+        values = value.split('+')
+        kwargs[mod] = values if len(values) > 1 else value
+
+    return name.replace('/', '.'), kwargs
+
+
+def scope_variants(blocks: Dict[str, Dict[str, Dict[str, List[str]]]]) -> List[Variant]:
+    """
+    Returns every variant of the blocks found by `bem_scope`.
+
+    Each modifier of a block is either unset or set to one of its values, so
+    a block with modifiers of 2 and 3 values has (2 + 1) * (3 + 1) variants.
+
+    Args:
+        blocks (Dict[str, Dict[str, Dict[str, List[str]]]]): Result of `bem_scope`.
+
+    Returns:
+        List[Variant]: Variants in scope, block and modifier order.
+    """
+    variants = []
+    for scope, scope_blocks in blocks.items():
+        for block, mods in scope_blocks.items():
+            axes = [[None] + sorted(values) for values in mods.values()]
+            for values in product(*axes):
+                kwargs = {mod: value for mod, value in zip(mods, values) if value is not None}
+                variants.append((scope + '.' + block, kwargs))
+
+    return variants
+
+
+def register(cls: Type, request: Dict[str, Any], models: Tuple[Type, ...], base: Type,
+             base_file: str, slots: bool = False) -> Type:
+    """
+    Completes a precompiled block class and registers it with the builder.
+
+    Called by modules written with `compile_variants`. The class gets the
+    same name, module and computed attributes as a class composed by
+    `Build.block`, and is stored in `precompiled` under the request key.
+
+    Args:
+        cls (Type): The class defined by the compiled module.
+        request (Dict[str, Any]): Modifiers the variant was requested with.
+        models (Tuple[Type, ...]): Models in initialization order.
+        base (Type): The `Base` class of the block.
+        base_file (str): The file defining `base`.
+        slots (bool, optional): Whether the class was compiled with the slotted layout.
+
+    Returns:
+        Type: The registered class.
+    """
+    cls.__name__ = cls.__qualname__ = cls.name
+    cls.__module__ = Build.__module__
+    cls.classes = list(getmro(cls))
+    cls.models = models
+    cls.init_plan = dispatch_plan(models)
+
+    names = uniq_f7([cls.name] + [model.name for model in models
+                                  if isinstance(model.__dict__.get('name'), str)])
+    precompiled.set(cache_key('request', cls.name, request, slots), cls, names=names, files=cls.files)
+    block_requests[cls] = (cls.name, request)
+
+    # Later builds of the same block skip resolving its base class
+    if block_class_cache.get(cls.name) is None:
+        block_class_cache.set(cls.name, (Path(base_file), base), names=(cls.name,), files=(base_file,))
+
+    return cls
+
+
+def class_identifier(name: str, kwargs: Dict[str, Any], used: Dict[str, int]) -> str:
+    """
+    Returns a unique Python identifier for a variant class.
+    """
+    parts = [name.replace('.', '_')]
+    for mod, value in kwargs.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        parts.append('%s_%s' % (mod, '_'.join(str(item) for item in values)))
+
+    identifier = re.sub(r'\W', '_', '__'.join(parts))
+    count = used.get(identifier, 0)
+    used[identifier] = count + 1
+
+    return identifier if not count else '%s_%d' % (identifier, count)
+
+
+def literal(value: Any, what: str) -> str:
+    """
+    Returns the source of a value, which must survive `ast.literal_eval`.
+
+    Raises:
+        ValueError: If the value can't be written as a literal.
+    """
+    source = repr(value)
+    try:
+        if literal_eval(source) == value:
+            return source
+    except (ValueError, SyntaxError):
+        pass
+
+    raise ValueError("Can't compile %s %s, it is not a literal" % (what, source))
+
+
+def model_path(model: Type) -> Tuple[str, str]:
+    """
+    Returns the module and name a model class is imported from.
+
+    Raises:
+        ValueError: If the model is not defined at the top level of a module.
+    """
+    if '.' in model.__qualname__ or '<' in model.__qualname__:
+        raise ValueError("Can't compile model %s.%s, it is not importable"
+                         % (model.__module__, model.__qualname__))
+
+    return model.__module__, model.__qualname__
+
+
+def source_files(files: Iterable[str]) -> List[str]:
+    """
+    Returns the absolute paths of block source files, without the pseudo entries of `Block.files`.
+
+    Compiled modules are imported from any working directory, so relative
+    paths would tag precompiled classes with files the watcher never changes.
+    """
+    return [path.abspath(file) for file in files if file not in BaseBlock.files]
+
+
+def compile_variants(variants: Iterable[Variant]) -> str:
+    """
+    Returns the source of a module defining the composed classes of variants.
+
+    Every variant is built once with `Build`, then written as a plain class
+    statement over the models it was composed of, with `mods`, `props` and
+    absolute `files` as literals. The slotted layout is used when `Build.slots` is set.
+
+    Args:
+        variants (Iterable[Variant]): Block names and modifiers to compile.
+
+    Returns:
+        str: Python source of the module.
+
+    Raises:
+        ValueError: If a block does not exist, or a model or value can't be written to a module.
+
+    Example:
+        >>> source = compile_variants([('game.Character', {'race': 'elf'})])
+        >>> Path('compiled_blocks.py').write_text(source)
+    """
+    imports: Dict[Tuple[str, str], str] = {}
+    classes: List[str] = []
+    used: Dict[str, int] = {}
+    slots = Build.slots
+
+    for name, kwargs in variants:
+        Block = Build(name, **kwargs).block
+        base_file, base = get_block_class(name)
+        if base is None:
+            raise ValueError("Can't compile block '%s', it does not exist" % name)
+
+        for model in reversed(Block.models + (base,)):
+            imports.setdefault(model_path(model), '_%d' % len(imports))
+
+        aliases = [imports[model_path(model)] for model in reversed(Block.models)]
+
+        bases = ', '.join(aliases)
+        models = ', '.join(reversed(aliases))
+        identifier = class_identifier(name, kwargs, used)
+        slotted = '__slots__' in Block.__dict__
+
+        lines = ['', '', '']
+        if slotted:
+            lines.append('class %s(*slotted_bases((%s,))):' % (identifier, bases))
+            lines.append('    __slots__ = %s' % literal(tuple(Block.__slots__), 'slots'))
+        else:
+            lines.append('class %s(%s):' % (identifier, bases))
+
+        lines += [
+            '    name = %r' % name,
+            '    mods = %s' % literal(Block.mods, 'mods of ' + name),
+            '    props = %s' % literal(Block.props, 'props of ' + name),
+            '    files = %s' % literal(source_files(Block.files), 'files of ' + name),
+            '',
+            '',
+            'register(%s, %s, (%s,), %s, %r, %r)' % (
+                identifier, literal(kwargs, 'modifiers of ' + name), models,
+                imports[model_path(base)], path.abspath(base_file), slots),
+        ]
+        classes.append('\n'.join(lines))
+
+    source = [HEADER, 'from bempy.compiler import register']
+    if slots:
+        source.append('from bempy.utils.slots import slotted_bases')
+
+    # Modifier values like 'non-binary' are valid file names, but not identifiers
+    if not all(part.isidentifier() for module, _ in imports for part in module.split('.')):
+        source.insert(1, 'from importlib import import_module')
+
+    for (module, qualname), alias in imports.items():
+        if all(part.isidentifier() for part in module.split('.')):
+            source.append('from %s import %s as %s' % (module, qualname, alias))
+        else:
+            source.append('%s = import_module(%r).%s' % (alias, module, qualname))
+
+    return '\n'.join(source) + ''.join(classes) + '\n'
+
+
+def write_module(path: str, variants: Iterable[Variant]) -> int:
+    """
+    Compiles variants into a module file.
+
+    Args:
+        path (str): The module file to write, e.g. 'compiled_blocks.py'.
+        variants (Iterable[Variant]): Block names and modifiers to compile.
+
+    Returns:
+        int: Number of compiled variants.
+    """
+    variants = list(variants)
+    source = compile_variants(variants)
+    with open(path, 'w') as file:
+        file.write(source)
+
+    return len(variants)
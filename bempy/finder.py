@@ -0,0 +1,156 @@
+import sys
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from os import listdir, path
+from types import ModuleType
+from typing import Any, Callable, List, Optional, Sequence
+
+from .builder import Build
+from .utils.archive import is_archive
+from .utils.structer import library_index
+
+
+def block_builder(name: str) -> Callable[..., type]:
+    """
+    Returns a function that builds the named block with the given modifiers.
+
+    The function has an `ablock` coroutine function attribute that builds
+    through `Build.ablock` without blocking the event loop.
+
+    Args:
+        name (str): The name of the block, e.g. 'game.Character'.
+
+    Returns:
+        Callable[..., type]: A function accepting modifiers and returning a block class.
+    """
+    def build(*args, **kwargs):
+        return Build(name, *args, **kwargs).block
+
+    async def ablock(*args, **kwargs):
+        return await Build.ablock(name, *args, **kwargs)
+
+    build.__name__ = build.__qualname__ = name.split('.')[-1]
+    build.block_name = name
+    build.ablock = ablock
+
+    return build
+
+
+def has_directory(root: str, directory: str) -> bool:
+    """
+    Returns whether a library root, a directory or an archive, contains a directory.
+    """
+    if is_archive(root):
+        return library_index(root).entries(directory) is not None
+
+    return path.isdir(path.join(root, directory))
+
+
+def has_block(root: str, block_dir: str) -> bool:
+    """
+    Returns whether a library root, a directory or an archive, contains a block.
+    """
+    if is_archive(root):
+        return library_index(root).block(block_dir) is not None
+
+    return path.isfile(path.join(root, block_dir, '__init__.py'))
+
+
+def list_names(root: str, directory: str) -> List[str]:
+    """
+    Returns names in a directory of a library root, empty if it is missing.
+    """
+    if is_archive(root):
+        return [name for name, is_dir in library_index(root).entries(directory) or []]
+
+    return listdir(path.join(root, directory)) if path.isdir(path.join(root, directory)) else []
+
+
+class ScopeModule(ModuleType):
+    """
+    A module for a block scope that resolves blocks on first access.
+
+    `from bempy.game import Character` only checks that the `game/Character`
+    block exists in one of the roots, without scanning the rest of the scope.
+    """
+
+    def __init__(self, name: str, scope: str, roots: Sequence[str]):
+        super().__init__(name)
+        self.__path__: List[str] = []
+        self.scope = scope
+        self.roots = roots
+
+    def __getattr__(self, block: str) -> Any:
+        if not block[:1].isupper():
+            raise AttributeError(block)
+
+        block_dir = path.join(self.scope.replace('.', '/'), block)
+        for root in self.roots:
+            if has_block(root, block_dir):
+                build = block_builder(self.scope + '.' + block)
+                setattr(self, block, build)
+
+                return build
+
+        raise AttributeError("module '%s' has no block '%s'" % (self.__name__, block))
+
+    def __dir__(self) -> List[str]:
+        names = set(super().__dir__())
+        scope_dir = self.scope.replace('.', '/')
+        for root in self.roots:
+            names.update(name for name in list_names(root, scope_dir) if name[:1].isupper())
+
+        return sorted(names)
+
+
+class ScopeFinder(MetaPathFinder, Loader):
+    """
+    Import hook that exposes block scopes as submodules of a package.
+
+    The finder is appended to `sys.meta_path`, so real submodules always win.
+    A scope module is created only when `package.scope` is imported and the
+    scope directory exists in one of the roots. `bempy` passes the roots of
+    `library_registry`, which follow its changes.
+
+    Attributes:
+        package (str): The package blocks are imported from, e.g. 'bempy'.
+        roots (List[str]): Directories or library archives that contain block scopes.
+    """
+
+    def __init__(self, package: str, roots: List[str]):
+        self.package = package
+        self.roots = roots
+
+    def find_spec(self, fullname: str, target_path: Optional[Sequence[str]] = None,
+                  target: Optional[ModuleType] = None) -> Optional[ModuleSpec]:
+        prefix = self.package + '.'
+        if not fullname.startswith(prefix):
+            return None
+
+        scope = fullname[len(prefix):]
+        if not all(name[:1].islower() for name in scope.split('.')):
+            return None
+
+        scope_dir = scope.replace('.', '/')
+        if not any(has_directory(root, scope_dir) for root in self.roots):
+            return None
+
+        return ModuleSpec(fullname, self, is_package=True)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType:
+        return ScopeModule(spec.name, spec.name[len(self.package) + 1:], self.roots)
+
+    def exec_module(self, module: ModuleType) -> None:
+        pass
+
+    def install(self) -> 'ScopeFinder':
+        """
+        Appends the finder to `sys.meta_path` once.
+
+        Returns:
+            ScopeFinder: The finder itself.
+        """
+        if self not in sys.meta_path:
+            sys.meta_path.append(self)
+
+        return self
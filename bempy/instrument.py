@@ -0,0 +1,208 @@
+import logging
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+# Build phases reported to sinks
+PHASES = ('block_class', 'mod_classes', 'mods_predefined', 'inherited', 'type', 'init')
+
+
+class Event(NamedTuple):
+    """
+    A timed build phase.
+
+    Attributes:
+        phase (str): One of PHASES.
+        name (str): The block name, or the model for 'init'.
+        seconds (float): Time spent in the phase.
+    """
+    phase: str
+    name: str
+    seconds: float
+
+
+# Active sinks, instrumentation is disabled while the list is empty
+sinks: List[Callable[[Event], Any]] = []
+
+
+def add_sink(sink: Callable[[Event], Any]) -> Callable[[Event], Any]:
+    """
+    Starts sending build events to a sink.
+
+    Any callable accepting an `Event` is a sink. Model init calls are timed
+    while any sink is active.
+
+    Args:
+        sink (Callable[[Event], Any]): The sink.
+
+    Returns:
+        Callable[[Event], Any]: The sink itself.
+    """
+    sinks.append(sink)
+
+    return sink
+
+
+def remove_sink(sink: Callable[[Event], Any]) -> None:
+    """
+    Stops sending build events to a sink.
+
+    Args:
+        sink (Callable[[Event], Any]): A sink added with `add_sink`.
+    """
+    if sink in sinks:
+        sinks.remove(sink)
+
+
+@contextmanager
+def instrument(*added: Callable[[Event], Any]) -> Iterator[None]:
+    """
+    Sends build events to the given sinks inside the context.
+
+    Example:
+        >>> histogram = Histogram()
+        >>> with instrument(histogram):
+        ...     Build('game.Character', race='elf').block(level=1)
+        >>> histogram.summary()['mod_classes']['total']
+    """
+    for sink in added:
+        add_sink(sink)
+
+    try:
+        yield
+    finally:
+        for sink in added:
+            remove_sink(sink)
+
+
+def emit(phase: str, name: str, seconds: float) -> None:
+    """
+    Sends an event to every sink.
+
+    Args:
+        phase (str): One of PHASES.
+        name (str): The block or model name.
+        seconds (float): Time spent in the phase.
+    """
+    event = Event(phase, name, seconds)
+    for sink in list(sinks):
+        sink(event)
+
+
+def measure(phase: str, name: str, function: Callable, *args, **kwargs) -> Any:
+    """
+    Calls a function, timing it as a build phase when instrumentation is enabled.
+
+    Args:
+        phase (str): One of PHASES.
+        name (str): The block name.
+        function (Callable): The function to call.
+
+    Returns:
+        Any: The result of the function.
+    """
+    if not sinks:
+        return function(*args, **kwargs)
+
+    start = perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        emit(phase, name, perf_counter() - start)
+
+
+def timed_init(init: Callable, name: str) -> Callable:
+    """
+    Returns a model init that reports its duration as an 'init' event.
+
+    Args:
+        init (Callable): The model init method, sync or async.
+        name (str): The model name reported in events.
+
+    Returns:
+        Callable: The wrapped init with the same signature.
+    """
+    if iscoroutinefunction(init):
+        @wraps(init)
+        async def timed(block, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return await init(block, *args, **kwargs)
+            finally:
+                emit('init', name, perf_counter() - start)
+    else:
+        @wraps(init)
+        def timed(block, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return init(block, *args, **kwargs)
+            finally:
+                emit('init', name, perf_counter() - start)
+
+    return timed
+
+
+class Histogram:
+    """
+    A sink that keeps event durations in memory by phase.
+
+    Attributes:
+        samples (Dict[str, List[float]]): Durations in seconds by phase.
+        names (Dict[str, Dict[str, float]]): Total seconds by phase and name.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.names: Dict[str, Dict[str, float]] = {}
+
+    def __call__(self, event: Event) -> None:
+        self.samples.setdefault(event.phase, []).append(event.seconds)
+        names = self.names.setdefault(event.phase, {})
+        names[event.name] = names.get(event.name, 0.0) + event.seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns statistics of every recorded phase.
+
+        Returns:
+            Dict[str, Dict[str, float]]: count, total, mean, p50, p95 and max seconds by phase.
+        """
+        summary = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            summary[phase] = {
+                'count': len(ordered),
+                'total': sum(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': ordered[len(ordered) // 2],
+                'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                'max': ordered[-1],
+            }
+
+        return summary
+
+    def clear(self) -> None:
+        """
+        Forgets all recorded events.
+        """
+        self.samples.clear()
+        self.names.clear()
+
+
+class LogSink:
+    """
+    A sink that writes every event to a logger.
+
+    Attributes:
+        logger (logging.Logger): The logger, 'bempy.instrument' by default.
+        level (int): The log level of events.
+    """
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger('bempy.instrument')
+        self.level = level
+
+    def __call__(self, event: Event) -> None:
+        self.logger.log(self.level, '%s %s %.3f ms', event.phase, event.name, event.seconds * 1000)
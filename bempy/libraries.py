@@ -0,0 +1,5 @@
+# Parent package of directory and archive block libraries, e.g. bempy.libraries.blocks_5d41402a.
+# Every library package is created by bempy.utils.structer.library_namespace.
+from typing import List
+
+__path__: List[str] = []
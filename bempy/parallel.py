@@ -0,0 +1,236 @@
+import os
+import pickle
+from math import ceil
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union, TYPE_CHECKING
+
+from .base import Block
+from .pickling import block_state
+from .session import session
+
+# multiprocessing and concurrent.futures are imported by BlockPool, they are slow to import
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.context import BaseContext
+
+Rows = Union[Sequence[Dict[str, Any]], Dict[str, Sequence[Any]]]
+
+
+# Block classes a worker was started with, kept for the lifetime of the process
+warm_classes: Tuple[Type, ...] = ()
+
+
+def warm_worker(classes: Sequence[Type]) -> None:
+    """
+    Initializes a worker process of a `BlockPool`.
+
+    The classes were rebuilt by name and modifiers while being unpickled, so
+    the first chunk a worker gets only runs model inits. They are kept alive,
+    so later chunks find them in the builder cache.
+
+    Args:
+        classes (Sequence[Type]): Block classes the pool is created for.
+    """
+    global warm_classes
+    warm_classes = tuple(classes)
+
+
+def ping() -> int:
+    """
+    Returns the worker process id, submitted to start workers ahead of use.
+    """
+    return os.getpid()
+
+
+def block_tree(scope: Any, owner: Any) -> Iterable[Tuple[Any, Any]]:
+    """
+    Yields (block, owner) pairs of every block created under an owner, owners first.
+    """
+    for child in scope.children(owner):
+        yield child, owner
+        yield from block_tree(scope, child)
+
+
+def create_chunk(cls: Type, rows: List[Dict[str, Any]], states: bool) -> bytes:
+    """
+    Creates blocks in a worker process and pickles them for the parent.
+
+    Blocks are created in a session, so workers keep nothing between chunks.
+    The result is pickled here rather than by the executor, so the parent
+    decides which scope the restored blocks are tracked in.
+
+    Args:
+        cls (Type): The block class.
+        rows (List[Dict[str, Any]]): Keyword arguments of each block.
+        states (bool): Return attribute dicts instead of blocks.
+
+    Returns:
+        bytes: Pickled blocks and the owners of nested blocks, or attribute dicts.
+    """
+    with session() as scope:
+        blocks = cls.bulk(rows)
+        if states:
+            payload: Any = [block_state(block) for block in blocks]
+        else:
+            payload = (blocks, [pair for block in blocks for pair in block_tree(scope, block)])
+
+        return pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+
+
+class BlockPool:
+    """
+    Worker processes that create blocks in parallel.
+
+    Model inits run under the GIL, so creating many CPU-heavy blocks in threads
+    uses a single core. The pool spreads `bulk` creation over processes that
+    rebuilt the given classes when they started. Blocks return to the parent
+    pickled, with their attributes restored without running inits again.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        classes (Tuple[Type, ...]): Block classes workers are warmed with.
+        executor (ProcessPoolExecutor): The process pool.
+
+    Example:
+        >>> Character = Build('game.Character', race='elf').block
+        >>> with BlockPool(classes=[Character]) as pool:
+        ...     elves = pool.create(Character, {'level': range(10000)})
+    """
+
+    def __init__(self, workers: Optional[int] = None, classes: Sequence[Type] = (),
+                 mp_context: Optional['BaseContext'] = None):
+        """
+        Starts the worker processes.
+
+        Args:
+            workers (Optional[int], optional): Number of processes. Defaults to the CPU count.
+            classes (Sequence[Type], optional): Block classes to build in every worker up front.
+            mp_context (Optional[BaseContext], optional): Multiprocessing context, e.g.
+                `multiprocessing.get_context('spawn')`. Defaults to the platform default.
+        """
+        from concurrent.futures import ProcessPoolExecutor, wait
+
+        self.workers = workers or os.cpu_count() or 1
+        self.classes = tuple(classes)
+        self.executor: 'ProcessPoolExecutor' = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=mp_context,
+            initializer=warm_worker, initargs=(self.classes,))
+
+        # Start every worker now rather than on the first chunks
+        wait([self.executor.submit(ping) for _ in range(self.workers)])
+
+    def create(self, cls: Type, rows: Rows, chunksize: Optional[int] = None,
+               register: bool = True) -> List[Block]:
+        """
+        Creates blocks of a class in the worker processes.
+
+        Rows are split into chunks created with `bulk` by the workers. The
+        blocks come back in row order. Registered blocks are tracked like
+        blocks created by `bulk`, nested blocks keep their owners.
+
+        Args:
+            cls (Type): The block class.
+            rows (Rows): Keyword arguments for each block, or columns of equal
+                length by argument name.
+            chunksize (Optional[int], optional): Rows per task. Defaults to
+                4 tasks per worker.
+            register (bool, optional): Track the blocks in the scope. Defaults to True.
+
+        Returns:
+            List[Block]: The created blocks.
+        """
+        owned: List[Tuple[Any, Any]] = []
+        blocks: List[Block] = []
+        for chunk_blocks, chunk_owned in self.map(cls, rows, chunksize, states=False):
+            blocks += chunk_blocks
+            owned += chunk_owned
+
+        # Blocks come back as roots of the worker sessions, the parent decides
+        owner = cls.owner.get()
+        if owner is not None or not register:
+            for block in blocks:
+                try:
+                    del block.root
+                except AttributeError:
+                    pass
+
+        if register and blocks:
+            scope = cls.scope
+            scope.add_many(blocks, owner)
+            for block, block_owner in owned:
+                scope.add(block, block_owner)
+
+        return blocks
+
+    def states(self, cls: Type, rows: Rows, chunksize: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Creates blocks in the worker processes and returns only their attributes.
+
+        Cheaper to transfer than blocks when the parent only needs the
+        results of model inits. `bempy.pickling.restore_block` turns a state
+        back into a block.
+
+        Args:
+            cls (Type): The block class.
+            rows (Rows): Keyword arguments for each block, or columns by argument name.
+            chunksize (Optional[int], optional): Rows per task. Defaults to 4 tasks per worker.
+
+        Returns:
+            List[Dict[str, Any]]: Attributes of every block in row order.
+        """
+        return [state for chunk in self.map(cls, rows, chunksize, states=True) for state in chunk]
+
+    def map(self, cls: Type, rows: Rows, chunksize: Optional[int], states: bool) -> Iterable[Any]:
+        """
+        Yields the unpickled results of every chunk in row order.
+        """
+        if isinstance(rows, dict):
+            rows = [dict(zip(rows, values)) for values in zip(*rows.values())]
+        else:
+            rows = list(rows)
+
+        if not rows:
+            return
+
+        size = chunksize or max(1, ceil(len(rows) / (self.workers * 4)))
+        futures = [self.executor.submit(create_chunk, cls, rows[start:start + size], states)
+                   for start in range(0, len(rows), size)]
+
+        for future in futures:
+            # Blocks inside are registered by the caller, not in the current scope
+            with session():
+                result = pickle.loads(future.result())
+
+            yield result
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        self.executor.shutdown()
+
+    def __enter__(self) -> 'BlockPool':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def create_parallel(cls: Type, rows: Rows, workers: Optional[int] = None,
+                    chunksize: Optional[int] = None, register: bool = True) -> List[Block]:
+    """
+    Creates blocks of a class in a temporary `BlockPool`.
+
+    Starting processes takes time, keep a `BlockPool` to create blocks repeatedly.
+
+    Args:
+        cls (Type): The block class.
+        rows (Rows): Keyword arguments for each block, or columns by argument name.
+        workers (Optional[int], optional): Number of processes. Defaults to the CPU count.
+        chunksize (Optional[int], optional): Rows per task.
+        register (bool, optional): Track the blocks in the scope. Defaults to True.
+
+    Returns:
+        List[Block]: The created blocks in row order.
+    """
+    with BlockPool(workers, classes=[cls]) as pool:
+        return pool.create(cls, rows, chunksize, register)
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Tuple, Type, Union
+
+# Cached string representation, it contains the id of the original instance
+TRANSIENT = ('_Block__pretty_name',)
+
+
+def rebuild_block_class(name: str, request: Dict[str, Any]) -> Type:
+    """
+    Returns the block class built from a name and the modifiers it was requested with.
+
+    Used by pickle to load composed block classes. In the process that built
+    the class the builder cache returns the same class object, elsewhere it
+    is composed again.
+
+    Args:
+        name (str): The block name, e.g. 'backend.Server'.
+        request (Dict[str, Any]): Modifiers passed to `Build`.
+
+    Returns:
+        Type: The block class.
+    """
+    from .builder import Build
+
+    return Build(name, **request).block
+
+
+def reduce_block_class(cls: Type) -> Union[str, Tuple[Any, ...]]:
+    """
+    Pickles a block class, registered with `copyreg` for `BlockType`.
+
+    Classes composed by the builder are not importable, they are stored as
+    their block name and request. Block models defined in modules, like
+    `Base` classes, are stored by reference as usual.
+
+    Args:
+        cls (Type): A class with the `BlockType` metaclass.
+
+    Returns:
+        Union[str, Tuple[Any, ...]]: The reduce value of the class.
+    """
+    from .builder import block_requests
+
+    request = block_requests.get(cls)
+    if request is None:
+        return cls.__qualname__
+
+    return rebuild_block_class, request
+
+
+def block_state(block: Any) -> Dict[str, Any]:
+    """
+    Returns the attributes of a block stored in its instance dict and slots.
+
+    Args:
+        block (Any): The block instance.
+
+    Returns:
+        Dict[str, Any]: Attribute values by name, without transient caches.
+    """
+    state = dict(getattr(block, '__dict__', {}))
+
+    for cls in type(block).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name in ('__dict__', '__weakref__'):
+                continue
+
+            # Private slot names are mangled like private attributes
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_' + cls.__name__.lstrip('_') + name
+
+            try:
+                state[name] = getattr(block, name)
+            except AttributeError:
+                pass
+
+    for name in TRANSIENT:
+        state.pop(name, None)
+
+    return state
+
+
+def restore_block(cls: Type, state: Dict[str, Any]) -> Any:
+    """
+    Creates a block from pickled state without running model inits.
+
+    The block is tracked by the active scope, without an owner unless it
+    is restored while another block initializes. It keeps the `root` flag it
+    had when it was pickled.
+
+    Args:
+        cls (Type): The block class.
+        state (Dict[str, Any]): Attributes returned by `block_state`.
+
+    Returns:
+        Any: The restored block.
+    """
+    block = cls.__new__(cls)
+    for name, value in state.items():
+        object.__setattr__(block, name, value)
+
+    cls.scope.add(block, cls.owner.get())
+
+    return block
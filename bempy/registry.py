@@ -0,0 +1,282 @@
+from contextvars import ContextVar
+from itertools import count, groupby, repeat
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+from weakref import ref
+
+
+class BlockRegistry:
+    """
+    Tracks created block instances without keeping them alive.
+
+    Instances are held by weak references and drop out of the registry as soon
+    as they are collected. Secondary indexes by generated class, block name and
+    owner make lookups proportional to the result size rather than to the number
+    of blocks ever created.
+
+    The registry is safe to use from several threads. Collected blocks are
+    queued and removed by whichever call holds the lock next, so a garbage
+    collection triggered in the middle of an update never changes the indexes
+    under it.
+
+    Attributes:
+        refs (Dict[int, ref]): Weak references to live blocks keyed by creation number.
+        keys (Dict[int, int]): Creation number of each live block keyed by `id(block)`.
+        ids (Dict[int, int]): `id(block)` of each live block keyed by creation number.
+        meta (Dict[int, Tuple[type, Optional[str], Optional[int]]]): Class, name and owner
+            creation number of each live block, one tuple shared by a batch of `add_many`.
+        by_class (Dict[type, Dict[int, None]]): Creation numbers grouped by class.
+        by_name (Dict[str, Dict[int, None]]): Creation numbers grouped by block name.
+        by_owner (Dict[Optional[int], Dict[int, None]]): Creation numbers grouped by owner.
+        lock (Lock): Guards every index.
+        pending (List[ref]): References of collected blocks waiting for removal.
+    """
+
+    def __init__(self):
+        self.counter = count()
+        self.refs: Dict[int, ref] = {}
+        self.ref_keys: Dict[int, int] = {}
+        self.keys: Dict[int, int] = {}
+        self.ids: Dict[int, int] = {}
+        self.meta: Dict[int, Tuple[type, Optional[str], Optional[int]]] = {}
+        self.by_class: Dict[type, Dict[int, None]] = {}
+        self.by_name: Dict[str, Dict[int, None]] = {}
+        self.by_owner: Dict[Optional[int], Dict[int, None]] = {}
+        self.lock = Lock()
+        self.pending: List[ref] = []
+
+    def add(self, block: Any, owner: Any = None) -> None:
+        """
+        Registers a block instance.
+
+        Args:
+            block (Any): The block instance.
+            owner (Any, optional): The block that was active when it was created.
+        """
+        cls = block.__class__
+        name = getattr(block, 'name', None)
+        reference = ref(block, self._discard)
+
+        with self.lock:
+            key = next(self.counter)
+            owner_key = self.keys.get(id(owner)) if owner is not None else None
+
+            self.refs[key] = reference
+            self.ref_keys[id(reference)] = key
+            self.keys[id(block)] = key
+            self.ids[key] = id(block)
+            self.meta[key] = (cls, name, owner_key)
+
+            self.by_class.setdefault(cls, {})[key] = None
+            self.by_name.setdefault(name, {})[key] = None
+            self.by_owner.setdefault(owner_key, {})[key] = None
+
+            self._flush()
+
+    def add_many(self, blocks: Iterable[Any], owner: Any = None) -> None:
+        """
+        Registers several block instances created by the same owner.
+
+        Consecutive blocks of the same class are registered with bulk dictionary
+        updates instead of one call per instance.
+
+        Args:
+            blocks (Iterable[Any]): The block instances.
+            owner (Any, optional): The block that was active when they were created.
+        """
+        with self.lock:
+            owner_key = self.keys.get(id(owner)) if owner is not None else None
+
+            for cls, group in groupby(blocks, key=lambda block: block.__class__):
+                group = list(group)
+                name = getattr(cls, 'name', None)
+                start = next(self.counter)
+                self.counter = count(start + len(group))
+                # One int object per block, shared by every index
+                numbers = list(range(start, start + len(group)))
+
+                ids = list(map(id, group))
+                references = list(map(ref, group, repeat(self._discard)))
+
+                self.refs.update(zip(numbers, references))
+                self.ref_keys.update(zip(map(id, references), numbers))
+                self.keys.update(zip(ids, numbers))
+                self.ids.update(zip(numbers, ids))
+                # A tuple per block would double the allocations of the batch
+                self.meta.update(zip(numbers, repeat((cls, name, owner_key))))
+
+                self.by_class.setdefault(cls, {}).update(dict.fromkeys(numbers))
+                self.by_name.setdefault(name, {}).update(dict.fromkeys(numbers))
+                self.by_owner.setdefault(owner_key, {}).update(dict.fromkeys(numbers))
+
+            self._flush()
+
+    def _discard(self, reference: ref) -> None:
+        """
+        Queues a collected block for removal, removing it now if the registry is idle.
+        """
+        self.pending.append(reference)
+        if self.lock.acquire(blocking=False):
+            try:
+                self._flush()
+            finally:
+                self.lock.release()
+
+    def _flush(self) -> None:
+        """
+        Removes queued collected blocks from every index, the lock must be held.
+        """
+        while self.pending:
+            reference = self.pending.pop()
+            key = self.ref_keys.pop(id(reference), None)
+            if key is None or self.refs.get(key) is not reference:
+                continue
+
+            del self.refs[key]
+            block_id = self.ids.pop(key)
+            cls, name, owner_key = self.meta.pop(key)
+            if self.keys.get(block_id) == key:
+                del self.keys[block_id]
+
+            for index, index_key in ((self.by_class, cls),
+                                     (self.by_name, name),
+                                     (self.by_owner, owner_key)):
+                keys = index.get(index_key)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del index[index_key]
+
+    def _resolve(self, keys: Iterable[int]) -> List[Any]:
+        blocks = []
+        for key in keys:
+            reference = self.refs.get(key)
+            block = reference() if reference is not None else None
+            if block is not None:
+                blocks.append(block)
+
+        return blocks
+
+    def blocks(self, block_type: Optional[Type] = None) -> List[Any]:
+        """
+        Returns live blocks that are instances of the given type.
+
+        Args:
+            block_type (Optional[Type], optional): Block class to filter by. Defaults to all blocks.
+
+        Returns:
+            List[Any]: Block instances in creation order.
+        """
+        with self.lock:
+            if block_type is None:
+                keys = list(self.refs)
+            else:
+                keys = []
+                for cls, cls_keys in self.by_class.items():
+                    if issubclass(cls, block_type):
+                        keys.extend(cls_keys)
+                keys.sort()
+
+        return self._resolve(keys)
+
+    def named(self, name: str) -> List[Any]:
+        """
+        Returns live blocks with the given block name.
+
+        Args:
+            name (str): Block name, e.g. 'game.Character'.
+
+        Returns:
+            List[Any]: Block instances in creation order.
+        """
+        with self.lock:
+            keys = list(self.by_name.get(name, ()))
+
+        return self._resolve(keys)
+
+    def children(self, owner: Any = None) -> List[Any]:
+        """
+        Returns live blocks created while the given block was active.
+
+        Args:
+            owner (Any, optional): Owner block. None returns root blocks.
+
+        Returns:
+            List[Any]: Block instances in creation order.
+        """
+        with self.lock:
+            owner_key = self.keys.get(id(owner)) if owner is not None else None
+            if owner is not None and owner_key is None:
+                return []
+
+            keys = list(self.by_owner.get(owner_key, ()))
+
+        return self._resolve(keys)
+
+    def owner(self, block: Any) -> Any:
+        """
+        Returns the owner of a registered block.
+
+        Args:
+            block (Any): The block instance.
+
+        Returns:
+            Any: The owner block, or None for roots and collected owners.
+        """
+        with self.lock:
+            key = self.keys.get(id(block))
+            owner_key = self.meta[key][2] if key is not None else None
+            reference = self.refs.get(owner_key) if owner_key is not None else None
+
+        return reference() if reference is not None else None
+
+    def clear(self) -> None:
+        """
+        Forgets all registered blocks.
+        """
+        with self.lock:
+            self.refs.clear()
+            self.ref_keys.clear()
+            self.keys.clear()
+            self.ids.clear()
+            self.meta.clear()
+            self.by_class.clear()
+            self.by_name.clear()
+            self.by_owner.clear()
+            self.pending.clear()
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        with self.lock:
+            keys = list(self.refs)
+
+        for key in keys:
+            reference = self.refs.get(key)
+            block = reference() if reference is not None else None
+            if block is not None:
+                yield self.owner(block), block
+
+    def __len__(self) -> int:
+        with self.lock:
+            self._flush()
+
+            return len(self.refs)
+
+
+# Registry of blocks created outside of sessions
+global_scope = BlockRegistry()
+
+# Registry of the session active in the current thread or task
+active_scope: ContextVar = ContextVar('bempy_scope', default=global_scope)
+
+
+class ActiveScope:
+    """
+    Class attribute that resolves to the registry of the active session.
+
+    `Block.scope` and `self.scope` return the registry of the innermost
+    `session()` of the current thread or asyncio task, or `global_scope`
+    outside of sessions.
+    """
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> BlockRegistry:
+        return active_scope.get()
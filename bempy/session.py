@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from .base import Block
+from .registry import BlockRegistry, active_scope
+
+
+@contextmanager
+def session() -> Iterator[BlockRegistry]:
+    """
+    Gives blocks created inside the context their own scope.
+
+    `Block.scope`, `get_created_blocks` and owner links see only the
+    session's blocks, and blocks created without an owner are its roots.
+    The session registry holds blocks weakly like the global scope, so a
+    per-request block tree is reclaimed as soon as the caller drops it and
+    never grows the global scope. At exit the registry is emptied.
+
+    Sessions follow the current thread or asyncio task and can be nested.
+    Blocks created inside the session keep no owner from outside of it.
+
+    Yields:
+        BlockRegistry: The registry of the session.
+
+    Example:
+        >>> with session() as scope:
+        ...     server = Server(backend='flask')(host='localhost')
+        ...     assert scope.children() == [server]
+    """
+    scope = BlockRegistry()
+    scope_token = active_scope.set(scope)
+    owner_token = Block.owner.set(None)
+
+    try:
+        yield scope
+    finally:
+        Block.owner.reset(owner_token)
+        active_scope.reset(scope_token)
+        scope.clear()
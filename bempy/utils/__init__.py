@@ -1,5 +1,5 @@
 import json
-from typing import Dict, List, Any, TypeVar, Callable
+from typing import Dict, List, Any, TypeVar, Callable, Hashable
 
 T = TypeVar('T')
 
@@ -71,3 +71,41 @@ def safe_serialize(obj: Any) -> str:
     """
     default: Callable[[Any], str] = lambda o: str(o)
     return json.dumps(obj, default=default)
+
+
+def freeze(obj: Any) -> Hashable:
+    """
+    Returns a hashable representation of nested dictionaries, lists and sets.
+
+    Containers are tagged with their type so that, for example, a dictionary and
+    a list of pairs never produce the same key. Dictionary items are sorted by
+    the type name and repr of their keys, so the key does not depend on insertion
+    order and mixed key types can be compared. Unhashable leaves raise TypeError.
+
+    Args:
+        obj (Any): The object to freeze.
+
+    Returns:
+        Hashable: A hashable value usable as a cache key.
+
+    Example:
+        >>> freeze({'size': ['small'], 'color': 'red'}) == freeze({'color': 'red', 'size': ['small']})
+        True
+    """
+    if isinstance(obj, str):
+        return obj
+
+    if isinstance(obj, dict):
+        items = sorted(obj.items(), key=lambda item: (type(item[0]).__name__, repr(item[0])))
+
+        return (dict, tuple((key, freeze(value)) for key, value in items))
+
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(freeze(value) for value in obj))
+
+    if isinstance(obj, (set, frozenset)):
+        return (frozenset, frozenset(freeze(value) for value in obj))
+
+    hash(obj)
+
+    return (type(obj), obj)
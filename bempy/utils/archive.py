@@ -0,0 +1,135 @@
+import json
+import os
+import py_compile
+import tempfile
+import zipfile
+from os import path
+from typing import Dict, List, Tuple
+
+from .scanner import INDEX_FILE, EntryType, ScopeIndex, list_directory
+
+# File name suffix of packed libraries
+ARCHIVE_SUFFIX = '.zip'
+
+
+def is_archive(lib: str) -> bool:
+    """
+    Returns whether a library root is a packed archive.
+
+    Args:
+        lib (str): The library root, a directory or an archive written by `pack_library`.
+
+    Returns:
+        bool: True for archives.
+    """
+    return lib.endswith(ARCHIVE_SUFFIX)
+
+
+def pack_library(root: str, output: str, sources: bool = True, optimize: int = -1) -> int:
+    """
+    Packs a block library into a zip archive for `zipimport`.
+
+    The archive holds the library as a package named after the root
+    directory, with every module compiled to unchecked hash based bytecode,
+    and the listings of every directory in the ScopeIndex manifest format.
+    Libraries loaded from the archive never stat, list or compile files.
+
+    Args:
+        root (str): The library root, e.g. './blocks'.
+        output (str): The archive to write, e.g. 'blocks.zip'.
+        sources (bool, optional): Also store sources, for tracebacks and `inspect`. Defaults to True.
+        optimize (int, optional): Optimization level passed to `py_compile`. Defaults to -1.
+
+    Returns:
+        int: Number of compiled modules.
+
+    Example:
+        >>> pack_library('./blocks', 'dist/blocks.zip')
+        >>> os.environ['BEM_LIBRARIES'] = 'dist/blocks.zip'
+    """
+    root = path.normpath(root)
+    package = path.basename(path.abspath(root))
+    listings: Dict[str, Tuple[int, int, List[EntryType]]] = {}
+    count = 0
+
+    # Small files are read faster than they are inflated, keep them uncompressed
+    with tempfile.TemporaryDirectory() as temp, zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as archive:
+        for directory, directories, files in os.walk(root):
+            directories[:] = sorted(name for name in directories
+                                    if name != '__pycache__' and not name.startswith('.'))
+            relative = path.relpath(directory, root)
+            relative = '' if relative == '.' else relative
+
+            entries = [(name, is_dir) for name, is_dir in list_directory(directory) or []
+                       if name != '__pycache__' and not name.startswith('.')]
+            stat = os.stat(directory)
+            listings[relative] = (stat.st_mtime_ns, stat.st_size, entries)
+
+            # zipimport finds namespace packages by their directory entries
+            archive.writestr(path.join(package, relative, '').replace(os.sep, '/'), b'')
+
+            for name in sorted(files):
+                if not name.endswith('.py'):
+                    continue
+
+                source = path.join(directory, name)
+                member = path.join(package, relative, name).replace(os.sep, '/')
+                compiled = path.join(temp, '%d.pyc' % count)
+                py_compile.compile(source, cfile=compiled, dfile=member, doraise=True, optimize=optimize,
+                                   invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+                archive.write(compiled, member + 'c')
+                if sources:
+                    archive.write(source, member)
+                count += 1
+
+        manifest = {'version': ScopeIndex.version, 'package': package, 'directories': listings}
+        archive.writestr(INDEX_FILE, json.dumps(manifest, separators=(',', ':')))
+
+    return count
+
+
+def read_archive_index(archive: str) -> Tuple[str, Dict[str, Tuple[int, int, List[EntryType]]]]:
+    """
+    Returns the package name and directory listings stored in an archive.
+
+    Args:
+        archive (str): An archive written by `pack_library`.
+
+    Returns:
+        Tuple[str, Dict[str, Tuple[int, int, List[EntryType]]]]: The package and
+            listings by directory relative to the library root.
+
+    Raises:
+        ValueError: If the archive has no index of a supported version.
+    """
+    with zipfile.ZipFile(archive) as file:
+        try:
+            manifest = json.loads(file.read(INDEX_FILE))
+        except KeyError:
+            raise ValueError("'%s' is not a bempy library archive, it has no %s" % (archive, INDEX_FILE))
+
+    if manifest.get('version') != ScopeIndex.version:
+        raise ValueError("Library archive '%s' has unsupported index version %s"
+                         % (archive, manifest.get('version')))
+
+    listings = {directory: (mtime, size, [(name, is_dir) for name, is_dir in entries])
+                for directory, (mtime, size, entries) in manifest['directories'].items()}
+
+    return manifest['package'], listings
+
+
+def archive_scope_index(archive: str) -> ScopeIndex:
+    """
+    Returns a ScopeIndex answering from the listings of an archive.
+
+    Args:
+        archive (str): An archive written by `pack_library`.
+
+    Returns:
+        ScopeIndex: An in-memory index that never reads the filesystem.
+    """
+    index = ScopeIndex(archive, validate=False)
+    index.listings = read_archive_index(archive)[1]
+
+    return index
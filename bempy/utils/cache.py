@@ -0,0 +1,270 @@
+from collections import OrderedDict
+from os import path
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# Supported eviction policies
+POLICIES = ('lru', 'fifo')
+
+
+class BuildCache:
+    """
+    A bounded cache for the builder with statistics and selective invalidation.
+
+    Every entry can be tagged with the block names and source files it was
+    built from, so entries are dropped by block name or by changed file
+    instead of clearing the whole cache. All operations are guarded by a lock,
+    so the cache can be shared by builds running in several threads.
+
+    Attributes:
+        name (str): Cache name used in statistics.
+        maxsize (Optional[int]): Maximum number of entries. None means unbounded,
+            0 disables caching.
+        policy (str): Eviction policy, 'lru' (least recently used) or 'fifo' (oldest first).
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not found in the cache.
+        evictions (int): Number of entries removed to respect maxsize.
+        invalidations (int): Number of entries removed by `invalidate`.
+    """
+
+    def __init__(self, name: str, maxsize: Optional[int] = 256, policy: str = 'lru'):
+        """
+        Initializes an empty cache.
+
+        Args:
+            name (str): Cache name used in statistics.
+            maxsize (Optional[int], optional): Maximum number of entries. Defaults to 256.
+            policy (str, optional): Eviction policy, 'lru' or 'fifo'. Defaults to 'lru'.
+        """
+        self.name = name
+        self.entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.tags: Dict[Hashable, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self.by_name: Dict[str, Set[Hashable]] = {}
+        self.by_file: Dict[str, Set[Hashable]] = {}
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self.lock = Lock()
+        self.maxsize = maxsize
+        self.policy = policy
+
+    @property
+    def policy(self) -> str:
+        """
+        Returns the eviction policy.
+        """
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: str) -> None:
+        if policy not in POLICIES:
+            raise ValueError("Unknown cache policy '%s', expected one of %s" % (policy, ', '.join(POLICIES)))
+
+        self._policy = policy
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """
+        Returns the maximum number of entries.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and (isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 0):
+            raise ValueError("Cache maxsize must be a non-negative integer or None, got %r" % (maxsize,))
+
+        with self.lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns whether the cache stores anything at all.
+
+        Returns:
+            bool: False when maxsize is 0.
+        """
+        return self.maxsize != 0
+
+    def get(self, key: Optional[Hashable], default: Any = None) -> Any:
+        """
+        Returns the cached value, counting a hit or a miss.
+
+        Args:
+            key (Optional[Hashable]): The cache key. None is never cached.
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: The cached value or default.
+        """
+        if key is None or not self.enabled:
+            return default
+
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+
+                return default
+
+            self.hits += 1
+            if self.policy == 'lru':
+                self.entries.move_to_end(key)
+
+        return value
+
+    def set(self, key: Optional[Hashable], value: Any,
+            names: Iterable[str] = (), files: Iterable[str] = ()) -> None:
+        """
+        Stores a value, evicting entries above maxsize according to the policy.
+
+        Only files that exist are tagged, so placeholders like the 'base.py'
+        entry of `Block.files` never tie unrelated entries together.
+
+        Args:
+            key (Optional[Hashable]): The cache key. None is never cached.
+            value (Any): The value to store.
+            names (Iterable[str], optional): Block names the value depends on.
+            files (Iterable[str], optional): Source files the value was built from.
+        """
+        if key is None or not self.enabled:
+            return
+
+        names = tuple(names)
+        files = tuple(file_key(file) for file in files if path.isfile(file))
+
+        with self.lock:
+            if key in self.entries:
+                self._untag(key)
+
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            self._tag(key, names, files)
+            self._trim()
+
+    def invalidate(self, name: Optional[str] = None, file: Optional[str] = None) -> int:
+        """
+        Removes entries that depend on a block name or on a source file.
+
+        Args:
+            name (Optional[str], optional): Block name, e.g. 'game.Character'.
+            file (Optional[str], optional): Path of a block or modifier file.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        keys: Set[Hashable] = set()
+        with self.lock:
+            if name is not None:
+                keys.update(self.by_name.get(name, ()))
+            if file is not None:
+                keys.update(self.by_file.get(file_key(file), ()))
+
+            for key in keys:
+                self._remove(key)
+
+            self.invalidations += len(keys)
+
+        return len(keys)
+
+    def dependents(self, name: Optional[str] = None,
+                   file: Optional[str] = None) -> Tuple[Set[str], Set[str]]:
+        """
+        Returns the tags of entries that depend on a block name or on a source file.
+
+        Args:
+            name (Optional[str], optional): Block name, e.g. 'game.Character'.
+            file (Optional[str], optional): Path of a block or modifier file.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Block names and files of those entries.
+        """
+        names: Set[str] = set()
+        files: Set[str] = set()
+        with self.lock:
+            keys = set(self.by_name.get(name, ())) if name is not None else set()
+            if file is not None:
+                keys.update(self.by_file.get(file_key(file), ()))
+
+            for key in keys:
+                key_names, key_files = self.tags.get(key, ((), ()))
+                names.update(key_names)
+                files.update(key_files)
+
+        return names, files
+
+    def clear(self) -> None:
+        """
+        Removes all entries, keeping the statistics.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.tags.clear()
+            self.by_name.clear()
+            self.by_file.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns cache statistics.
+
+        Returns:
+            Dict[str, Any]: Counters, current size, maxsize and policy.
+        """
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+        }
+
+    def _trim(self) -> None:
+        if self._maxsize is not None:
+            while len(self.entries) > self._maxsize:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _tag(self, key: Hashable, names: Tuple[str, ...], files: Tuple[str, ...]) -> None:
+        self.tags[key] = (names, files)
+        for name in names:
+            self.by_name.setdefault(name, set()).add(key)
+        for file in files:
+            self.by_file.setdefault(file, set()).add(key)
+
+    def _untag(self, key: Hashable) -> None:
+        names, files = self.tags.pop(key, ((), ()))
+        for index, values in ((self.by_name, names), (self.by_file, files)):
+            for value in values:
+                keys = index.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[value]
+
+    def _remove(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+        self._untag(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def file_key(file: str) -> str:
+    """
+    Returns the normalized absolute path used to tag cache entries.
+
+    Args:
+        file (str): A file path.
+
+    Returns:
+        str: The absolute, normalized path.
+    """
+    return path.normcase(path.abspath(str(file)))
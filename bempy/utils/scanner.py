@@ -0,0 +1,266 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from stat import S_ISDIR
+from typing import Dict, List, Optional, Set, Tuple, Any
+
+# Default manifest file name inside a blocks root
+INDEX_FILE = '.bempy-index'
+
+# Directory entry as (name, is_dir)
+EntryType = Tuple[str, bool]
+
+
+class ScopeIndex:
+    """
+    Directory listings of a blocks tree, optionally persisted to a manifest.
+
+    Every listing is stored together with the directory mtime and size. On the
+    next run a listing is reused while the directory stat is unchanged, so only
+    directories that changed are read again. With `validate=False` the manifest
+    is trusted as is and the tree is not touched at all.
+
+    A manifest inside the tree is left out of the listing of its directory,
+    and the stat that writing it leaves on that directory is recorded, so the
+    directory is not read again on the next run.
+
+    Attributes:
+        root (str): The blocks root directory.
+        path (Optional[str]): Manifest file path, None keeps listings in memory only.
+        validate (bool): Whether to check directory stats against the manifest.
+        listings (Dict[str, Tuple[int, int, List[EntryType]]]): Listings by relative path.
+        visited (Set[str]): Directories requested during the current scan.
+        changed (bool): Whether listings differ from the manifest on disk.
+        manifest_dir (Optional[str]): Directory of the manifest relative to the
+            root, None if the manifest is outside the tree.
+    """
+    version = 1
+
+    def __init__(self, root: str, path: Optional[str] = None, validate: bool = True):
+        self.root = root
+        self.path = path
+        self.validate = validate
+        self.listings: Dict[str, Tuple[int, int, List[EntryType]]] = {}
+        self.visited: Set[str] = set()
+        self.changed = False
+        self.manifest_dir: Optional[str] = None
+
+        if path:
+            directory = os.path.relpath(os.path.dirname(os.path.abspath(path)), os.path.abspath(root))
+            if directory != os.pardir and not directory.startswith(os.pardir + os.sep):
+                self.manifest_dir = '' if directory == os.curdir else directory
+
+            self.load()
+
+    def load(self) -> None:
+        """
+        Reads listings from the manifest, ignoring missing or foreign files.
+        """
+        try:
+            with open(self.path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(manifest, dict) or manifest.get('version') != self.version:
+            return
+
+        for directory, (mtime, size, entries) in manifest.get('directories', {}).items():
+            self.listings[directory] = (mtime, size, [(name, is_dir) for name, is_dir in entries])
+
+    def save(self) -> None:
+        """
+        Writes listings of the visited directories to the manifest if they changed.
+
+        Directories that were not visited during the scan no longer belong to the
+        tree and are dropped. Read-only locations are silently skipped.
+        """
+        if not self.path:
+            return
+
+        for directory in list(self.listings):
+            if directory not in self.visited:
+                del self.listings[directory]
+                self.changed = True
+
+        if not self.changed:
+            return
+
+        manifest = {
+            'version': self.version,
+            'directories': self.listings,
+        }
+
+        temp = self.path + '.tmp'
+        try:
+            with open(temp, 'w') as file:
+                json.dump(manifest, file, separators=(',', ':'))
+            os.replace(temp, self.path)
+
+            # Replacing the manifest changed its directory, record the new stat in place
+            record = self.listings.get(self.manifest_dir) if self.manifest_dir is not None else None
+            if record:
+                full_path = path.join(self.root, self.manifest_dir)
+                stat = os.stat(full_path)
+                if (stat.st_mtime_ns, stat.st_size) != record[:2] and self.listing(full_path) == record[2]:
+                    self.listings[self.manifest_dir] = (stat.st_mtime_ns, stat.st_size, record[2])
+                    with open(self.path, 'w') as file:
+                        json.dump(manifest, file, separators=(',', ':'))
+        except OSError:
+            return
+
+        self.changed = False
+
+    def entries(self, directory: str) -> Optional[List[EntryType]]:
+        """
+        Returns the entries of a directory inside the root.
+
+        Args:
+            directory (str): Directory path relative to the root.
+
+        Returns:
+            Optional[List[EntryType]]: (name, is_dir) pairs, None if the directory is missing.
+        """
+        self.visited.add(directory)
+        record = self.listings.get(directory)
+
+        if record and not self.validate:
+            return record[2]
+
+        full_path = path.join(self.root, directory)
+
+        # Without a manifest there is nothing to validate, read the directory once
+        if not self.path:
+            return list_directory(full_path)
+
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            stat = None
+
+        if stat is None or not S_ISDIR(stat.st_mode):
+            if record:
+                del self.listings[directory]
+                self.changed = True
+
+            return None
+
+        if record and record[0] == stat.st_mtime_ns and record[1] == stat.st_size:
+            return record[2]
+
+        entries = self.listing(full_path) if directory == self.manifest_dir else list_directory(full_path)
+        if entries is None:
+            return None
+
+        self.listings[directory] = (stat.st_mtime_ns, stat.st_size, entries)
+        self.changed = True
+
+        return entries
+
+    def listing(self, full_path: str) -> Optional[List[EntryType]]:
+        """
+        Reads the directory of the manifest without the manifest files.
+
+        Args:
+            full_path (str): The directory path.
+        """
+        entries = list_directory(full_path)
+        if entries is None:
+            return None
+
+        name = os.path.basename(self.path)
+
+        return [entry for entry in entries if entry[0] not in (name, name + '.tmp')]
+
+
+def list_directory(directory: str) -> Optional[List[EntryType]]:
+    """
+    Reads a directory once, taking entry types from `os.scandir`.
+
+    Args:
+        directory (str): The directory path.
+
+    Returns:
+        Optional[List[EntryType]]: (name, is_dir) pairs, None if the directory is missing.
+    """
+    try:
+        with os.scandir(directory) as iterator:
+            return [(entry.name, entry.is_dir()) for entry in iterator]
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def scan_scope(index: ScopeIndex, directory: str = '', workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Collects scopes, blocks and modifiers below a directory of the index root.
+
+    Every directory is read exactly once. Independent scopes of the given
+    directory may be scanned concurrently in a thread pool.
+
+    Args:
+        index (ScopeIndex): Listings of the blocks tree.
+        directory (str, optional): Directory relative to the root. Defaults to the root.
+        workers (Optional[int], optional): Threads for scanning scopes in parallel. Defaults to None.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Blocks and their modifiers grouped by scope.
+    """
+    root_entries = index.entries(directory)
+    if root_entries is None:
+        return {}
+
+    scopes = [path.join(directory, scope) for scope, is_dir in root_entries
+              if is_dir and scope[0].islower()]
+
+    if workers and workers > 1 and len(scopes) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda scope_root: scan_block_scope(index, scope_root), scopes))
+    else:
+        results = [scan_block_scope(index, scope_root) for scope_root in scopes]
+
+    return {path.basename(scope_root): result for scope_root, result in zip(scopes, results)}
+
+
+def scan_block_scope(index: ScopeIndex, scope_root: str) -> Dict[str, Any]:
+    """
+    Collects blocks of a single scope together with its nested scopes.
+
+    Args:
+        index (ScopeIndex): Listings of the blocks tree.
+        scope_root (str): Scope directory relative to the index root.
+
+    Returns:
+        Dict[str, Any]: Blocks with their modifiers and nested scopes.
+    """
+    scope_entries = index.entries(scope_root) or []
+    scope_blocks: Dict[str, Any] = {}
+
+    for element, is_dir in scope_entries:
+        if not is_dir or not element[0].isupper():
+            continue
+
+        block_root = path.join(scope_root, element)
+        block_entries = index.entries(block_root) or []
+        if ('__init__.py', False) not in block_entries:
+            continue
+
+        mods: Dict[str, List[str]] = {}
+        for mod_type, is_dir in block_entries:
+            if not is_dir or not mod_type.startswith('_'):
+                continue
+
+            values = [name[:-3] for name, is_file_dir in index.entries(path.join(block_root, mod_type)) or []
+                      if not is_file_dir and name.endswith('.py') and not name.startswith('.')
+                      and name.find('_test.py') == -1]
+            if values:
+                mods[mod_type[1:]] = values
+
+        scope_blocks[element] = mods
+
+    # Nested scopes come from the same listing
+    for scope, is_dir in scope_entries:
+        if is_dir and scope[0].islower():
+            scope_blocks[scope] = scan_block_scope(index, path.join(scope_root, scope))
+
+    return scope_blocks
@@ -0,0 +1,229 @@
+import ast
+from inspect import getmro, getsource, isfunction
+from textwrap import dedent
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+# Slotted copies of model classes
+slotted_copies: 'WeakKeyDictionary[type, type]' = WeakKeyDictionary()
+
+
+def slot_attributes(models: Iterable[type]) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the instance attributes of a block composed from the given models.
+
+    Attributes are collected from `slots` tuples declared on models and from
+    `self.<name> = ...` assignments in their methods. None means the block
+    must keep a regular `__dict__`: a model sets `slots = False`, assigns
+    attributes dynamically (`setattr`, `vars`, `__dict__`), uses zero-argument
+    `super()`, or assigns an attribute that is also a class attribute.
+
+    Args:
+        models (Iterable[type]): Model classes of the block.
+
+    Returns:
+        Optional[Tuple[str, ...]]: Sorted attribute names, None if slots can not be used.
+    """
+    classes = []
+    for model in models:
+        for cls in getmro(model):
+            if cls is not object and cls not in classes:
+                classes.append(cls)
+
+    attributes: Set[str] = set()
+    for cls in classes:
+        declared = cls.__dict__.get('slots', ())
+        if declared is False:
+            return None
+
+        if isinstance(declared, (tuple, list)):
+            attributes.update(declared)
+
+        assigned = assigned_attributes(cls)
+        if assigned is None:
+            return None
+
+        attributes.update(assigned)
+
+    for cls in classes:
+        for attribute in attributes:
+            if attribute in cls.__dict__ and attribute not in getattr(cls, '__slots__', ()):
+                return None
+
+    return tuple(sorted(attributes))
+
+
+def assigned_attributes(cls: type) -> Optional[Set[str]]:
+    """
+    Returns attributes assigned to `self` in the methods of a class.
+
+    Args:
+        cls (type): The class to analyse.
+
+    Returns:
+        Optional[Set[str]]: Attribute names, None if attributes are assigned dynamically.
+    """
+    attributes: Set[str] = set()
+
+    # Class and static methods do not receive the instance and are skipped
+    for function in cls.__dict__.values():
+        if not isfunction(function):
+            continue
+
+        if '__class__' in function.__code__.co_freevars:
+            return None
+
+        try:
+            tree = ast.parse(dedent(getsource(function)))
+        except (OSError, TypeError, SyntaxError):
+            return None
+
+        node = tree.body[0]
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.args.args:
+            continue
+
+        names = function_attributes(node, node.args.args[0].arg)
+        if names is None:
+            return None
+
+        for name in names:
+            # Private names are mangled with the class name
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_' + cls.__name__.lstrip('_') + name
+            attributes.add(name)
+
+    return attributes
+
+
+def function_attributes(function: ast.AST, self_name: str) -> Optional[Set[str]]:
+    """
+    Returns attributes assigned to the first argument of a parsed function.
+
+    Args:
+        function (ast.AST): The function definition node.
+        self_name (str): Name of the instance argument.
+
+    Returns:
+        Optional[Set[str]]: Attribute names, None if attributes are assigned dynamically.
+    """
+    attributes: Set[str] = set()
+
+    def is_self(node: ast.AST) -> bool:
+        return isinstance(node, ast.Name) and node.id == self_name
+
+    def collect(target: ast.AST) -> None:
+        if isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                collect(element)
+        elif isinstance(target, ast.Starred):
+            collect(target.value)
+        elif isinstance(target, ast.Attribute) and is_self(target.value):
+            attributes.add(target.attr)
+
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                collect(target)
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.For, ast.AsyncFor)):
+            collect(node.target)
+        elif isinstance(node, ast.withitem) and node.optional_vars is not None:
+            collect(node.optional_vars)
+        elif isinstance(node, ast.Attribute) and node.attr == '__dict__' and is_self(node.value):
+            return None
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                and node.func.id in ('setattr', 'vars') and node.args and is_self(node.args[0]):
+            return None
+
+    return attributes
+
+
+def attribute_access(function: Callable) -> Optional[Tuple[FrozenSet[str], FrozenSet[str]]]:
+    """
+    Returns attributes of `self` that a method reads and writes.
+
+    Reads are `self.<name>` loads and `getattr`/`hasattr` calls with a constant
+    name. None means the access can not be known statically: the method
+    assigns attributes dynamically, calls another method of the instance or
+    its source is not available.
+
+    Args:
+        function (Callable): A method whose first argument is the instance.
+
+    Returns:
+        Optional[Tuple[FrozenSet[str], FrozenSet[str]]]: Read and written attribute names.
+    """
+    try:
+        tree = ast.parse(dedent(getsource(function)))
+    except (OSError, TypeError, SyntaxError):
+        return None
+
+    node = tree.body[0]
+    if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.args.args:
+        return None
+
+    self_name = node.args.args[0].arg
+    writes = function_attributes(node, self_name)
+    if writes is None:
+        return None
+
+    reads: Set[str] = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name) \
+                and child.value.id == self_name and isinstance(child.ctx, ast.Load):
+            reads.add(child.attr)
+        elif isinstance(child, ast.Call) and isinstance(child.func, ast.Name) \
+                and child.func.id in ('getattr', 'hasattr') and len(child.args) > 1 \
+                and isinstance(child.args[0], ast.Name) and child.args[0].id == self_name:
+            if not isinstance(child.args[1], ast.Constant):
+                return None
+            reads.add(child.args[1].value)
+
+        # Another method may touch anything
+        if isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute) \
+                and isinstance(child.func.value, ast.Name) and child.func.value.id == self_name:
+            return None
+
+    return frozenset(reads), frozenset(writes)
+
+
+def slotted_bases(models: Iterable[type]) -> Tuple[type, ...]:
+    """
+    Returns copies of the models whose class hierarchy has no instance `__dict__`.
+
+    Every class between a model and the first class that already defines
+    `__slots__` is copied with empty `__slots__`, methods are shared with the
+    original classes.
+
+    Args:
+        models (Iterable[type]): Model classes of the block.
+
+    Returns:
+        Tuple[type, ...]: Slotted model classes in the same order.
+    """
+    return tuple(slotted_copy(model) for model in models)
+
+
+def slotted_copy(cls: type) -> type:
+    """
+    Returns a copy of a class with empty `__slots__` and slotted bases.
+
+    Args:
+        cls (type): The class to copy.
+
+    Returns:
+        type: The slotted copy, or the class itself if it defines `__slots__`.
+    """
+    if cls is object or '__slots__' in cls.__dict__:
+        return cls
+
+    copy = slotted_copies.get(cls)
+    if copy is None:
+        namespace: Dict[str, object] = {key: value for key, value in cls.__dict__.items()
+                                        if key not in ('__dict__', '__weakref__')}
+        namespace['__slots__'] = ()
+
+        copy = type(cls.__name__, tuple(slotted_copy(base) for base in cls.__bases__), namespace)
+        copy.__qualname__ = cls.__qualname__
+        slotted_copies[cls] = copy
+
+    return copy
@@ -1,11 +1,29 @@
+import sys
+import warnings
+from hashlib import sha1
 from importlib import import_module
-from os import getenv
-from os.path import dirname
+from importlib.machinery import ModuleSpec
+from importlib.util import find_spec, module_from_spec
+from os import getenv, pathsep
+from os.path import abspath, basename, dirname, exists, isfile, join, normcase, normpath
 from pathlib import Path
 from inspect import getmro
-from typing import List, Dict, Any, Tuple, Type, Optional
-import json
-from functools import lru_cache
+from typing import List, Dict, Any, Sequence, Tuple, Type, Optional, Hashable
+
+from . import freeze
+from .archive import ARCHIVE_SUFFIX, is_archive, read_archive_index
+from .cache import BuildCache
+from .scanner import EntryType, list_directory
+
+# Modifier values of a block as {mod: {value: file}}
+ModFilesType = Dict[str, Dict[str, Path]]
+
+# Resolution caches of get_block_class and get_mod_classes, BEM_RESOLVE_CACHE sets their size
+block_class_cache = BuildCache('block_classes', maxsize=int(getenv('BEM_RESOLVE_CACHE') or 1024))
+mod_classes_cache = BuildCache('mod_classes', maxsize=int(getenv('BEM_RESOLVE_CACHE') or 1024))
+
+# Canonical selected modifiers as ((mod, (value, ...)), ...) sorted by mod
+ModsKey = Tuple[Tuple[str, Hashable], ...]
 
 
 def bem_blocks_path() -> str:
@@ -20,12 +38,394 @@ def bem_blocks_path() -> str:
 
     return blocks_path
 
-@lru_cache
+class LibraryIndex:
+    """
+    Resolved blocks and modifiers of a single library root.
+
+    A block directory is read the first time it is requested and all its
+    modifier files are recorded at once. Missing blocks are remembered as
+    well, so after warm-up resolution never touches the filesystem.
+
+    Attributes:
+        root (str): The library root directory.
+        module (str): The import path of the library root.
+        blocks (Dict[str, Optional[Tuple[Path, ModFilesType]]]): Base file and
+            modifier files by block directory, None for blocks that do not exist.
+    """
+
+    def __init__(self, root: str, module: str):
+        self.root = root
+        self.module = module
+        self.blocks: Dict[str, Optional[Tuple[Path, ModFilesType]]] = {}
+
+    def block(self, block_dir: str) -> Optional[Tuple[Path, ModFilesType]]:
+        """
+        Returns the base file and modifier files of a block.
+
+        Args:
+            block_dir (str): The block directory relative to the root, e.g. 'game/Character'.
+
+        Returns:
+            Optional[Tuple[Path, ModFilesType]]: Base file and modifiers, None if the block is missing.
+        """
+        try:
+            return self.blocks[block_dir]
+        except KeyError:
+            pass
+
+        block_path = self.path(block_dir)
+        entries = self.entries(block_dir)
+        entry = None
+
+        if entries is not None and ('__init__.py', False) in entries:
+            mods: ModFilesType = {}
+            for name, is_dir in entries:
+                if not is_dir or not name.startswith('_') or name.startswith('__'):
+                    continue
+
+                mods[name[1:]] = {value[:-3]: block_path / name / value
+                                  for value, is_value_dir in self.entries(block_dir + '/' + name) or []
+                                  if not is_value_dir and value.endswith('.py')}
+
+            entry = (block_path / '__init__.py', mods)
+
+        self.blocks[block_dir] = entry
+
+        return entry
+
+    def entries(self, directory: str) -> Optional[List[EntryType]]:
+        """
+        Returns the (name, is_dir) entries of a directory, None if it is missing.
+
+        Args:
+            directory (str): The directory relative to the root.
+        """
+        return list_directory(str(self.path(directory)))
+
+    def path(self, directory: str) -> Path:
+        """
+        Returns the path of a directory relative to the root.
+
+        Args:
+            directory (str): The directory relative to the root.
+        """
+        return Path(self.root) / directory
+
+    def mod(self, block_dir: str, mod: str, value: str) -> Optional[Path]:
+        """
+        Returns the file of a modifier value.
+
+        Args:
+            block_dir (str): The block directory relative to the root.
+            mod (str): The modifier name.
+            value (str): The modifier value.
+
+        Returns:
+            Optional[Path]: The modifier file, None if the library has no such modifier.
+        """
+        entry = self.block(block_dir)
+        if entry is None:
+            return None
+
+        return entry[1].get(mod, {}).get(value)
+
+
+class ArchiveIndex(LibraryIndex):
+    """
+    Resolved blocks and modifiers of a library packed by `pack_library`.
+
+    Directory listings come from the index stored in the archive and modules
+    are imported from it by `zipimport`, so resolution never touches the
+    filesystem. The packed package is imported under its own namespace,
+    see `library_namespace`.
+
+    Attributes:
+        package (str): The package directory inside the archive.
+        listings (Dict[str, Tuple[int, int, List[EntryType]]]): Listings by
+            directory relative to the library root.
+    """
+
+    def __init__(self, root: str):
+        # A missing archive is an empty library, e.g. BEM_LIBRARIES set before packing
+        if isfile(root):
+            self.package, self.listings = read_archive_index(root)
+        else:
+            self.package, self.listings = basename(root)[:-len(ARCHIVE_SUFFIX)], {}
+
+        super().__init__(root, library_namespace(self.package, join(abspath(root), self.package)))
+
+    def entries(self, directory: str) -> Optional[List[EntryType]]:
+        record = self.listings.get(directory)
+
+        return record[2] if record else None
+
+    def path(self, directory: str) -> Path:
+        return Path(self.root) / self.package / directory
+
+
+# Library indexes by library root
+library_indexes: Dict[str, LibraryIndex] = {}
+
+# Package directory and archive libraries are imported under
+LIBRARIES_PACKAGE = __name__.split('.')[0] + '.libraries'
+
+
+def library_namespace(name: str, location: str) -> str:
+    """
+    Returns the package a directory or an archive library is imported as.
+
+    Every library location gets its own package under `bempy.libraries`,
+    named after the library and a short hash of its location, so libraries
+    in directories with the same name override each other instead of
+    clashing on import, and a library keeps its package name in every
+    process whatever other libraries are loaded. The package is put into
+    `sys.modules` with the location as its `__path__`, its modules are
+    imported from there by the regular path finders.
+
+    Args:
+        name (str): The library name, e.g. 'blocks'.
+        location (str): The absolute library directory, or 'archive.zip/package'.
+
+    Returns:
+        str: The package name, e.g. 'bempy.libraries.blocks_5d41402a'.
+    """
+    slug = ''.join(char if char.isalnum() else '_' for char in name) or 'library'
+    if slug[0].isdigit():
+        slug = '_' + slug
+
+    digest = sha1(normcase(location).encode('utf-8', 'surrogateescape')).hexdigest()[:8]
+    package = '%s.%s_%s' % (LIBRARIES_PACKAGE, slug, digest)
+
+    if getattr(sys.modules.get(package), '__path__', None) != [location]:
+        # Modules left by the same location spelled differently, e.g. in another case
+        for stale in [stale for stale in sys.modules if stale.startswith(package + '.')]:
+            del sys.modules[stale]
+
+        spec = ModuleSpec(package, None, is_package=True)
+        spec.submodule_search_locations = [location]
+        sys.modules[package] = module_from_spec(spec)
+
+    return package
+
+
+def library_index(lib: str) -> LibraryIndex:
+    """
+    Returns the resolution index of a library, creating it once.
+
+    A library is one of:
+
+    - an archive written by `pack_library`, e.g. 'dist/blocks.zip'
+    - a directory, imported as a package named after it under `bempy.libraries`
+    - an installed package, e.g. 'acme_blocks', when no such path exists
+
+    Args:
+        lib (str): The library.
+
+    Returns:
+        LibraryIndex: The index of the library.
+    """
+    index = library_indexes.get(lib)
+    if index is None:
+        if is_archive(lib):
+            index = ArchiveIndex(lib)
+        elif lib == bem_blocks_path():
+            index = LibraryIndex(lib, __name__.split('.')[0] + '.blocks')
+        else:
+            root = package_root(lib) if not exists(lib) else None
+            if root:
+                index = LibraryIndex(root, lib)
+            else:
+                location = normpath(abspath(lib))
+                index = LibraryIndex(lib, library_namespace(basename(location), location))
+
+        library_indexes[lib] = index
+
+    return index
+
+
+def package_root(name: str) -> Optional[str]:
+    """
+    Returns the directory of an installed package, None if it is not a package.
+
+    Args:
+        name (str): A dotted module name, e.g. 'acme.blocks'.
+    """
+    if not all(part.isidentifier() for part in name.split('.')):
+        return None
+
+    try:
+        spec = find_spec(name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or not spec.submodule_search_locations:
+        return None
+
+    return list(spec.submodule_search_locations)[0]
+
+
+def environment_libraries() -> List[str]:
+    """
+    Returns the libraries configured by the environment, highest priority first.
+
+    BEM_LIBRARIES lists libraries separated by `os.pathsep`, e.g.
+    'overrides:dist/blocks.zip:acme_blocks'. When it is not set the
+    'blocks' directory is used. Built-in blocks always come last.
+
+    Returns:
+        List[str]: The libraries.
+    """
+    value = getenv('BEM_LIBRARIES')
+    libraries = [lib for lib in value.split(pathsep) if lib] if value else ['blocks']
+
+    return libraries + [bem_blocks_path()]
+
+
+class LibraryRegistry:
+    """
+    Block libraries in override priority order.
+
+    A block is taken from the first library that has it, and every modifier
+    value from the first library that has it for the block, so earlier
+    libraries override blocks and modifiers of later ones. Every library has
+    one index shared through `library_index`, so a lookup costs one index
+    query per library, however many blocks were built before.
+
+    Directory and archive libraries are imported under their own packages,
+    so libraries in directories with the same name can be used together.
+
+    Attributes:
+        libraries (List[str]): The libraries, highest priority first.
+        roots (List[str]): Directories or archives of the libraries in the
+            same order, updated in place for the scope import hook.
+
+    Example:
+        >>> library_registry.add('overrides', first=True)
+        >>> library_registry.libraries
+        ['overrides', 'blocks', '.../bempy/blocks']
+    """
+
+    def __init__(self, libraries: Sequence[str] = ()):
+        self.libraries: List[str] = []
+        self.roots: List[str] = []
+        self.load(libraries)
+
+    def load(self, libraries: Sequence[str]) -> None:
+        """
+        Replaces the libraries.
+
+        Args:
+            libraries (Sequence[str]): The libraries, highest priority first.
+        """
+        self.libraries.clear()
+        self.roots.clear()
+        for lib in libraries:
+            self.add(lib)
+
+    def add(self, lib: str, first: bool = False) -> LibraryIndex:
+        """
+        Adds a library, or moves it when it is registered already.
+
+        Resolved blocks and modifiers are forgotten, block classes built
+        before are kept by the builder caches.
+
+        Args:
+            lib (str): A directory, an archive or an installed package name.
+            first (bool, optional): Give it the highest priority instead of
+                the lowest. Defaults to False.
+
+        Returns:
+            LibraryIndex: The index of the library.
+
+        Raises:
+            ValueError: If the library is an archive not written by `pack_library`.
+        """
+        index = library_index(lib)
+        if lib in self.libraries:
+            self.libraries.remove(lib)
+
+        self.libraries.insert(0 if first else len(self.libraries), lib)
+        self.changed()
+
+        return index
+
+    def remove(self, lib: str) -> None:
+        """
+        Removes a library.
+
+        Args:
+            lib (str): A registered library.
+        """
+        self.libraries.remove(lib)
+        self.changed()
+
+    def changed(self) -> None:
+        """
+        Updates roots and forgets resolutions made with the previous libraries.
+        """
+        self.roots[:] = [library_index(lib).root for lib in self.libraries]
+        block_class_cache.clear()
+        mod_classes_cache.clear()
+
+    def indexes(self, libraries: Optional[Sequence[str]] = None) -> List[LibraryIndex]:
+        """
+        Returns the indexes to search, highest priority first.
+
+        Args:
+            libraries (Optional[Sequence[str]], optional): Libraries searched
+                before the registered ones. Defaults to None.
+        """
+        return [library_index(lib) for lib in [*(libraries or ()), *self.libraries]]
+
+    def block(self, block_dir: str, libraries: Optional[Sequence[str]] = None
+              ) -> Tuple[Optional[LibraryIndex], Optional[Tuple[Path, ModFilesType]]]:
+        """
+        Returns the library index and the entry of a block.
+
+        Args:
+            block_dir (str): The block directory relative to a root, e.g. 'game/Character'.
+            libraries (Optional[Sequence[str]], optional): Libraries searched first.
+
+        Returns:
+            Tuple[Optional[LibraryIndex], Optional[Tuple[Path, ModFilesType]]]: The
+                index and the entry of `LibraryIndex.block`, (None, None) if it is missing.
+        """
+        for index in self.indexes(libraries):
+            entry = index.block(block_dir)
+            if entry:
+                return index, entry
+
+        return None, None
+
+    def mod(self, block_dir: str, mod: str, value: str, libraries: Optional[Sequence[str]] = None
+            ) -> Tuple[Optional[LibraryIndex], Optional[Path]]:
+        """
+        Returns the library index and the file of a modifier value.
+
+        Args:
+            block_dir (str): The block directory relative to a root.
+            mod (str): The modifier name.
+            value (str): The modifier value.
+            libraries (Optional[Sequence[str]], optional): Libraries searched first.
+
+        Returns:
+            Tuple[Optional[LibraryIndex], Optional[Path]]: The index and the
+                modifier file, (None, None) if no library has it.
+        """
+        for index in self.indexes(libraries):
+            mod_file = index.mod(block_dir, mod, value)
+            if mod_file:
+                return index, mod_file
+
+        return None, None
+
+
 def get_block_class(name: str) -> Tuple[Optional[Path], Optional[Type]]:
     """
     Retrieves a block class by name (cached).
     
-    This function is a cached wrapper around lookup_block_class.
+    This function is a cached wrapper around lookup_block_class, entries are
+    stored in `block_class_cache` tagged with the block name and base file.
     
     Args:
         name (str): The name of the block.
@@ -33,45 +433,37 @@ def get_block_class(name: str) -> Tuple[Optional[Path], Optional[Type]]:
     Returns:
         Tuple[Optional[Path], Optional[Type]]: A tuple containing the path to the base file and the block class.
     """
-    return lookup_block_class(name)
+    result = block_class_cache.get(name)
+    if result is None:
+        result = lookup_block_class(name)
+        block_class_cache.set(name, result, names=(name,),
+                              files=(result[0],) if result[0] else ())
+
+    return result
 
-def lookup_block_class(name: str, libraries: List[str]=[]) -> Tuple[Optional[Path], Optional[Type]]:
+def lookup_block_class(name: str, libraries: Optional[Sequence[str]] = None) -> Tuple[Optional[Path], Optional[Type]]:
     """
     Looks up the block class for the given block name.
 
     Args:
         name (str): The name of the block.
-        libraries (List[str], optional): A list of library names to search for the block. Defaults to [].
+        libraries (Optional[Sequence[str]], optional): Libraries searched before
+            the ones of `library_registry`. Defaults to None.
 
     Returns:
         Tuple[Optional[Path], Optional[Type]]: A tuple containing the path to the base file and the block class.
     """
-    bem_blocks = bem_blocks_path()
-    libraries += getenv('BEM_LIBRARIES') or ['blocks']
-    libraries.append(bem_blocks)
-
     # Convert slashes to dots for module import but keep original for path
     module_name = name.replace('/', '.')
     block_dir = name.replace('.', '/')
-    base_file = block_class = module_path = None
-
-    for lib in libraries:
-        base_file = Path(lib) / block_dir / ('__init__.py')
-
-        if base_file.exists():
-            if lib == bem_blocks:
-                module_path = 'bem.blocks'
-            else:
-                module_path = lib
-
-            break
 
-    if base_file and base_file.exists():
-        block_class = import_module(module_path + '.' + module_name).Base
-    else:
+    index, entry = library_registry.block(block_dir, libraries)
+    if index is None:
         return None, None
 
-    return base_file, block_class
+    block_class = import_module(index.module + '.' + module_name).Base
+
+    return entry[0], block_class
 
 
 def mods_from_dict(kwargs: Dict[str, Any]) -> Dict[str, List[str]]:
@@ -100,6 +492,60 @@ def mods_from_dict(kwargs: Dict[str, Any]) -> Dict[str, List[str]]:
     return mods
 
 
+def mods_key(mods: Dict[str, Any]) -> Optional[ModsKey]:
+    """
+    Returns a canonical, hashable representation of selected modifications.
+
+    Modifications are sorted by name, so the key does not depend on the order
+    they were passed in. The order of values inside a modification is kept.
+    Unhashable values are frozen and can never match a modifier file.
+
+    Args:
+        mods (Dict[str, Any]): A dictionary of modifications.
+
+    Returns:
+        Optional[ModsKey]: A tuple of (mod, values) pairs usable as a cache key,
+            None if some value can not be frozen.
+
+    Example:
+        >>> mods_key({'size': ['small'], 'color': 'red'})
+        (('color', 'red'), ('size', ('small',)))
+    """
+    try:
+        return tuple(sorted(((mod, mod_values_key(values)) for mod, values in mods.items()),
+                            key=lambda item: item[0]))
+    except TypeError:
+        return None
+
+
+def mod_values_key(values: Any) -> Hashable:
+    """
+    Returns a hashable representation of modification values.
+
+    Args:
+        values (Any): A list of values or a single value.
+
+    Returns:
+        Hashable: A tuple for lists, the value itself otherwise.
+    """
+    if isinstance(values, (list, tuple)):
+        return tuple(value if is_hashable(value) else freeze(value) for value in values)
+
+    return values if is_hashable(values) else freeze(values)
+
+
+def is_hashable(value: Any) -> bool:
+    """
+    Returns whether the value can be used as a dictionary key.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        return False
+
+    return True
+
+
 def mods_predefined(base: Type) -> Dict[str, List[str]]:
     """
     Returns a dictionary of predefined modifications for the given block class.
@@ -125,63 +571,93 @@ def mods_predefined(base: Type) -> Dict[str, List[str]]:
 
     return mods
 
-@lru_cache
-def get_mod_classes(name: str, selected_mods: str) -> Tuple[List[str], List[Type], Dict[str, List[str]]]:
+def get_mod_classes(name: str, selected_mods: ModsKey) -> Tuple[List[str], List[Type], Dict[str, List[str]]]:
     """
     Retrieves modifier classes for a block (cached).
     
-    This function is a cached wrapper around lookup_mod_classes.
+    This function is a cached wrapper around lookup_mod_classes, entries are
+    stored in `mod_classes_cache` tagged with the block name and modifier files.
+    Several modifiers are combined from cached single modifier lookups, so
+    every distinct modifier is resolved once whatever combinations it is used in.
     
     Args:
         name (str): The name of the block.
-        selected_mods (str): A JSON string representing the selected modifiers.
+        selected_mods (ModsKey): Canonical selected modifiers, see `mods_key`.
         
     Returns:
         Tuple[List[str], List[Type], Dict[str, List[str]]]: A tuple containing files, classes, and modifiers.
     """
-    mods = json.loads(selected_mods)
-    return lookup_mod_classes(name, mods)
+    key = (name, selected_mods)
+    result = mod_classes_cache.get(key)
+    if result is None:
+        if len(selected_mods) <= 1:
+            result = lookup_mod_classes(name, dict(selected_mods))
+        else:
+            files: List[str] = []
+            classes: List[Type] = []
+            mods: Dict[str, List[str]] = {}
+            for selected_mod in selected_mods:
+                mod_files, mod_classes, mod_mods = get_mod_classes(name, (selected_mod,))
+                files += mod_files
+                classes += mod_classes
+                mods = {**mods, **mod_mods}
+
+            result = (files, classes, mods)
+
+        mod_classes_cache.set(key, result, names=(name,), files=result[0])
+
+    return result
 
-def lookup_mod_classes(name: str, selected_mods: Dict[str, Any], libraries: List[str]=[]) -> Tuple[List[str], List[Type], Dict[str, List[str]]]:
+def resolve_mod_classes(name: str, selected_mods: Dict[str, Any]) -> Tuple[List[str], List[Type], Dict[str, List[str]]]:
+    """
+    Retrieves modifier classes for selected modifiers, cached when they can be keyed.
+
+    Modifiers with values that can not be frozen, e.g. objects defining
+    `__eq__` without `__hash__`, are looked up without the cache.
+
+    Args:
+        name (str): The name of the block.
+        selected_mods (Dict[str, Any]): A dictionary of selected modifications.
+
+    Returns:
+        Tuple[List[str], List[Type], Dict[str, List[str]]]: A tuple containing files, classes, and modifiers.
+    """
+    key = mods_key(selected_mods)
+    if key is None:
+        return lookup_mod_classes(name, dict(sorted(selected_mods.items(), key=lambda item: item[0])))
+
+    return get_mod_classes(name, key)
+
+
+def lookup_mod_classes(name: str, selected_mods: Dict[str, Any], libraries: Optional[Sequence[str]] = None) -> Tuple[List[str], List[Type], Dict[str, List[str]]]:
     """
     Looks up the classes of the selected modifications.
 
     Args:
         name (str): The name of the block.
         selected_mods (Dict[str, Any]): A dictionary of selected modifications.
-        libraries (List[str], optional): A list of libraries to search for the block. Defaults to [].
+        libraries (Optional[Sequence[str]], optional): Libraries searched before
+            the ones of `library_registry`. Defaults to None.
 
     Returns:
         Tuple[List[str], List[Type], Dict[str, List[str]]]: A tuple containing a list of files, a list of classes, and a dictionary of modifications.
     """
-    bem_blocks = bem_blocks_path()
-    libraries += getenv('BEM_LIBRARIES') or ['blocks']
-    libraries.append(bem_blocks)
-
     block_dir = name.replace('.', '/')
-    mod_file = module_path = None
     classes = []
     files = []
     mods = {}
 
     for mod, values in selected_mods.items():
-        if not isinstance(values, list):
+        if isinstance(values, tuple):
+            values = list(values)
+        elif not isinstance(values, list):
             values = [str(values)]
 
         for value in values:
-            for lib in libraries:
-                mod_file = Path(lib) / block_dir / ('_' + mod) / (str(value) + '.py')
-                if mod_file.exists():
-                    if lib == bem_blocks:
-                        module_path = 'bem.blocks'
-                    else:
-                        module_path = lib
-
-                    break
-
-            if mod_file and mod_file.exists():
-                mod_file = Path(lib) / block_dir / ('_' + mod) / (str(value) + '.py')
-                Module = import_module(module_path + '.' + block_dir.replace('/', '.') + '._' + mod + '.' + value)
+            index, mod_file = library_registry.mod(block_dir, mod, str(value), libraries)
+
+            if mod_file:
+                Module = import_module(index.module + '.' + block_dir.replace('/', '.') + '._' + mod + '.' + str(value))
                 classes.append(Module.Modificator)
                 files.append(str(mod_file))
 
@@ -198,3 +674,26 @@ def lookup_mod_classes(name: str, selected_mods: Dict[str, Any], libraries: List
 
     return files, classes, mods
 
+
+def environment_registry() -> LibraryRegistry:
+    """
+    Returns the registry of the libraries configured by the environment.
+
+    Unusable libraries are skipped with a warning instead of failing the
+    import of bempy, e.g. a zip archive that was not written by `pack_library`.
+
+    Returns:
+        LibraryRegistry: The registry.
+    """
+    registry = LibraryRegistry()
+    for lib in environment_libraries():
+        try:
+            registry.add(lib)
+        except ValueError as error:
+            warnings.warn("Library '%s' is skipped: %s" % (lib, error))
+
+    return registry
+
+
+# Libraries blocks are resolved from, configured by BEM_LIBRARIES
+library_registry = environment_registry()
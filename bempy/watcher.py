@@ -0,0 +1,259 @@
+import importlib
+import os
+import sys
+import threading
+import warnings
+from types import ModuleType
+from typing import Dict, List, Optional, Set
+
+from .builder import caches, invalidate
+from .utils.cache import file_key
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+
+class BlockWatcher:
+    """
+    Reloads changed block and modifier files and invalidates what was built from them.
+
+    The watcher follows the source files recorded by the builder caches, so
+    only files that built blocks depend on are watched. When one of them
+    changes, its module is reloaded and only cache entries whose files
+    include it are dropped; the next `Build` picks up the new code.
+
+    Uses inotify through the optional `inotify_simple` package where available
+    and falls back to polling file modification times.
+
+    Attributes:
+        interval (float): Seconds between polls, or inotify read timeout.
+        use_inotify (bool): Whether inotify is used instead of polling.
+        mtimes (Dict[str, int]): Last seen modification time by watched file.
+    """
+
+    def __init__(self, interval: float = 1.0, use_inotify: Optional[bool] = None):
+        """
+        Initializes a watcher.
+
+        Args:
+            interval (float, optional): Seconds between checks. Defaults to 1.0.
+            use_inotify (Optional[bool], optional): Force inotify on or off.
+                Defaults to inotify when `inotify_simple` is installed.
+        """
+        if use_inotify and INotify is None:
+            raise RuntimeError("inotify requires the 'inotify_simple' package")
+
+        self.interval = interval
+        self.use_inotify = INotify is not None if use_inotify is None else use_inotify
+        self.mtimes: Dict[str, int] = {}
+        self.directories: Dict[int, str] = {}
+        self.inotify = INotify() if self.use_inotify else None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    def files(self) -> Set[str]:
+        """
+        Returns the source files of everything currently cached by the builder.
+
+        Returns:
+            Set[str]: Normalized absolute file paths.
+        """
+        files: Set[str] = set()
+        for cache in caches.values():
+            files.update(list(cache.by_file))
+
+        return files
+
+    def check(self) -> List[str]:
+        """
+        Looks for changed files once and reloads them.
+
+        Returns:
+            List[str]: Files that were reloaded.
+        """
+        if self.use_inotify:
+            changed = self._read_events()
+        else:
+            changed = self._poll()
+
+        for file in changed:
+            self.reload(file)
+
+        return changed
+
+    def reload(self, file: str) -> int:
+        """
+        Reloads the module of a file and invalidates cache entries built from it.
+
+        Block modules that subclass a built block at import time, like
+        `class Base(Base())`, keep the class they were imported with. Every
+        module a cached class built from the file was composed of is
+        reloaded as well, parents before children, so inherited blocks see
+        the change.
+
+        Args:
+            file (str): Path of the changed file.
+
+        Returns:
+            int: Number of invalidated cache entries.
+        """
+        files = dependent_files(file)
+
+        count = sum(invalidate(file=dependent) for dependent in files)
+
+        modules = [module for module in map(module_by_file, files) if module is not None]
+        for module in sorted(modules, key=lambda module: module_depth(module, file)):
+            importlib.reload(module)
+
+        return count
+
+    def start(self) -> 'BlockWatcher':
+        """
+        Starts checking for changes in a daemon thread.
+
+        Returns:
+            BlockWatcher: The watcher itself.
+        """
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._run, name='bempy-watcher', daemon=True)
+            self.thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the background thread.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self) -> None:
+        while not self.stopped.is_set():
+            # A half-written file must not stop the watcher
+            try:
+                self.check()
+            except Exception as error:
+                warnings.warn('bempy watcher: %s' % error)
+
+            if not self.use_inotify:
+                self.stopped.wait(self.interval)
+
+    def _poll(self) -> List[str]:
+        changed = []
+        files = self.files()
+
+        for file in files:
+            try:
+                mtime = os.stat(file).st_mtime_ns
+            except OSError:
+                continue
+
+            previous = self.mtimes.get(file)
+            self.mtimes[file] = mtime
+            if previous is not None and previous != mtime:
+                changed.append(file)
+
+        for file in list(self.mtimes):
+            if file not in files:
+                del self.mtimes[file]
+
+        return changed
+
+    def _read_events(self) -> List[str]:
+        files = self.files()
+        watched = set(self.directories.values())
+        for directory in {os.path.dirname(file) for file in files} - watched:
+            if os.path.isdir(directory):
+                descriptor = self.inotify.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO)
+                self.directories[descriptor] = directory
+
+        changed = []
+        for event in self.inotify.read(timeout=int(self.interval * 1000)):
+            file = file_key(os.path.join(self.directories.get(event.wd, ''), event.name))
+            if file in files and file not in changed:
+                changed.append(file)
+
+        return changed
+
+
+def module_by_file(file: str) -> Optional[ModuleType]:
+    """
+    Returns the imported module loaded from the given file.
+
+    Args:
+        file (str): A source file path.
+
+    Returns:
+        Optional[ModuleType]: The module, None if the file was not imported.
+    """
+    key = file_key(file)
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, '__file__', None)
+        if module_file and file_key(module_file) == key:
+            return module
+
+    return None
+
+
+def dependent_files(file: str) -> List[str]:
+    """
+    Returns a changed file and the files of every cached class built from it.
+
+    Classes are found by the changed file and by the block names of the
+    classes built from it, whose base files are tagged in `block_class_cache`.
+    Files that no longer exist are left out.
+
+    Args:
+        file (str): Path of the changed file.
+
+    Returns:
+        List[str]: Normalized file paths, the changed file first.
+    """
+    names: Set[str] = set()
+    files: Set[str] = set()
+    for cache in caches.values():
+        cache_names, cache_files = cache.dependents(file=file)
+        names.update(cache_names)
+        files.update(cache_files)
+
+    for name in names:
+        files.update(caches['block_classes'].dependents(name=name)[1])
+
+    key = file_key(file)
+    files.discard(key)
+
+    return [key] + sorted(dependent for dependent in files if os.path.isfile(dependent))
+
+
+def module_depth(module: ModuleType, file: str) -> int:
+    """
+    Returns the reload order of a block module, modules a class inherits from come first.
+
+    The changed file goes first, others are ordered by the length of the MRO
+    of their block or modifier class, which is longer than the MRO of every
+    class it subclasses.
+    """
+    if file_key(module.__file__) == file_key(file):
+        return -1
+
+    model = getattr(module, 'Base', None) or getattr(module, 'Modificator', None)
+
+    return len(model.__mro__) if isinstance(model, type) else 0
+
+
+def watch(interval: float = 1.0) -> BlockWatcher:
+    """
+    Starts a background watcher that hot reloads changed blocks.
+
+    Args:
+        interval (float, optional): Seconds between checks. Defaults to 1.0.
+
+    Returns:
+        BlockWatcher: The running watcher, call `stop()` to end it.
+    """
+    return BlockWatcher(interval).start()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compares per-instance cost of a plain class, Block instantiation and Block.bulk.
+
+Every row reports its cost relative to the plain class, which only assigns
+two attributes. A block of two models also calls one init per model, sets the
+owner context variable and is tracked by the scope through a weak reference
+and its index entries. 'plain, tracked' does that work by hand, the floor for
+registered blocks.
+
+Usage:
+    python benchmarks/instantiate.py [--count 100000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+from contextvars import ContextVar
+from weakref import ref
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bempy import Block
+from bempy.base import dispatch_plan
+
+
+class Plain:
+    def __init__(self, level=1, mana=0):
+        self.level = level
+        self.mana = mana
+
+
+class Tracked:
+    __slots__ = ('level', 'mana', '__weakref__')
+
+    def init_level(self, level=1):
+        self.level = level
+
+    def init_mana(self, mana=0):
+        self.mana = mana
+
+
+def create_tracked(rows):
+    owner = ContextVar('owner', default=None)
+    refs, by_class, by_name, by_owner = {}, {}, {}, {}
+    instances = []
+    for key, row in enumerate(rows):
+        instance = Tracked()
+        refs[key] = ref(instance)
+        by_class[key] = by_name[key] = by_owner[key] = None
+        owner.set(instance)
+        instance.init_level(level=row['level'])
+        instance.init_mana(mana=row['mana'])
+        instances.append(instance)
+
+    return instances
+
+
+class Character(Block):
+    name = 'bench.Character'
+
+    def init(self, level=1):
+        self.level = level
+
+
+class Elf:
+    def init(self, mana=0):
+        self.mana = mana
+
+
+Elf.__name__ = 'Modificator'
+CharacterElf = type('bench.Character', (Elf, Character), {'name': 'bench.Character', 'mods': {}, 'props': {}})
+CharacterElf.models = (Character, Elf)
+CharacterElf.init_plan = dispatch_plan(CharacterElf.models)
+
+
+def measure(label: str, create, count: int, baseline: float = None) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    instances = create()
+    elapsed = time.perf_counter() - start
+    assert len(instances) == count
+
+    per_instance = elapsed / count * 1e9
+    ratio = ' (%.1fx plain)' % (per_instance / baseline) if baseline else ''
+    print('%-19s %8.0f ns/instance%s' % (label, per_instance, ratio))
+
+    del instances
+    Block.scope.clear()
+
+    return per_instance
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = [{'level': index, 'mana': index} for index in range(args.count)]
+    columns = {'level': list(range(args.count)), 'mana': list(range(args.count))}
+
+    plain = measure('plain class', lambda: [Plain(**row) for row in rows], args.count)
+    measure('plain, tracked', lambda: create_tracked(rows), args.count, plain)
+    measure('Block()', lambda: [CharacterElf(**row) for row in rows], args.count, plain)
+    measure('Block.bulk(rows)', lambda: CharacterElf.bulk(rows), args.count, plain)
+    measure('Block.bulk(cols)', lambda: CharacterElf.bulk(columns), args.count, plain)
+    measure('unregistered bulk', lambda: CharacterElf.bulk(rows, register=False), args.count, plain)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Compares memory of block instances with the __dict__ and the __slots__ layout.
+
+Usage:
+    python benchmarks/memory.py [--count 100000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Benchmark the test blocks, they are resolved relative to the working directory
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+os.chdir(os.path.join(ROOT, 'tests'))
+
+from bempy import Block
+from bempy.builder import Build
+
+
+def measure(Character: type, count: int) -> float:
+    rows = [{'level': index, 'mana': index, 'fertility': index} for index in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    instances = Character.bulk(rows, register=False)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(instances) == count
+
+    del instances
+    Block.scope.clear()
+
+    return size / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    mods = {'race': 'elf', 'gender': 'female'}
+    Regular = Build('game.Character', **mods).block
+    Build.slots = True
+    Slotted = Build('game.Character', **mods).block
+    Build.slots = False
+
+    # Model init methods print, keep the output readable
+    stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        regular = measure(Regular, args.count)
+        slotted = measure(Slotted, args.count)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print('%-9s %6.0f bytes/instance' % ('__dict__', regular))
+    print('%-9s %6.0f bytes/instance (%.0f%% of __dict__)' % ('__slots__', slotted, slotted / regular * 100))
+
+
+if __name__ == '__main__':
+    main()
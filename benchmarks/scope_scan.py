@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Counts filesystem operations and time spent by bem_scope on a synthetic tree.
+
+Usage:
+    python benchmarks/scope_scan.py [--scopes 10] [--blocks 20] [--types 5] [--values 10] [--workers 4]
+
+The default shape has 10 scopes x 20 blocks x 5 modifier types x 10 values,
+i.e. 10 000 modifier files.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from functools import wraps
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bempy import bem_scope
+
+
+def make_tree(root: str, scopes: int, blocks: int, types: int, values: int) -> None:
+    for scope in range(scopes):
+        for block in range(blocks):
+            block_dir = os.path.join(root, 'scope%d' % scope, 'Block%d' % block)
+            os.makedirs(block_dir)
+            open(os.path.join(block_dir, '__init__.py'), 'w').close()
+
+            for mod_type in range(types):
+                mod_dir = os.path.join(block_dir, '_type%d' % mod_type)
+                os.makedirs(mod_dir)
+
+                for value in range(values):
+                    open(os.path.join(mod_dir, 'value%d.py' % value), 'w').close()
+
+
+def count_calls(counter: Counter):
+    patched = {}
+    for name in ('scandir', 'listdir', 'stat', 'lstat'):
+        original = getattr(os, name)
+
+        def wrapper(*args, __name=name, __original=original, **kwargs):
+            counter[__name] += 1
+            return __original(*args, **kwargs)
+
+        patched[name] = original
+        setattr(os, name, wraps(original)(wrapper))
+
+    return patched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scopes', type=int, default=10)
+    parser.add_argument('--blocks', type=int, default=20)
+    parser.add_argument('--types', type=int, default=5)
+    parser.add_argument('--values', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, args.scopes, args.blocks, args.types, args.values)
+
+        counter: Counter = Counter()
+        patched = count_calls(counter)
+        start = time.perf_counter()
+        try:
+            if args.workers:
+                blocks = bem_scope(root, workers=args.workers)
+            else:
+                blocks = bem_scope(root)
+        finally:
+            for name, original in patched.items():
+                setattr(os, name, original)
+        elapsed = time.perf_counter() - start
+
+    modifiers = sum(len(values) for scope in blocks.values()
+                    for mods in scope.values() for values in mods.values())
+    print('modifiers: %d' % modifiers)
+    for name in ('scandir', 'listdir', 'stat', 'lstat'):
+        print('%-8s %d' % (name + ':', counter[name]))
+    print('total:   %d' % sum(counter.values()))
+    print('time:    %.3fs' % elapsed)
+
+
+if __name__ == '__main__':
+    main()
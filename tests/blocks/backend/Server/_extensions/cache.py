@@ -0,0 +1,17 @@
+import asyncio
+
+
+class Modificator:
+    """
+        An in-memory cache warmed up on start
+    """
+
+    async def init(self, cache_ttl=60):
+        """
+            cache_ttl -- seconds to keep entries
+        """
+        await asyncio.sleep(0.05)
+
+        self.cache = {'ttl': cache_ttl}
+
+        print(self.name + ': Cache warmed up with ttl =', cache_ttl)
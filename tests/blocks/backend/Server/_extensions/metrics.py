@@ -0,0 +1,10 @@
+class Modificator:
+    """
+        Metrics about the other extensions
+    """
+
+    async def init(self):
+        self.metrics = {
+            'cache': getattr(self, 'cache', None) is not None,
+            'queue': getattr(self, 'queue', None),
+        }
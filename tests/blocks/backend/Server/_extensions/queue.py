@@ -0,0 +1,17 @@
+import asyncio
+
+
+class Modificator:
+    """
+        A task queue connection
+    """
+
+    async def init(self, queue='default'):
+        """
+            queue -- name of the queue
+        """
+        await asyncio.sleep(0.05)
+
+        self.queue = queue
+
+        print(self.name + ': Queue connected to', queue)
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+from bempy import Block
+
+
+class Base(Block, ABC):
+    """
+        Abstract block, every kind of shape defines its area.
+    """
+
+    def init(self, size=1):
+        self.size = size
+
+    @abstractmethod
+    def area(self):
+        """
+            Returns the area of the shape.
+        """
@@ -0,0 +1,3 @@
+class Modificator:
+    def area(self):
+        return self.size ** 2
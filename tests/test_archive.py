@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from bempy import Block, bem_scope
+from bempy.bench import subprocess_env
+from bempy.utils.archive import pack_library, read_archive_index
+from bempy.utils.scanner import INDEX_FILE
+from bempy.utils.structer import ArchiveIndex, library_indexes
+
+
+class TestArchive(unittest.TestCase):
+    """
+    Test suite for packed block library archives.
+    """
+
+    def setUp(self):
+        """Pack the test blocks into a temporary directory."""
+        Block.scope.clear()
+
+        self.root = tempfile.TemporaryDirectory()
+        self.archive = os.path.join(self.root.name, 'blocks.zip')
+        self.count = pack_library('./blocks', self.archive)
+
+    def tearDown(self):
+        """Remove the archive."""
+        library_indexes.pop(self.archive, None)
+        self.root.cleanup()
+
+    def test_pack(self):
+        """Test that modules are stored compiled with their sources and the index."""
+        with zipfile.ZipFile(self.archive) as archive:
+            names = set(archive.namelist())
+
+        self.assertIn(INDEX_FILE, names)
+        self.assertIn('blocks/game/Character/__init__.pyc', names)
+        self.assertIn('blocks/game/Character/__init__.py', names)
+        self.assertIn('blocks/game/Character/', names, 'zipimport needs directory entries')
+        self.assertFalse(any('__pycache__' in name for name in names))
+        self.assertEqual(len([name for name in names if name.endswith('.pyc')]), self.count)
+
+        package, listings = read_archive_index(self.archive)
+        self.assertEqual(package, 'blocks')
+        self.assertIn(('Character', True), listings['game'][2])
+
+    def test_scope(self):
+        """Test that the archive scope equals the scope of the directory."""
+        self.assertEqual(bem_scope(self.archive), bem_scope('./blocks'))
+
+        index = ArchiveIndex(self.archive)
+        self.assertEqual(index.package, 'blocks')
+        self.assertTrue(index.module.startswith('bempy.libraries.blocks'))
+        self.assertNotIn(self.archive, sys.path)
+        self.assertIsNone(index.entries('game/Missing'))
+        self.assertIsNotNone(index.block('game/Character'))
+
+    def test_not_archive(self):
+        """Test that archives without an index are rejected."""
+        other = os.path.join(self.root.name, 'other.zip')
+        with zipfile.ZipFile(other, 'w') as archive:
+            archive.writestr('blocks/', b'')
+
+        with self.assertRaises(ValueError):
+            read_archive_index(other)
+
+    def test_build_from_archive(self):
+        """Test that blocks are built from an archive without the block sources."""
+        code = ("from importlib import import_module\n"
+                "from bempy.builder import Build\n"
+                "from bempy.utils.structer import library_index\n"
+                "import bempy.game\n"
+                "Build('game.Character', race='elf').block\n"
+                "Character = import_module(library_index('blocks.zip').module + '.game.Character')\n"
+                "print(Character.__name__, type(Character.__loader__).__name__, sorted(dir(bempy.game)))\n")
+        output = subprocess.run([sys.executable, '-c', code], check=True, cwd=self.root.name,
+                                env=subprocess_env(BEM_LIBRARIES='blocks.zip'),
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+        self.assertRegex(output, r'bempy\.libraries\.blocks_[0-9a-f]{8}\.game\.Character zipimporter')
+        self.assertIn("'Character'", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
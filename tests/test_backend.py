@@ -1,6 +1,15 @@
 import unittest
 from bempy import Block, bem_scope, get_created_blocks
 
+
+def serve(server):
+    """Handles a request in a worker process, the server is unpickled there."""
+    from bempy.backend import Server
+
+    server.requests += 1
+
+    return server, type(server) is Server(backend='flask')
+
 class TestBackendBlocks(unittest.TestCase):
     """
     Test suite for BEMPy backend blocks.
@@ -12,7 +21,7 @@ class TestBackendBlocks(unittest.TestCase):
     def setUp(self):
         """Set up test environment before each test method."""
         # Clear any existing blocks to avoid test interference
-        Block.scope = []
+        Block.scope.clear()
     
     def test_bem_scope_backend_structure(self):
         """Test that the backend scope has the expected structure."""
@@ -110,7 +119,181 @@ class TestBackendBlocks(unittest.TestCase):
         self.assertTrue(hasattr(server, 'db'), 'Server should have a db attribute')
         self.assertEqual(server.db.name, 'backend.Database', 'Database name should be backend.Database')
         self.assertEqual(server.db.mods.get('backend', []), ['mongodb'], 'Database backend should be mongodb')
+        self.assertIs(Block.scope.owner(server.db), server, 'Server should own its database')
+        self.assertEqual(Block.scope.children(server), [server.db], 'Database should be the only child')
+
+    def test_concurrent_nested_blocks(self):
+        """Test that nested blocks built from many threads get the right owner."""
+        import sys
+        from concurrent.futures import ThreadPoolExecutor
+        from bempy.backend import Server
+
+        def build(index):
+            FlaskApp = Server(backend=['flask', 'django'][index % 2],
+                              config=['debug', 'production'][index // 2 % 2],
+                              extensions=['db'])
+
+            return FlaskApp(port=index, db=['mysql', 'mongodb'][index % 2])
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                servers = list(pool.map(build, range(400)))
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(len(Block.scope), 800, 'Every server and database should be registered')
+        self.assertCountEqual(Block.scope.children(), servers, 'Servers should be the only roots')
+        for server in servers:
+            self.assertIs(Block.scope.owner(server.db), server, 'Database should be owned by its server')
+            self.assertEqual(Block.scope.children(server), [server.db])
     
+    def test_async_init(self):
+        """Test creating a server whose extensions initialize asynchronously."""
+        import asyncio
+        from unittest.mock import patch
+        from bempy.backend import Server
+
+        App = Server(backend='flask', extensions=['cache', 'queue', 'metrics', 'db'])
+        events = []
+
+        async def create():
+            # Cache and queue inits sleep once, the second one to start releases both
+            started = asyncio.Event()
+
+            async def sleep(delay):
+                events.append('start')
+                if events.count('start') == 2:
+                    started.set()
+
+                try:
+                    await asyncio.wait_for(started.wait(), 5)
+                except asyncio.TimeoutError:
+                    events.append('timeout')
+
+                events.append('end')
+
+            with patch('asyncio.sleep', sleep):
+                return await App.acreate(host='localhost', queue='jobs', db='mysql')
+
+        server = asyncio.run(create())
+
+        self.assertEqual(events, ['start', 'start', 'end', 'end'],
+                         'Independent async inits should run concurrently')
+        self.assertEqual(server.metrics, {'cache': True, 'queue': 'jobs'},
+                         'Dependent async init should run after the inits it reads')
+        self.assertIs(Block.scope.owner(server.db), server, 'Server should own its database')
+
+        with self.assertRaises(TypeError):
+            App(host='localhost')
+
+    def test_async_build(self):
+        """Test that concurrent async builds of one configuration share a single build."""
+        import asyncio
+        from bempy.builder import Build, invalidate
+        from bempy.backend import Server
+
+        builds = []
+
+        class CountingBuild(Build):
+            def __init__(self, *args, **kwargs):
+                builds.append(args)
+                super().__init__(*args, **kwargs)
+
+        invalidate(name='backend.Server')
+
+        async def request():
+            return await asyncio.gather(*[CountingBuild.ablock('backend.Server', backend='django', config='debug')
+                                          for _ in range(10)])
+
+        classes = asyncio.run(request())
+
+        self.assertEqual(len(builds), 1, 'Concurrent requests should be built once')
+        self.assertEqual(len(set(classes)), 1, 'Every request should get the same class')
+        self.assertIs(classes[0], Server(backend='django', config='debug'))
+        self.assertIs(asyncio.run(Server.ablock(config='debug', backend='django')), classes[0],
+                      'Compiled configurations should come from the cache')
+
+    def test_process_pool(self):
+        """Test that built classes and their instances round-trip through worker processes."""
+        import multiprocessing
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        from bempy.backend import Server
+
+        FlaskServer = Server(backend='flask')
+        self.assertIs(pickle.loads(pickle.dumps(FlaskServer)), FlaskServer,
+                      'Unpickled class should be the cached class')
+
+        servers = [FlaskServer(host='localhost') for _ in range(4)]
+        for index, server in enumerate(servers):
+            server.requests = index
+
+        # Workers start from a fresh interpreter, so classes are composed there again
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(serve, servers))
+
+        for index, (server, built_there) in enumerate(results):
+            self.assertTrue(built_there, 'Worker should rebuild the class by name and mods')
+            self.assertIs(type(server), FlaskServer)
+            self.assertEqual(server.requests, index + 1, 'State should survive both trips')
+            self.assertEqual(server.mods, {'backend': ['flask']})
+            self.assertIn(server, Block.scope.blocks(FlaskServer), 'Restored server should be tracked')
+
+    def test_mods_order_and_unhashable_props(self):
+        """Test that modifier order does not matter and props need not be hashable."""
+        from bempy.backend import Server
+        from bempy.utils.structer import mods_key
+
+        self.assertEqual(mods_key({'config': ['debug'], 'backend': ['flask']}),
+                         mods_key({'backend': ['flask'], 'config': ['debug']}))
+        self.assertIs(Server(config='debug', backend='flask'), Server(backend='flask', config='debug'),
+                      'Modifier order should not create another class')
+
+        server = Server(backend='flask', options={'workers': [1, 2]})(host='localhost')
+        self.assertEqual(server.mods.get('backend'), ['flask'], 'Server backend should be flask')
+        self.assertEqual(server.props.get('options'), [{'workers': [1, 2]}], 'Unhashable prop should be kept')
+
+    def test_unfreezable_props(self):
+        """Test that props which can not be frozen build without caching."""
+        from bempy.backend import Server
+        from bempy.builder import block_cache
+        from bempy.utils import freeze
+
+        class Unhashable:
+            def __eq__(self, other):
+                return self is other
+
+        value = Unhashable()
+        size = len(block_cache)
+        server = Server(backend='flask', obj=value)
+        self.assertEqual(server.mods, {'backend': ['flask']})
+        self.assertIs(server.props['obj'][0], value, 'Unhashable object should be kept as a prop')
+        self.assertEqual(len(block_cache), size, 'Unkeyable builds should not be cached')
+
+        options = {1: 'a', 'b': 2}
+        server = Server(backend='flask', options=options)
+        self.assertEqual(server.props['options'], [options])
+        self.assertIs(Server(backend='flask', options={'b': 2, 1: 'a'}), server,
+                      'Mixed key types should be keyed regardless of their order')
+        self.assertEqual(freeze({1: 'a', 'b': 2}), freeze({'b': 2, 1: 'a'}))
+
+    def test_build_many_variants(self):
+        """Test building every combination of server modifiers at once."""
+        from bempy.builder import Build
+        from bempy.backend import Server
+
+        variants = Build.many('backend.Server', backend=['flask', 'django'], config=['debug', 'production'])
+
+        self.assertEqual(len(variants), 4, 'Every combination should be built')
+        self.assertEqual(set(variants.timings), {'resolve', 'modifiers', 'build'})
+
+        django_production = variants[(('backend', 'django'), ('config', 'production'))]
+        self.assertEqual(django_production.mods, {'backend': ['django'], 'config': ['production']})
+        self.assertIs(Server(backend='django', config='production'), django_production,
+                      'Batch built variants should be shared with regular builds')
+
     def test_database_direct_creation(self):
         """Test creating a database directly."""
         from bempy.backend import Database
@@ -14,7 +14,7 @@ class TestBEMPy(unittest.TestCase):
     def setUp(self):
         """Set up test environment before each test method."""
         # Clear any existing blocks to avoid test interference
-        Block.scope = []
+        Block.scope.clear()
     
     def assert_base_instance(self, instance, some_arg):
         """Helper method to verify Base block instance properties."""
@@ -40,7 +40,76 @@ class TestBEMPy(unittest.TestCase):
         self.assertIn('size', blocks['example']['Complex'], 'Complex block should have size modifiers')
         self.assertIn('small', blocks['example']['Complex']['size'], 'Complex block should have small size')
         self.assertIn('big', blocks['example']['Complex']['size'], 'Complex block should have big size')
+
+        # Parallel scan should find the same tree
+        self.assertEqual(bem_scope(workers=4), blocks, 'Parallel scan should match serial scan')
     
+    def test_lazy_scope_import(self):
+        """Test that scopes are resolved lazily by the import hook."""
+        import bempy
+        import bempy.example
+        from bempy.finder import ScopeModule
+
+        self.assertIsInstance(bempy.example, ScopeModule, "Scope should be a lazy module")
+
+        scope = ScopeModule('bempy.example', 'example', bempy.scope_finder.roots)
+        self.assertNotIn('Parent', vars(scope), "Blocks should resolve on first access")
+        self.assertIs(scope.Parent, scope.Parent, "Resolved block should be kept on the module")
+        self.assertEqual(scope.Parent.block_name, 'example.Parent')
+
+        with self.assertRaises(ImportError):
+            from bempy.example import Missing
+
+        with self.assertRaises(ImportError):
+            import bempy.missing
+
+    def test_bem_scope_index(self):
+        """Test that the scope manifest is reused and refreshed on changes."""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as root:
+            mod_dir = os.path.join(root, 'game', 'Hero', '_class')
+            os.makedirs(mod_dir)
+            open(os.path.join(root, 'game', 'Hero', '__init__.py'), 'w').close()
+            open(os.path.join(mod_dir, 'mage.py'), 'w').close()
+
+            blocks = bem_scope(root, index=True)
+            self.assertTrue(os.path.exists(os.path.join(root, '.bempy-index')), "Manifest should be written")
+            self.assertEqual(blocks, {'game': {'Hero': {'class': ['mage']}}})
+
+            open(os.path.join(mod_dir, 'rogue.py'), 'w').close()
+            os.utime(mod_dir, ns=(0, 0))
+
+            trusted = bem_scope(root, index=True, validate=False)
+            self.assertEqual(trusted['game']['Hero']['class'], ['mage'], "Trusted manifest should not rescan")
+
+            refreshed = bem_scope(root, index=True)
+            self.assertEqual(sorted(refreshed['game']['Hero']['class']), ['mage', 'rogue'],
+                             "Changed directory should be rescanned")
+
+    def test_bem_scope_index_reused(self):
+        """Test that a manifest inside the root is not rewritten by unchanged runs."""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, 'game', 'Hero'))
+            open(os.path.join(root, 'game', 'Hero', '__init__.py'), 'w').close()
+            manifest = os.path.join(root, '.bempy-index')
+
+            bem_scope(root, index=True)
+            stat = os.stat(manifest)
+
+            for _ in range(2):
+                self.assertEqual(bem_scope(root, index=True), {'game': {'Hero': {}}})
+                self.assertEqual((os.stat(manifest).st_ino, os.stat(manifest).st_mtime_ns),
+                                 (stat.st_ino, stat.st_mtime_ns), "Unchanged runs should not rewrite the manifest")
+
+            os.makedirs(os.path.join(root, 'world', 'Map'))
+            open(os.path.join(root, 'world', 'Map', '__init__.py'), 'w').close()
+            self.assertIn('world', bem_scope(root, index=True), "New scopes in the root should be found")
+
     def test_bem_build_basic(self):
         """Test basic block building functionality."""
         from bempy.example import Base
@@ -156,6 +225,247 @@ class TestBEMPy(unittest.TestCase):
         self.assertIn('small', reverse_mods, "Reverse-instance should have small modifier")
         self.assertIn('big', reverse_mods, "Reverse-instance should have big modifier")
     
+    def test_block_cache(self):
+        """Test that identical configurations share the compiled class."""
+        from bempy.builder import block_cache
+        from bempy.example import Complex
+
+        small = Complex(size='small')
+        self.assertIs(Complex(size='small'), small, "Same request should return cached class")
+        self.assertIs(Complex(size=['small']), small, "Same resolved configuration should share class")
+        self.assertIsNot(Complex(size='big'), small, "Other modifiers should build another class")
+        self.assertIsInstance(small(some_arg=1), Complex(size='small'))
+
+        maxsize = block_cache.maxsize
+        block_cache.maxsize = 0
+        try:
+            self.assertIsNot(Complex(size='small'), Complex(size='small'),
+                             "Disabled cache should build a new class each time")
+        finally:
+            block_cache.maxsize = maxsize
+
+    def test_build_cache_invalidation(self):
+        """Test builder cache statistics and invalidation by file and block name."""
+        from bempy.builder import cache_stats, invalidate
+        from bempy.example import Complex
+
+        small = Complex(size='small')
+        hits = cache_stats()['blocks']['hits']
+        self.assertIs(Complex(size='small'), small)
+        self.assertEqual(cache_stats()['blocks']['hits'], hits + 1, "Cached build should count a hit")
+
+        self.assertGreater(invalidate(file='blocks/example/Complex/_size/small.py'), 0,
+                           "Modifier file should invalidate the block")
+        rebuilt = Complex(size='small')
+        self.assertIsNot(rebuilt, small, "Invalidated block should be rebuilt")
+
+        self.assertGreater(invalidate(name='example.Base'), 0, "Inherited block should invalidate Complex")
+        self.assertIsNot(Complex(size='small'), rebuilt, "Block built on invalidated base should be rebuilt")
+        self.assertEqual(invalidate(name='example.Unknown'), 0)
+
+    def test_build_cache_policy(self):
+        """Test eviction policies of the build cache."""
+        from bempy.utils.cache import BuildCache
+
+        lru = BuildCache('test', maxsize=2, policy='lru')
+        fifo = BuildCache('test', maxsize=2, policy='fifo')
+        for cache in (lru, fifo):
+            cache.set('a', 1)
+            cache.set('b', 2)
+            cache.get('a')
+            cache.set('c', 3)
+
+        self.assertIn('a', lru, "LRU should keep recently used entries")
+        self.assertNotIn('a', fifo, "FIFO should evict the oldest entry")
+        self.assertEqual(lru.stats()['evictions'], 1)
+        self.assertEqual(lru.stats()['hits'], 1)
+
+        with self.assertRaises(ValueError):
+            BuildCache('test', policy='random')
+
+        with self.assertRaises(ValueError):
+            lru.policy = 'random'
+        with self.assertRaises(ValueError):
+            lru.maxsize = -1
+        self.assertEqual(lru.policy, 'lru', "Rejected settings should leave the cache unchanged")
+
+        lru.maxsize = 1
+        self.assertEqual(len(lru), 1, "Shrinking maxsize should evict right away")
+        self.assertIn('c', lru)
+        lru.maxsize = 0
+        self.assertEqual(len(lru), 0, "Disabling the cache should drop its entries")
+
+    def test_acreate_positional_args(self):
+        """Test that acreate routes positional arguments like the constructor."""
+        import asyncio
+        from bempy.base import dispatch_plan
+
+        class First(Block):
+            name = 'test.Positional'
+
+            def init(self, value, scale=1):
+                self.value = value * scale
+
+        class Middle:
+            async def init(self):
+                self.middle = True
+
+        class Last:
+            def init(self, extra=None):
+                self.extra = extra
+
+        Positional = type('test.Positional', (Last, Middle, First), {'mods': {}, 'props': {}})
+        Positional.models = (First, Middle, Last)
+        Positional.init_plan = dispatch_plan(Positional.models)
+
+        block = asyncio.run(Positional.acreate(3, scale=2))
+        self.assertEqual((block.value, block.middle, block.extra), (6, True, None),
+                         "Inits after one without positional arguments should get none")
+
+        Middle.init = lambda self: setattr(self, 'middle', True)
+        Positional.init_plan = dispatch_plan(Positional.models)
+        created = Positional(3, scale=2)
+        self.assertEqual((created.value, created.middle, created.extra), (block.value, block.middle, block.extra))
+
+    def test_init_plan(self):
+        """Test that model init methods are dispatched from a precomputed plan."""
+        from bempy.example import Complex
+
+        block = Complex(size='small')
+        inits = [init for init, keys, positional in block.init_plan]
+        self.assertEqual(len(inits), len([cls for cls in block.models if hasattr(cls, 'init')]),
+                         "Plan should have one entry per init-capable model")
+
+        small_keys = [keys for init, keys, positional in block.init_plan
+                      if 'small_mod_arg' in keys]
+        self.assertEqual(len(small_keys), 1, "Small modificator should accept small_mod_arg")
+
+        instance = block(some_arg='plan', small_mod_arg=7)
+        self.assertEqual(instance.small_mod_arg, 7, "small_mod_arg should be routed by the plan")
+
+    def test_library_index(self):
+        """Test that block and modifier resolution is served from the library index."""
+        from bempy.utils.structer import library_index, lookup_block_class, lookup_mod_classes
+
+        index = library_index('blocks')
+        self.assertIs(library_index('blocks'), index, "Index should be built once per library")
+
+        base_file, block_class = lookup_block_class('example.Complex')
+        self.assertEqual(str(base_file), 'blocks/example/Complex/__init__.py')
+        self.assertEqual(sorted(index.blocks['example/Complex'][1]['size']), ['big', 'small'])
+
+        self.assertEqual(lookup_block_class('example.Missing'), (None, None))
+        self.assertIn('example/Missing', index.blocks, "Missing block should be remembered")
+        self.assertIsNone(index.blocks['example/Missing'])
+
+        files, classes, mods = lookup_mod_classes('example.Complex', {'size': ['small'], 'color': ['red']})
+        self.assertEqual(files, ['blocks/example/Complex/_size/small.py'])
+        self.assertEqual(mods, {'size': ['small']}, "Unknown modifier values should stay props")
+
+    def test_bulk_instantiation(self):
+        """Test creating many blocks from rows and columns."""
+        from bempy.example import Complex
+
+        block = Complex(size='small')
+        rows = block.bulk([{'some_arg': 1, 'small_mod_arg': 10}, {'some_arg': 2}])
+        columns = block.bulk({'some_arg': [3, 4], 'small_mod_arg': [30, 40]})
+
+        self.assertEqual([instance.some_arg for instance in rows + columns], [1, 2, 3, 4])
+        self.assertEqual([instance.small_mod_arg for instance in rows + columns], [10, 0, 30, 40])
+        self.assertTrue(all(instance.root for instance in rows + columns), "Blocks without an owner should be roots")
+        self.assertEqual(Block.scope.named('example.Complex'), rows + columns,
+                         "Bulk created blocks should be registered in order")
+
+        unregistered = block.bulk([{'some_arg': 5}], register=False)
+        self.assertEqual(unregistered[0].some_arg, 5)
+        self.assertEqual(len(Block.scope), 4, "Unregistered blocks should not be tracked")
+
+        generated = block.bulk({'some_arg': value} for value in (6, 7))
+        self.assertEqual([instance.some_arg for instance in generated], [6, 7],
+                         "Rows from an iterator should reach the inits")
+        self.assertIsNone(Block.owner.get(), "Owner should be restored after the batch")
+
+        ignored = block.bulk({'unused': [1, 2], 'small_mod_arg': [50, 60], 'some_arg': [8, 9]})
+        self.assertEqual([(instance.some_arg, instance.small_mod_arg) for instance in ignored],
+                         [(8, 50), (9, 60)], "Columns should reach their inits whatever their order")
+
+    def test_slots_layout(self):
+        """Test the opt-in slotted layout of generated classes."""
+        Build.slots = True
+        try:
+            Character = Build('game.Character', race='elf').block
+            Base = Build('example.Base').block
+        finally:
+            Build.slots = False
+
+        self.assertEqual(Character.__dict__['__slots__'], ('_Block__pretty_name', 'level', 'mana', 'root'))
+        self.assertIsNot(Character, Build('game.Character', race='elf').block,
+                         "Layouts should be cached separately")
+
+        character = Character(level=7, mana=3)
+        self.assertFalse(hasattr(character, '__dict__'), "Slotted blocks should have no __dict__")
+
+        # Slotted classes inherit from copies of the models
+        CharacterBase, Elf = Build('game.Character', race='elf').block.models
+        self.assertNotIn(CharacterBase, Character.__mro__)
+        self.assertIsInstance(character, CharacterBase, "Block models should match their slotted copies")
+        self.assertTrue(issubclass(Character, CharacterBase))
+        self.assertNotIsInstance(Build('example.Base').block(some_arg=1), CharacterBase)
+        self.assertNotIsInstance(character, Elf, "Plain modifier classes can not match their copies")
+
+        CharacterBase.rank = 'captain'
+        try:
+            self.assertFalse(hasattr(character, 'rank'), "Copies keep the class attributes they were made with")
+        finally:
+            del CharacterBase.rank
+        self.assertEqual((character.level, character.mana), (7, 3))
+        self.assertIn('Race Elf', str(character))
+        self.assertEqual(Block.scope.named('game.Character'), [character])
+
+        # Base assigns some_param that is also a class attribute
+        self.assertNotIn('__slots__', Base.__dict__, "Unsafe models should keep __dict__")
+        self.assert_base_instance(Base(some_arg=1), 1)
+
+    def test_slots_skip_class_methods(self):
+        """Test that class and static methods do not add slots."""
+        from bempy.utils.slots import assigned_attributes
+
+        class Model:
+            def init(self, level=1):
+                self.level = level
+
+            @classmethod
+            def configure(cls, limit):
+                cls.limit = limit
+
+            @staticmethod
+            def reset(target):
+                target.level = 0
+
+        self.assertEqual(assigned_attributes(Model), {'level'})
+
+    def test_abstract_model(self):
+        """Test that models inheriting from ABC build, stay abstract until defined and pickle."""
+        import pickle
+
+        Square = Build('example.Shape', kind='square').block
+        with self.assertRaises(TypeError):
+            Build('example.Shape').block()
+
+        square = Square(size=3)
+        self.assertEqual(square.area(), 9)
+        self.assertIs(pickle.loads(pickle.dumps(Square)), Square)
+        self.assertEqual(pickle.loads(pickle.dumps(square)).area(), 9)
+
+        Build.slots = True
+        try:
+            Slotted = Build('example.Shape', kind='square').block
+        finally:
+            Build.slots = False
+
+        self.assertIsInstance(Slotted(size=2), Square.models[0], "ABC models should match their slotted copies")
+        self.assertEqual(Slotted(size=2).area(), 4)
+
     def test_get_created_blocks(self):
         """Test retrieving created block instances."""
         from bempy.example import Base, Complex
@@ -177,6 +487,83 @@ class TestBEMPy(unittest.TestCase):
         self.assertEqual(len(base_blocks), 1, 'One Base block should be created')
         self.assertEqual(len(complex_blocks), 1, 'One Complex block should be created')
     
+    def test_scope_registry(self):
+        """Test that the scope holds blocks weakly and indexes them."""
+        import gc
+        from bempy.example import Base, Complex
+
+        base_instance = Base()(some_arg="kept")
+        Complex(size='small')(some_arg="dropped")
+        gc.collect()
+
+        self.assertEqual(len(Block.scope), 1, "Collected blocks should leave the scope")
+        self.assertEqual(Block.scope.named('example.Base'), [base_instance])
+        self.assertEqual(Block.scope.named('example.Complex'), [])
+        self.assertEqual(Block.scope.blocks(Base()), [base_instance])
+        self.assertEqual(Block.scope.children(None), [base_instance], "Base should be a root block")
+        self.assertIsNone(Block.scope.owner(base_instance))
+
+    def test_instrumentation(self):
+        """Test that build phases are reported to sinks only while instrumented."""
+        from bempy.builder import invalidate
+        from bempy.instrument import Histogram, instrument, sinks
+
+        histogram = Histogram()
+        events = []
+        invalidate(name='example.Complex')
+
+        with instrument(histogram, events.append):
+            Complex = Build('example.Complex', size='small').block
+            Complex(some_arg=1)
+
+        self.assertEqual(sinks, [], "Sinks should be removed at exit")
+        self.assertLessEqual({'block_class', 'mod_classes', 'mods_predefined', 'type', 'init'},
+                             set(histogram.summary()))
+        self.assertEqual(histogram.summary()['init']['count'], len(Complex.init_plan),
+                         "Every model init should be timed")
+        self.assertEqual(len(events), sum(stats['count'] for stats in histogram.summary().values()))
+
+        Complex(some_arg=2)
+        self.assertEqual(histogram.summary()['init']['count'], len(Complex.init_plan),
+                         "Nothing should be reported without sinks")
+        self.assertFalse(any(hasattr(init, '__wrapped__') for init, keys, positional in Complex.init_plan),
+                         "Classes built while instrumented should not keep timed inits")
+
+        # Built before the sink was added
+        Base = Build('example.Base').block
+        with instrument(histogram):
+            Base(some_arg=3)
+            Complex.bulk([{'some_arg': 4}])
+
+        self.assertEqual(histogram.summary()['init']['count'], 2 * len(Complex.init_plan) + len(Base.init_plan),
+                         "Classes built before the sink should report inits")
+
+    def test_session(self):
+        """Test that sessions have their own scope and release it at exit."""
+        import gc
+        from weakref import ref
+        from bempy import session
+        from bempy.example import Base
+
+        outside = Base()(some_arg="outside")
+
+        with session() as scope:
+            first = Base()(some_arg="first")
+            second = Base()(some_arg="second")
+
+            self.assertIs(Block.scope, scope, "Block.scope should be the session scope")
+            self.assertTrue(first.root, "Blocks without an owner should be roots")
+            self.assertTrue(second.root, "Every top-level block of a session should be a root")
+            self.assertEqual(get_created_blocks(None), {str(id(first)): first, str(id(second)): second})
+
+        self.assertEqual(len(scope), 0, "Session scope should be emptied at exit")
+        self.assertEqual(Block.scope.named('example.Base'), [outside], "Global scope should be untouched")
+
+        released = ref(first)
+        del first, second
+        gc.collect()
+        self.assertIsNone(released(), "Session blocks should be collected once released")
+
     def test_utility_functions(self):
         """Test utility functions in the BEMPy library."""
         # Test merge function
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+from bempy import Block, bem_scope
+from bempy.bench import (UNITS, LibraryShape, compare_results, find_baseline, format_comparison, format_table,
+                         format_speedup, generate_library, load_history, mann_whitney, min_p_value, run_benchmarks,
+                         run_parallel_benchmark, save_history)
+
+
+class TestBench(unittest.TestCase):
+    """
+    Test suite for the synthetic library generator and the benchmark runner.
+    """
+
+    def setUp(self):
+        """Set up test environment before each test method."""
+        Block.scope.clear()
+
+    def test_generate_library(self):
+        """Test that the generated library has the requested shape."""
+        shape = LibraryShape(scopes=2, blocks=3, types=2, values=3, depth=1)
+
+        with tempfile.TemporaryDirectory() as root:
+            names = generate_library(root, shape)
+            blocks = bem_scope(root)
+
+            with open(os.path.join(root, 'scope0', 'Block1', '__init__.py')) as file:
+                inherited = file.read()
+
+        self.assertEqual(len(names), 6)
+        self.assertEqual(sorted(blocks), ['scope0', 'scope1'])
+        self.assertEqual(sorted(blocks['scope1']['Block2']['type1']), ['value0', 'value1', 'value2'])
+        self.assertIn('inherited = [Block0]', inherited, "Odd blocks should inherit the previous block")
+
+    def test_run_benchmarks(self):
+        """Test that every scenario is measured and the working directory is restored."""
+        cwd = os.getcwd()
+        results = run_benchmarks(LibraryShape(scopes=1, blocks=2, types=1, values=2), instances=10, repeat=1)
+
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(set(results['scenarios']), set(UNITS))
+        self.assertEqual(results['shape']['blocks'], 2)
+        for name, scenario in results['scenarios'].items():
+            self.assertEqual(len(scenario['samples']), 1, name)
+            self.assertGreater(scenario['samples'][0], 0, name)
+
+        self.assertIn('build_cold', format_table(results))
+
+    def test_profile_cold(self):
+        """Test that profiling resolves and imports a warm block again and fits long model names."""
+        from contextlib import redirect_stdout
+        from io import StringIO
+        from bempy.builder import Build
+        from bempy.cli import profile_block
+        from bempy.utils.structer import library_index
+
+        Build('game.Character', race='elf').block
+        index = library_index('blocks')
+
+        with redirect_stdout(StringIO()) as output:
+            profile_block('game/Character', {'race': 'elf'}, count=2)
+
+        self.assertIsNot(library_index('blocks'), index, "Library indexes should be cold too")
+
+        lines = output.getvalue().splitlines()
+        phases = {line.split()[0]: int(line.split()[1]) for line in lines[2:] if line.split()[0] in
+                  ('block_class', 'mod_classes', 'type')}
+        self.assertEqual(phases, {'block_class': 2, 'mod_classes': 2, 'type': 1},
+                         "Every phase should run from cold caches")
+
+        models = lines[lines.index('  init by model:') + 1:]
+        self.assertEqual(len(models), 2)
+        self.assertEqual(len({len(line) for line in models}), 1, "Timings should line up after long model names")
+        self.assertTrue(all(line.endswith(' ms') for line in models))
+
+    def test_compare_history(self):
+        """Test that stored results are found again and only significant slowdowns regress."""
+        def results(build, memory):
+            return {'version': 1, 'implementation': 'CPython', 'python': '3.11.0',
+                    'shape': {'blocks': 2}, 'instances': 10, 'timestamp': 0,
+                    'scenarios': {'build_cold': {'unit': 's', 'samples': build},
+                                  'memory_per_instance': {'unit': 'B', 'samples': memory}}}
+
+        baseline = results([1.0, 1.1, 0.9, 1.05, 0.95], [100] * 5)
+        with tempfile.TemporaryDirectory() as root:
+            history = os.path.join(root, 'history.jsonl')
+            self.assertEqual(load_history(history), [])
+
+            save_history(baseline, history)
+            save_history(dict(baseline, python='3.12.0'), history)
+            stored = find_baseline(load_history(history), results([1.0], [100]))
+
+        self.assertEqual(stored, baseline, "Results of another interpreter should not be a baseline")
+
+        noisy = compare_results(baseline, results([1.0, 1.3, 0.9, 1.2, 1.0], [100] * 5))
+        self.assertFalse(any(item.regression for item in noisy), "Overlapping samples are not significant")
+
+        slower = {item.scenario: item for item in
+                  compare_results(baseline, results([1.5, 1.6, 1.4, 1.55, 1.45], [130] * 5))}
+        self.assertTrue(slower['build_cold'].regression)
+        self.assertTrue(slower['memory_per_instance'].regression, "Constant samples that differ are significant")
+        self.assertAlmostEqual(slower['memory_per_instance'].change, 0.3)
+        self.assertIn('REGRESSION', format_comparison(list(slower.values())))
+
+        within = compare_results(baseline, results([1.5, 1.6, 1.4, 1.55, 1.45], [105] * 5), threshold=0.6)
+        self.assertFalse(any(item.regression for item in within), "Slowdowns under the threshold pass")
+        self.assertLess(mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]), 0.05)
+
+    def test_compare_few_samples(self):
+        """Test that three samples per side still report a large slowdown with the exact test."""
+        def results(build):
+            return {'version': 1, 'scenarios': {'build_cold': {'unit': 's', 'samples': build}}}
+
+        slower = compare_results(results([1.0, 1.1, 0.9]), results([5.0, 5.2, 4.9]))
+        self.assertTrue(slower[0].regression)
+        self.assertAlmostEqual(slower[0].p_value, 1 / 20)
+        self.assertEqual(min_p_value(3, 3), 1 / 20)
+
+        faster = compare_results(results([5.0, 5.2, 4.9]), results([1.0, 1.1, 0.9]))
+        self.assertFalse(faster[0].regression)
+        self.assertAlmostEqual(mann_whitney([1.0, 1.1, 0.9], [5.0, 5.2, 4.9]), 2 / 20)
+        self.assertEqual(mann_whitney([1, 1, 1], [1, 1, 1], alternative='greater'), 1.0)
+
+    def test_parallel_benchmark(self):
+        """Test that serial and process pool creation are both measured."""
+        cwd = os.getcwd()
+        results = run_parallel_benchmark(instances=40, workers=1, work=10, repeat=2)
+
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(len(results['scenarios']['serial']['samples']), 2)
+        self.assertEqual(len(results['scenarios']['parallel']['samples']), 2)
+        self.assertGreater(results['speedup'], 0)
+        self.assertIn('speedup', format_speedup(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
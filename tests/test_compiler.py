@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from bempy import Block
+from bempy.bench import subprocess_env
+from bempy.builder import Build, precompiled
+from bempy.compiler import parse_variant, scope_variants, write_module
+
+
+class TestCompiler(unittest.TestCase):
+    """
+    Test suite for ahead-of-time compiled block variants.
+    """
+
+    def setUp(self):
+        """Set up test environment before each test method."""
+        Block.scope.clear()
+
+        self.root = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.root.name)
+
+    def tearDown(self):
+        """Forget the compiled module and its classes."""
+        sys.path.remove(self.root.name)
+        sys.modules.pop('compiled_blocks', None)
+        precompiled.clear()
+        self.root.cleanup()
+
+    def test_variants(self):
+        """Test parsing of variant specifications and variants discovered in a scope."""
+        self.assertEqual(parse_variant('game/Character:race=elf,gender=female'),
+                         ('game.Character', {'race': 'elf', 'gender': 'female'}))
+        self.assertEqual(parse_variant('backend.Server:extensions=cache+queue'),
+                         ('backend.Server', {'extensions': ['cache', 'queue']}))
+        self.assertEqual(parse_variant('example.Base'), ('example.Base', {}))
+        with self.assertRaises(ValueError):
+            parse_variant('game.Character:race')
+
+        variants = scope_variants({'game': {'Character': {'race': ['elf', 'human'], 'gender': ['male']}}})
+        self.assertEqual(len(variants), 6, "Every modifier is either unset or set to one value")
+        self.assertIn(('game.Character', {'race': 'human', 'gender': 'male'}), variants)
+
+    def test_compiled_module(self):
+        """Test that a compiled module defines the same classes the builder composes."""
+        variants = [('game.Character', {'race': 'elf', 'gender': 'non-binary'}),
+                    ('backend.Server', {'backend': 'flask', 'extensions': ['cache', 'queue']}),
+                    ('example.Parent', {})]
+        dynamic = {name: Build(name, **kwargs).block for name, kwargs in variants}
+
+        self.assertEqual(write_module(os.path.join(self.root.name, 'compiled_blocks.py'), variants), 3)
+        import compiled_blocks
+
+        for name, kwargs in variants:
+            Compiled = Build(name, **kwargs).block
+            Dynamic = dynamic[name]
+
+            self.assertIsNot(Compiled, Dynamic)
+            self.assertIn(Compiled, vars(compiled_blocks).values(), "Builds should return precompiled classes")
+            self.assertEqual(Compiled.__name__, name)
+            self.assertEqual(Compiled.__mro__[1:], Dynamic.__mro__[1:])
+            for attribute in ('mods', 'props', 'models'):
+                self.assertEqual(getattr(Compiled, attribute), getattr(Dynamic, attribute), attribute)
+            self.assertEqual(Compiled.files, [os.path.abspath(file) for file in Dynamic.files if file != 'base.py'])
+
+        with redirect_stdout(StringIO()):
+            character = Build('game.Character', race='elf', gender='non-binary').block(mana=5)
+
+        self.assertEqual(character.mana, 5)
+        self.assertEqual(str(character).split(' #')[0], 'Game Character Gender Non-binary Race Elf')
+
+    def test_compiled_files_absolute(self):
+        """Test that a compiled module imported from another directory is invalidated by its block files."""
+        variants = [('game.Character', {'race': 'elf'})]
+        write_module(os.path.join(self.root.name, 'compiled_blocks.py'), variants)
+        base_file = os.path.abspath(os.path.join('blocks', 'game', 'Character', '__init__.py'))
+
+        cwd = os.getcwd()
+        os.chdir(self.root.name)
+        try:
+            import compiled_blocks
+        finally:
+            os.chdir(cwd)
+
+        Compiled = Build('game.Character', race='elf').block
+        self.assertIn(Compiled, vars(compiled_blocks).values())
+        self.assertIn(base_file, Compiled.files)
+        self.assertTrue(all(os.path.isabs(file) for file in Compiled.files))
+        self.assertEqual(precompiled.invalidate(file=base_file), 1)
+
+    def test_compiled_other_libraries(self):
+        """Test that a compiled module imports while another library with the same name is loaded first."""
+        write_module(os.path.join(self.root.name, 'compiled_blocks.py'), [('game.Character', {'race': 'elf'})])
+        other = os.path.join(self.root.name, 'team', 'blocks')
+        os.makedirs(other)
+
+        code = ("import compiled_blocks\n"
+                "from bempy.builder import Build\n"
+                "print(Build('game.Character', race='elf').block in vars(compiled_blocks).values())\n")
+        env = subprocess_env(BEM_LIBRARIES=os.pathsep.join([other, 'blocks']))
+        env['PYTHONPATH'] = os.pathsep.join([self.root.name, env['PYTHONPATH']])
+        output = subprocess.run([sys.executable, '-c', code], check=True, env=env,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+        self.assertEqual(output.strip(), 'True')
+
+
+if __name__ == '__main__':
+    unittest.main()
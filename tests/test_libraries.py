@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bempy import Block
+from bempy.utils.structer import (LibraryRegistry, bem_blocks_path, environment_libraries, library_index,
+                                  library_indexes, library_registry, lookup_block_class, lookup_mod_classes)
+
+
+class TestLibraryRegistry(unittest.TestCase):
+    """
+    Test suite for resolving blocks from several libraries.
+    """
+
+    def setUp(self):
+        """Create an installed package library overriding example.Complex."""
+        Block.scope.clear()
+
+        self.root = tempfile.TemporaryDirectory()
+        package = os.path.join(self.root.name, 'acme_blocks')
+        block = os.path.join(package, 'example', 'Complex')
+        os.makedirs(os.path.join(block, '_size'))
+        for name, source in [(os.path.join(package, '__init__.py'), ''),
+                             (os.path.join(block, '__init__.py'), 'class Base:\n    origin = "acme"\n'),
+                             (os.path.join(block, '_size', 'small.py'), 'class Modificator:\n    pass\n')]:
+            with open(name, 'w') as file:
+                file.write(source)
+
+        sys.path.insert(0, self.root.name)
+
+    def tearDown(self):
+        """Forget the package library."""
+        sys.path.remove(self.root.name)
+        for name in list(sys.modules):
+            if name.split('.')[0] == 'acme_blocks':
+                del sys.modules[name]
+
+        library_indexes.pop('acme_blocks', None)
+        self.root.cleanup()
+
+    def test_environment(self):
+        """Test that BEM_LIBRARIES is split by the path separator and built-in blocks come last."""
+        with patch.dict(os.environ, {'BEM_LIBRARIES': os.pathsep.join(['overrides', 'dist/blocks.zip', ''])}):
+            self.assertEqual(environment_libraries(), ['overrides', 'dist/blocks.zip', bem_blocks_path()])
+
+        with patch.dict(os.environ, {'BEM_LIBRARIES': ''}):
+            self.assertEqual(environment_libraries(), ['blocks', bem_blocks_path()])
+
+    def test_priority(self):
+        """Test that earlier libraries override blocks and modifier values of later ones."""
+        index = library_index('acme_blocks')
+        self.assertEqual(index.module, 'acme_blocks')
+        self.assertEqual(index.root, os.path.join(self.root.name, 'acme_blocks'))
+
+        registry = LibraryRegistry(['blocks'])
+        registry.add('acme_blocks', first=True)
+        self.assertEqual(registry.libraries, ['acme_blocks', 'blocks'])
+        self.assertEqual(registry.roots, [index.root, 'blocks'])
+
+        self.assertIs(registry.block('example/Complex')[0], index)
+        self.assertIs(registry.mod('example/Complex', 'size', 'small')[0], index)
+        self.assertIs(registry.mod('example/Complex', 'size', 'big')[0], library_index('blocks'))
+        self.assertEqual(registry.mod('example/Complex', 'size', 'huge'), (None, None))
+
+        registry.remove('acme_blocks')
+        self.assertIs(registry.block('example/Complex')[0], library_index('blocks'))
+
+    def test_lookup(self):
+        """Test that given libraries are searched first and never change the registry."""
+        libraries = list(library_registry.libraries)
+
+        for _ in range(3):
+            base_file, block_class = lookup_block_class('example.Complex', ['acme_blocks'])
+            self.assertEqual(block_class.origin, 'acme')
+
+        files, classes, mods = lookup_mod_classes('example.Complex', {'size': ['small', 'big']}, ['acme_blocks'])
+        self.assertTrue(files[0].startswith(self.root.name))
+        self.assertTrue(files[1].startswith('blocks'))
+
+        self.assertEqual(library_registry.libraries, libraries)
+        self.assertEqual(lookup_block_class('example.Complex')[0].parts[0], 'blocks')
+
+    def test_same_name(self):
+        """Test that directories with the same name override each other under their own packages."""
+        other = os.path.join(self.root.name, 'team_a', 'blocks')
+        os.makedirs(os.path.join(other, 'example', 'Complex'))
+        with open(os.path.join(other, 'example', 'Complex', '__init__.py'), 'w') as file:
+            file.write('class Base:\n    origin = "team_a"\n')
+
+        registry = LibraryRegistry([other, 'blocks'])
+        index = library_index(other)
+        self.assertNotEqual(index.module, library_index('blocks').module)
+        self.assertEqual(library_index(os.path.abspath('blocks')).module, library_index('blocks').module)
+
+        base_file, block_class = lookup_block_class('example.Complex', [other, 'blocks'])
+        self.assertEqual(block_class.origin, 'team_a')
+        self.assertEqual(block_class.__module__, index.module + '.example.Complex')
+        self.assertIs(registry.mod('example/Complex', 'size', 'big')[0], library_index('blocks'))
+
+        for name in list(sys.modules):
+            if name.startswith(index.module + '.'):
+                del sys.modules[name]
+        library_indexes.pop(other)
+        library_indexes.pop(os.path.abspath('blocks'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import multiprocessing
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from bempy import Block, session
+from bempy.parallel import BlockPool
+
+
+class TestBlockPool(unittest.TestCase):
+    """
+    Test suite for creating blocks in worker processes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one pool for the suite, workers are started from a fresh interpreter."""
+        from bempy.backend import Server
+
+        cls.App = Server(backend='flask', config='debug', extensions='db')
+        cls.pool = BlockPool(2, classes=[cls.App], mp_context=multiprocessing.get_context('spawn'))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the worker processes."""
+        cls.pool.close()
+
+    def setUp(self):
+        """Set up test environment before each test method."""
+        Block.scope.clear()
+
+    def test_create_trees(self):
+        """Test that blocks come back in row order with their nested blocks and owners."""
+        databases = ['mysql', 'mongodb'] * 5
+
+        with redirect_stdout(StringIO()) as output, session() as scope:
+            servers = self.pool.create(self.App, {'db': databases}, chunksize=3)
+
+            self.assertEqual([server.db.mods['backend'][0] for server in servers], databases)
+            self.assertEqual(scope.children(), servers, 'Servers should be the roots of the scope')
+            self.assertTrue(all(server.root for server in servers), 'Servers without an owner should be roots')
+            self.assertFalse(any(hasattr(server.db, 'root') for server in servers), 'Owned blocks are not roots')
+            for server in servers:
+                self.assertIs(type(server), self.App)
+                self.assertEqual(server.db.name, 'backend.Database')
+                self.assertIs(scope.owner(server.db), server, 'Database should stay owned by its server')
+
+        self.assertEqual(output.getvalue(), '', 'Inits should run in the workers only')
+
+    def test_states(self):
+        """Test that only attributes are returned and nothing is registered."""
+        with redirect_stdout(StringIO()), session() as scope:
+            states = self.pool.states(self.App, [{'db': 'mongodb'}, {'db': 'mysql'}])
+
+            self.assertEqual([state['db'].mods['backend'][0] for state in states], ['mongodb', 'mysql'])
+            self.assertEqual(states[0]['config'], 'local')
+            self.assertEqual(len(scope), 0)
+
+        self.assertEqual(self.pool.states(self.App, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
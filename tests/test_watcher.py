@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from bempy import Block
+from bempy.builder import Build, block_cache
+from bempy.utils.structer import library_registry
+from bempy.watcher import BlockWatcher
+
+
+class TestBlockWatcher(unittest.TestCase):
+    """
+    Test suite for hot reloading of changed block files.
+    """
+
+    def setUp(self):
+        """Set up test environment before each test method."""
+        Block.scope.clear()
+
+        self.root = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.root.name, 'hot_reload_modificator.py')
+        self.write('VALUE = 1\n', 1)
+
+        sys.path.insert(0, self.root.name)
+
+    def tearDown(self):
+        """Clean up the temporary modules."""
+        sys.path.remove(self.root.name)
+        for name, module in list(sys.modules.items()):
+            if name == 'bempy.watched' or (getattr(module, '__file__', None) or '').startswith(self.root.name):
+                del sys.modules[name]
+        self.root.cleanup()
+
+    def write(self, source, mtime, path=None):
+        path = path or self.file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(source)
+        os.utime(path, ns=(mtime * 10 ** 9, mtime * 10 ** 9))
+
+    def test_polling_reload(self):
+        """Test that a changed file is reloaded and only its entries are invalidated."""
+        import hot_reload_modificator
+
+        self.write('VALUE = 1\n', 1, self.file + '.other')
+        block_cache.set('hot', object(), files=[self.file])
+        block_cache.set('cold', object(), files=[self.file + '.other'])
+
+        watcher = BlockWatcher(use_inotify=False)
+        self.assertEqual(watcher.check(), [], 'First check should only record modification times')
+
+        self.write('VALUE = 2\n', 2)
+        changed = watcher.check()
+
+        self.assertEqual(len(changed), 1, 'Changed file should be reported')
+        self.assertEqual(hot_reload_modificator.VALUE, 2, 'Module should be reloaded')
+        self.assertNotIn('hot', block_cache, 'Entries built from the file should be invalidated')
+        self.assertIn('cold', block_cache, 'Other entries should be kept')
+        self.assertEqual(watcher.check(), [], 'Unchanged file should not be reloaded again')
+
+        block_cache.invalidate(file=self.file + '.other')
+
+    def test_reload_inherited(self):
+        """Test that a block subclassing a built block at import time sees changes of its parent."""
+        library = os.path.join(self.root.name, 'watched_blocks')
+        parent = os.path.join(library, 'watched', 'Parent', '__init__.py')
+        self.write('from bempy import Block\n\n\nclass Base(Block):\n    some_param = 1\n', 1, parent)
+        self.write('from bempy.watched import Parent\n\n\nclass Base(Parent()):\n    pass\n', 1,
+                   os.path.join(library, 'watched', 'Child', '__init__.py'))
+
+        library_registry.add(library, first=True)
+        try:
+            self.assertEqual(Build('watched.Child').block.some_param, 1)
+
+            watcher = BlockWatcher(use_inotify=False)
+            watcher.check()
+            self.write('from bempy import Block\n\n\nclass Base(Block):\n    some_param = 2\n', 2, parent)
+            watcher.check()
+
+            self.assertEqual(Build('watched.Parent').block.some_param, 2)
+            self.assertEqual(Build('watched.Child').block.some_param, 2,
+                             'Child module should be reloaded on top of the new parent')
+        finally:
+            library_registry.remove(library)
+
+    def test_reload_keeps_unrelated(self):
+        """Test that reloading a modifier keeps cached classes of unrelated blocks."""
+        from bempy.utils.structer import get_block_class
+
+        library = os.path.join(self.root.name, 'watched_blocks')
+        modifier = os.path.join(library, 'watched', 'Hero', '_race', 'elf.py')
+        for block in ('Hero', 'Map'):
+            self.write('from bempy import Block\n\n\nclass Base(Block):\n    pass\n', 1,
+                       os.path.join(library, 'watched', block, '__init__.py'))
+        self.write('class Modificator:\n    speed = 1\n', 1, modifier)
+
+        library_registry.add(library, first=True)
+        try:
+            hero = Build('watched.Hero', race='elf').block
+            world = Build('watched.Map').block
+            complex_block = Build('example.Complex', size='small').block
+            complex_base = get_block_class('example.Complex')[1]
+
+            watcher = BlockWatcher(use_inotify=False)
+            watcher.check()
+            self.write('class Modificator:\n    speed = 2\n', 2, modifier)
+            watcher.check()
+
+            self.assertIs(Build('watched.Map').block, world, 'Unrelated block should stay cached')
+            self.assertIs(Build('example.Complex', size='small').block, complex_block,
+                          'Blocks of other libraries should stay cached')
+            self.assertIs(get_block_class('example.Complex')[1], complex_base,
+                          'Unrelated modules should not be reloaded')
+            self.assertIsNot(Build('watched.Hero', race='elf').block, hero)
+            self.assertEqual(Build('watched.Hero', race='elf').block.speed, 2)
+        finally:
+            library_registry.remove(library)
+
+
+if __name__ == '__main__':
+    unittest.main()